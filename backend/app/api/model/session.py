@@ -23,3 +23,10 @@ class Session:
     paid_until: Optional[datetime]
     licence_plate_entry: Optional[str]
     licence_plate_exit: Optional[str]
+
+    @property
+    def outstanding_cents(self) -> int:
+        """
+        The balance left to pay, as kept on the session by the payment stations.
+        """
+        return max(0, self.amount_due_cents - self.amount_paid_cents)
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from app.api.model.payment import Payment
+from app.api.model.session import Session
+
+
+@dataclass
+class SessionPayments:
+    session: Session
+    payments: list[Payment]
+    approved_cents: int
+    declined_cents: int
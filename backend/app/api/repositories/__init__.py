@@ -1,12 +1,114 @@
-import config
+from typing import Optional
 
+from app.core.database import (
+    get_database_backend,
+    get_database_executor,
+    get_database_manager,
+    get_sqlite_pool,
+    get_sqlite_writer
+)
+from app.core.plate import get_plate_index
+
+from .active_session_index import ActiveSessionIndex
+from .async_payment_repository import AsyncPaymentRepository
+from .async_session_repository import AsyncSessionRepository
 from .payment_repository import PaymentRepository
 from .session_repository import SessionRepository
 
+__active_session_index: Optional[ActiveSessionIndex] = None
+__session_repository: Optional[SessionRepository] = None
+__payment_repository: Optional[PaymentRepository] = None
+__async_session_repository: Optional[AsyncSessionRepository] = None
+__async_payment_repository: Optional[AsyncPaymentRepository] = None
+__postgres_session_repository = None
+__postgres_payment_repository = None
+
+
+def get_active_session_index() -> ActiveSessionIndex:
+    """
+    Get the active session index instance.
+    """
+    global __active_session_index
+    if not __active_session_index:
+        __active_session_index = ActiveSessionIndex(get_plate_index())
+    return __active_session_index
+
+
+def get_session_repository() -> SessionRepository:
+    """
+    Get the session repository instance.
+    """
+    global __session_repository
+    if not __session_repository:
+        __session_repository = SessionRepository(
+            get_sqlite_pool(),
+            get_sqlite_writer(),
+            get_active_session_index()
+        )
+    return __session_repository
+
+
+def get_payment_repository() -> PaymentRepository:
+    """
+    Get the payment repository instance.
+    """
+    global __payment_repository
+    if not __payment_repository:
+        __payment_repository = PaymentRepository(get_sqlite_pool())
+    return __payment_repository
+
+
+def get_postgres_session_repository():
+    """
+    Get the PostgreSQL session repository instance.
+    """
+    global __postgres_session_repository
+    if not __postgres_session_repository:
+        # asyncpg is only needed with the PostgreSQL backend
+        from .postgres_session_repository import PostgresSessionRepository
+
+        __postgres_session_repository = PostgresSessionRepository(
+            get_database_manager(),
+            get_active_session_index()
+        )
+    return __postgres_session_repository
+
+
+def get_postgres_payment_repository():
+    """
+    Get the PostgreSQL payment repository instance.
+    """
+    global __postgres_payment_repository
+    if not __postgres_payment_repository:
+        from .postgres_payment_repository import PostgresPaymentRepository
+
+        __postgres_payment_repository = PostgresPaymentRepository(get_database_manager())
+    return __postgres_payment_repository
+
+
+def get_async_session_repository() -> AsyncSessionRepository:
+    """
+    Get the async session repository instance of the configured database
+    backend.
+    """
+    if get_database_backend() == "postgres":
+        return get_postgres_session_repository()
+
+    global __async_session_repository
+    if not __async_session_repository:
+        __async_session_repository = AsyncSessionRepository(get_session_repository(), get_database_executor())
+    return __async_session_repository
 
-def get_session_repository():
-    return SessionRepository(config.env_param('SQLITE_DATABASE_NAME'))
 
+def get_async_payment_repository() -> AsyncPaymentRepository:
+    """
+    Get the async payment repository instance of the configured database
+    backend.
+    """
+    if get_database_backend() == "postgres":
+        return get_postgres_payment_repository()
 
-def get_payment_repository():
-    return PaymentRepository(config.env_param('SQLITE_DATABASE_NAME'))
\ No newline at end of file
+    global __async_payment_repository
+    if not __async_payment_repository:
+        __async_payment_repository = AsyncPaymentRepository(get_payment_repository(), get_database_executor())
+    return __async_payment_repository
@@ -0,0 +1,135 @@
+import threading
+from typing import Optional
+
+from app.api.model.session import Session, SessionStatus
+from app.core.plate import PlateIndex, normalize_plate
+
+
+class ActiveSessionIndex:
+    """
+    In-memory index of the active sessions of the lot.
+
+    Sessions are keyed by ID and normalized entry plate. The repository
+    keeps it up to date write-through and re-syncs it from the database
+    periodically. Other writers' changes only show up after a sync, so the
+    index finds candidate sessions and their current state is read from the
+    database. The optional plate index is kept in sync for fuzzy plate
+    lookups.
+    """
+
+    def __init__(self, plate_index: Optional[PlateIndex] = None):
+        self.plate_index = plate_index
+
+        self._sessions: dict[int, Session] = {}
+        self._by_plate: dict[str, dict[int, Session]] = {}
+        self._loaded = False
+        self._version = 0
+        # Version of the last write-through change of each session
+        self._written: dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _add(self, session: Session):
+        self._remove(session.id)
+        if session.status != SessionStatus.ACTIVE.value:
+            return
+
+        self._sessions[session.id] = session
+        if session.licence_plate_entry:
+            self._by_plate.setdefault(normalize_plate(session.licence_plate_entry), {})[session.id] = session
+            if self.plate_index is not None:
+                self.plate_index.add(session.id, session.licence_plate_entry, session)
+
+    def _remove(self, session_id: int) -> Optional[Session]:
+        session = self._sessions.pop(session_id, None)
+        if not session:
+            return None
+
+        key = normalize_plate(session.licence_plate_entry or "")
+        sessions = self._by_plate.get(key)
+        if sessions is not None:
+            sessions.pop(session_id, None)
+            if not sessions:
+                del self._by_plate[key]
+
+        if self.plate_index is not None:
+            self.plate_index.remove(session_id)
+        return session
+
+    def _written_now(self, session_id: int):
+        self._version += 1
+        self._written[session_id] = self._version
+
+    def add(self, session: Session):
+        """
+        Add or replace a session, sessions that aren't active are removed.
+        """
+        with self._lock:
+            self._add(session)
+            self._written_now(session.id)
+
+    def remove(self, session_id: int) -> Optional[Session]:
+        with self._lock:
+            self._written_now(session_id)
+            return self._remove(session_id)
+
+    def version(self) -> int:
+        """
+        Get the version to pass to ``replace`` before reading the database.
+        """
+        with self._lock:
+            return self._version
+
+    def replace(self, sessions: list[Session], version: int) -> int:
+        """
+        Replace the indexed sessions with the active sessions of the database.
+
+        Only the sessions that changed are updated, and sessions written
+        through after ``version`` are left alone since the database read
+        may predate them.
+
+        Args:
+            sessions (list[Session]): Active sessions read from the database.
+            version (int): Index version taken before the read.
+
+        Returns:
+            int: Number of indexed sessions.
+        """
+        active = {session.id: session for session in sessions}
+        with self._lock:
+            def is_stale(session_id: int) -> bool:
+                return self._written.get(session_id, 0) <= version
+
+            for session_id in [session_id for session_id in self._sessions if session_id not in active]:
+                if is_stale(session_id):
+                    self._remove(session_id)
+            for session_id, session in active.items():
+                if is_stale(session_id) and self._sessions.get(session_id) != session:
+                    self._add(session)
+
+            self._written = {
+                session_id: written for session_id, written in self._written.items() if written > version
+            }
+            self._loaded = True
+            return len(self._sessions)
+
+    def get(self, session_id: int) -> Optional[Session]:
+        return self._sessions.get(session_id)
+
+    def by_plate(self, license_plate: str) -> list[Session]:
+        """
+        Get the active sessions of a plate, latest entry first.
+        """
+        with self._lock:
+            sessions = list(self._by_plate.get(normalize_plate(license_plate), {}).values())
+        return sorted(sessions, key=lambda session: session.entry_time, reverse=True)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "sessions": len(self._sessions),
+            "plates": len(self._by_plate),
+        }
@@ -0,0 +1,28 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Optional, Union
+
+from app.api.model.payment import Payment
+from app.api.repositories.payment_repository import PaymentRepository
+
+
+class AsyncPaymentRepository:
+    """
+    Awaitable counterpart of ``PaymentRepository``, running the database
+    work on a dedicated executor.
+    """
+
+    def __init__(self, repository: PaymentRepository, executor: Executor):
+        self.repository = repository
+        self.executor = executor
+
+    async def get_payment_by_session_id(
+        self,
+        session_id: int,
+    ) -> Union[Optional[Payment], Exception]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.repository.get_payment_by_session_id, session_id)
+        )
@@ -0,0 +1,102 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Optional, Union
+
+from app.api.model.session import Session
+from app.api.model.session_payments import SessionPayments
+from app.api.repositories.session_repository import SessionRepository
+
+
+class AsyncSessionRepository:
+    """
+    Awaitable counterpart of ``SessionRepository``.
+
+    Database work runs on a dedicated executor, so a slow query or a held
+    write lock only delays the request waiting for it.
+    """
+
+    def __init__(self, repository: SessionRepository, executor: Executor):
+        self.repository = repository
+        self.executor = executor
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def get_session_by_license_plate(
+        self,
+        license_plate: str,
+    ) -> Union[Optional[Session], Exception]:
+        return await self._run(self.repository.get_session_by_license_plate, license_plate)
+
+    async def get_active_session_by_id(
+        self,
+        session_id: int,
+    ) -> Union[Optional[Session], Exception]:
+        return await self._run(self.repository.get_active_session_by_id, session_id)
+
+    async def get_session_with_payments_by_license_plate(
+        self,
+        license_plate: str,
+    ) -> Union[Optional[SessionPayments], Exception]:
+        return await self._run(self.repository.get_session_with_payments_by_license_plate, license_plate)
+
+    async def get_session_by_entry_time_and_entry_station(
+        self,
+        entry_time: datetime,
+        entry_station: int
+    ) -> Union[list[Session], Exception]:
+        return await self._run(
+            self.repository.get_session_by_entry_time_and_entry_station,
+            entry_time,
+            entry_station
+        )
+
+    async def get_session_by_entry_time_interval_and_entry_station(
+        self,
+        entry_time_interval: (datetime, datetime),
+        entry_station: int,
+    ) -> Union[list[Session], Exception]:
+        return await self._run(
+            self.repository.get_session_by_entry_time_interval_and_entry_station,
+            entry_time_interval,
+            entry_station
+        )
+
+    async def get_active_sessions(self) -> Union[list[Session], Exception]:
+        return await self._run(self.repository.get_active_sessions)
+
+    async def load_active_sessions(self) -> Union[int, Exception]:
+        return await self._run(self.repository.load_active_sessions)
+
+    async def open_session(
+        self,
+        entry_time: datetime,
+        entry_station: int,
+        licence_plate_entry: str,
+        ticket_id: Optional[int] = None
+    ) -> Union[Session, Exception]:
+        return await self._run(
+            self.repository.open_session,
+            entry_time,
+            entry_station,
+            licence_plate_entry,
+            ticket_id
+        )
+
+    async def close_session(
+        self,
+        license_plate: str,
+        exit_license_plate: str,
+        exit_time: datetime,
+        exit_station: int
+    ) -> Union[Optional[Session], Exception]:
+        return await self._run(
+            self.repository.close_session,
+            license_plate=license_plate,
+            exit_license_plate=exit_license_plate,
+            exit_time=exit_time,
+            exit_station=exit_station
+        )
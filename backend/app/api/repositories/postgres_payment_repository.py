@@ -0,0 +1,51 @@
+from typing import Union, Optional
+
+import asyncpg
+
+from app.config.logging import logging
+from app.core.database.postgres_manager import PostgresDatabaseManager
+
+from app.api.model.payment import Payment
+
+logger = logging.getLogger('postgres_payment_repository')
+
+PAYMENT_BY_SESSION_ID_QUERY = """
+    SELECT id, session_id, station_id, method, amount_cents, approved, processor_ref, created_at
+    FROM payment
+    WHERE session_id = $1
+    """
+
+PAYMENT_QUERIES = {
+    "payment_by_session_id": PAYMENT_BY_SESSION_ID_QUERY,
+}
+
+
+class PostgresPaymentRepository:
+    """
+    Payment repository on the shared PostgreSQL store, with the same
+    awaitable surface as ``AsyncPaymentRepository``.
+    """
+
+    def __init__(self, database: PostgresDatabaseManager):
+        self.database = database
+
+        self.database.register_statements(PAYMENT_QUERIES)
+
+    async def get_payment_by_session_id(
+        self,
+        session_id: int,
+    ) -> Union[Optional[Payment], Exception]:
+        try:
+            row = await self.database.fetchrow("payment_by_session_id", session_id)
+            if not row:
+                return None
+
+            logger.info(f"Payment found for session ID {session_id}: {tuple(row)}")
+
+            return Payment(*row)
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for session ID {session_id}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for session ID {session_id}: {str(e)}")
+            return e
@@ -0,0 +1,351 @@
+import asyncio
+from dataclasses import fields
+from datetime import datetime
+from typing import Optional, Union
+
+import asyncpg
+
+from app.api.model.payment import Payment
+from app.api.model.session import Session, SessionStatus
+from app.api.model.session_payments import SessionPayments
+from app.api.repositories.active_session_index import ActiveSessionIndex
+from app.api.repositories.session_repository import PAYMENT_COLUMNS, SESSION_COLUMNS
+
+from app.config.logging import logging
+from app.core.database.errors import DatabaseWriteTimeoutError
+from app.core.database.postgres_manager import PostgresDatabaseManager
+from app.core.plate import normalize_plate
+
+logger = logging.getLogger('postgres_session_repository')
+
+SESSION_BY_LICENSE_PLATE_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE licence_plate_entry_normalized = $1
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    LIMIT 1
+    """
+
+ACTIVE_SESSION_BY_ID_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE id = $1
+    AND status = 'active'
+    """
+
+SESSIONS_BY_ENTRY_TIME_AND_ENTRY_STATION_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE entry_time = $1
+    AND entry_station = $2
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+SESSIONS_BY_ENTRY_TIME_INTERVAL_AND_ENTRY_STATION_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE entry_time BETWEEN $1 AND $2
+    AND entry_station = $3
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+SESSION_WITH_PAYMENTS_BY_LICENSE_PLATE_QUERY = f"""
+    WITH active AS (
+        SELECT {SESSION_COLUMNS}
+        FROM session
+        WHERE licence_plate_entry_normalized = $1
+        AND status = 'active'
+        ORDER BY entry_time DESC
+        LIMIT 1
+    )
+    SELECT active.*, {PAYMENT_COLUMNS},
+        COALESCE(SUM(CASE WHEN payment.approved THEN payment.amount_cents END) OVER (), 0),
+        COALESCE(SUM(CASE WHEN NOT payment.approved THEN payment.amount_cents END) OVER (), 0)
+    FROM active
+    LEFT JOIN payment ON payment.session_id = active.id
+    ORDER BY payment.created_at
+    """
+
+# The normalized plate is a generated column
+OPEN_SESSION_QUERY = f"""
+    INSERT INTO session (ticket_id, entry_time, entry_station, status, licence_plate_entry)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING {SESSION_COLUMNS}
+    """
+
+ACTIVE_SESSIONS_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+# The row lock makes a concurrent close of the same session wait, then find
+# it exited and update nothing
+CLOSE_SESSION_QUERY = f"""
+    UPDATE session
+    SET licence_plate_exit = $1,
+        exit_time = $2,
+        exit_station = $3,
+        status = 'exited'
+    WHERE id = (
+        SELECT id
+        FROM session
+        WHERE licence_plate_entry_normalized = $4
+        AND status = 'active'
+        ORDER BY entry_time DESC
+        LIMIT 1
+        FOR UPDATE
+    )
+    AND status = 'active'
+    RETURNING {SESSION_COLUMNS}
+    """
+
+SESSION_QUERIES = {
+    "session_by_license_plate": SESSION_BY_LICENSE_PLATE_QUERY,
+    "active_session_by_id": ACTIVE_SESSION_BY_ID_QUERY,
+    "sessions_by_entry_time_and_entry_station": SESSIONS_BY_ENTRY_TIME_AND_ENTRY_STATION_QUERY,
+    "sessions_by_entry_time_interval_and_entry_station": SESSIONS_BY_ENTRY_TIME_INTERVAL_AND_ENTRY_STATION_QUERY,
+    "session_with_payments_by_license_plate": SESSION_WITH_PAYMENTS_BY_LICENSE_PLATE_QUERY,
+    "open_session": OPEN_SESSION_QUERY,
+    "active_sessions": ACTIVE_SESSIONS_QUERY,
+    "close_session": CLOSE_SESSION_QUERY,
+}
+
+
+def _timestamp(value: Union[datetime, str]) -> datetime:
+    # Tools pass the times as the model wrote them
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+class PostgresSessionRepository:
+    """
+    Session repository on the shared PostgreSQL store, with the same
+    awaitable surface as ``AsyncSessionRepository``.
+
+    Lookups always query PostgreSQL since other nodes write to it too. The
+    active session index is kept write-through and synced periodically for
+    the lot-wide fuzzy plate lookups.
+    """
+
+    def __init__(self, database: PostgresDatabaseManager, active_sessions: ActiveSessionIndex = None):
+        self.database = database
+        self.active_sessions = active_sessions
+
+        self.database.register_statements(SESSION_QUERIES)
+
+    async def get_session_by_license_plate(
+        self,
+        license_plate: str,
+    ) -> Union[Optional[Session], Exception]:
+        try:
+            row = await self.database.fetchrow("session_by_license_plate", normalize_plate(license_plate))
+            if not row:
+                return None
+
+            logger.info(f"Session found for license plate {license_plate}: {tuple(row)}")
+            return Session(*row)
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for license plate {license_plate}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for license plate {license_plate}: {str(e)}")
+            return e
+
+    async def get_active_session_by_id(
+        self,
+        session_id: int,
+    ) -> Union[Optional[Session], Exception]:
+        """
+        Read a session, if it's still active.
+        """
+        try:
+            row = await self.database.fetchrow("active_session_by_id", session_id)
+            return Session(*row) if row else None
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for session ID {session_id}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for session ID {session_id}: {str(e)}")
+            return e
+
+    async def get_session_with_payments_by_license_plate(
+        self,
+        license_plate: str,
+    ) -> Union[Optional[SessionPayments], Exception]:
+        """
+        Get the latest active session of a plate with all of its payments and
+        their approved and declined totals, in one query.
+        """
+        try:
+            rows = await self.database.fetch("session_with_payments_by_license_plate", normalize_plate(license_plate))
+            if not rows:
+                return None
+
+            session_length = len(fields(Session))
+            payment_length = len(fields(Payment))
+            *_, approved_cents, declined_cents = rows[0]
+
+            # A session without payments is joined with a single row of NULLs
+            payments = [
+                Payment(*row[session_length:session_length + payment_length])
+                for row in rows
+                if row[session_length] is not None
+            ]
+
+            logger.info(f"Session found for license plate {license_plate} with {len(payments)} payments")
+
+            return SessionPayments(
+                Session(*rows[0][:session_length]),
+                payments,
+                approved_cents,
+                declined_cents
+            )
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for license plate {license_plate}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for license plate {license_plate}: {str(e)}")
+            return e
+
+    async def get_session_by_entry_time_and_entry_station(
+        self,
+        entry_time: datetime,
+        entry_station: int
+    ) -> Union[list[Session], Exception]:
+        try:
+            rows = await self.database.fetch(
+                "sessions_by_entry_time_and_entry_station",
+                _timestamp(entry_time),
+                entry_station
+            )
+            return [Session(*row) for row in rows]
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for entry_time {entry_time} and entry_station {entry_station}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for entry_time {entry_time} and entry_station {entry_station}: {str(e)}")
+            return e
+
+    async def get_session_by_entry_time_interval_and_entry_station(
+        self,
+        entry_time_interval: (datetime, datetime),
+        entry_station: int,
+    ) -> Union[list[Session], Exception]:
+        try:
+            rows = await self.database.fetch(
+                "sessions_by_entry_time_interval_and_entry_station",
+                _timestamp(entry_time_interval[0]),
+                _timestamp(entry_time_interval[1]),
+                entry_station
+            )
+            return [Session(*row) for row in rows]
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            return e
+
+    async def get_active_sessions(self) -> Union[list[Session], Exception]:
+        try:
+            rows = await self.database.fetch("active_sessions")
+            return [Session(*row) for row in rows]
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error for active sessions: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for active sessions: {str(e)}")
+            return e
+
+    async def load_active_sessions(self) -> Union[int, Exception]:
+        """
+        Load the active sessions into the active session index.
+
+        Returns:
+            Union[int, Exception]: Number of active sessions.
+        """
+        if self.active_sessions is None:
+            return 0
+
+        version = self.active_sessions.version()
+        sessions = await self.get_active_sessions()
+        if isinstance(sessions, Exception):
+            return sessions
+
+        return self.active_sessions.replace(sessions, version)
+
+    async def open_session(
+        self,
+        entry_time: datetime,
+        entry_station: int,
+        licence_plate_entry: str,
+        ticket_id: Optional[int] = None
+    ) -> Union[Session, Exception]:
+        try:
+            row = await self.database.fetchrow(
+                "open_session",
+                ticket_id,
+                _timestamp(entry_time),
+                entry_station,
+                SessionStatus.ACTIVE.value,
+                licence_plate_entry
+            )
+            session = Session(*row)
+
+            if self.active_sessions is not None:
+                self.active_sessions.add(session)
+
+            logger.info(f"Opened session {session.id} for license plate {licence_plate_entry}")
+            return session
+        except asyncio.TimeoutError:
+            # The command timed out, the server may still commit it
+            logger.warning(f"Opening session for license plate {licence_plate_entry} is still pending")
+            return DatabaseWriteTimeoutError(f"Write not committed within {self.database.command_timeout_seconds} seconds")
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error while opening session for license plate {licence_plate_entry}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error while opening session for license plate {licence_plate_entry}: {str(e)}")
+            return e
+
+    async def close_session(
+        self,
+        license_plate: str,
+        exit_license_plate: str,
+        exit_time: datetime,
+        exit_station: int
+    ) -> Union[Optional[Session], Exception]:
+        try:
+            row = await self.database.fetchrow(
+                "close_session",
+                exit_license_plate,
+                _timestamp(exit_time),
+                exit_station,
+                normalize_plate(license_plate)
+            )
+            if not row:
+                logger.info(f"No active session found to update for license plate {license_plate}")
+                return None
+
+            session = Session(*row)
+            if self.active_sessions is not None:
+                self.active_sessions.remove(session.id)
+
+            logger.info(f"Closed session {session.id} for license plate {license_plate}")
+            return session
+        except asyncio.TimeoutError:
+            # The command timed out, the server may still commit it
+            logger.warning(f"Closing session for license plate {license_plate} is still pending")
+            return DatabaseWriteTimeoutError(f"Write not committed within {self.database.command_timeout_seconds} seconds")
+        except asyncpg.PostgresError as e:
+            logger.info(f"Database error while updating session for license plate {license_plate}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error while updating session for license plate {license_plate}: {str(e)}")
+            return e
@@ -1,56 +1,243 @@
 import json
 import sqlite3
+from dataclasses import fields
 from datetime import datetime
 from typing import Optional, Union
 
-from app.api.model.session import Session
+from app.api.model.payment import Payment
+from app.api.model.session import Session, SessionStatus
+from app.api.model.session_payments import SessionPayments
+from app.api.repositories.active_session_index import ActiveSessionIndex
 
 from app.config.logging import logging
+from app.core.database import DatabaseWriteTimeoutError, SQLiteConnectionPool, SQLiteWriter
+from app.core.plate import normalize_plate
 
 logger = logging.getLogger('session_repository')
 
+# Explicit so that added columns don't shift the Session fields
+SESSION_COLUMNS = """
+    id, ticket_id, entry_time, entry_station, exit_time, exit_station, status,
+    amount_due_cents, amount_paid_cents, paid_until, licence_plate_entry, licence_plate_exit
+"""
+
+SESSION_BY_LICENSE_PLATE_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE licence_plate_entry_normalized = ?
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    LIMIT 1
+    """
+
+ACTIVE_SESSION_BY_ID_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE id = ?
+    AND status = 'active'
+    """
+
+SESSIONS_BY_ENTRY_TIME_AND_ENTRY_STATION_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE entry_time = ?
+    AND entry_station = ?
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+SESSIONS_BY_ENTRY_TIME_INTERVAL_AND_ENTRY_STATION_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE entry_time BETWEEN ? AND ?
+    AND entry_station = ?
+    AND status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+PAYMENT_COLUMNS = """
+    payment.id, payment.session_id, payment.station_id, payment.method, payment.amount_cents,
+    payment.approved, payment.processor_ref, payment.created_at
+"""
+
+SESSION_WITH_PAYMENTS_BY_LICENSE_PLATE_QUERY = f"""
+    WITH active AS (
+        SELECT {SESSION_COLUMNS}
+        FROM session
+        WHERE licence_plate_entry_normalized = ?
+        AND status = 'active'
+        ORDER BY entry_time DESC
+        LIMIT 1
+    )
+    SELECT active.*, {PAYMENT_COLUMNS},
+        COALESCE(SUM(CASE WHEN payment.approved THEN payment.amount_cents END) OVER (), 0),
+        COALESCE(SUM(CASE WHEN NOT payment.approved THEN payment.amount_cents END) OVER (), 0)
+    FROM active
+    LEFT JOIN payment ON payment.session_id = active.id
+    ORDER BY payment.created_at
+    """
+
+OPEN_SESSION_QUERY = f"""
+    INSERT INTO session (
+        ticket_id, entry_time, entry_station, status,
+        licence_plate_entry, licence_plate_entry_normalized
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+    RETURNING {SESSION_COLUMNS}
+    """
+
+ACTIVE_SESSIONS_QUERY = f"""
+    SELECT {SESSION_COLUMNS}
+    FROM session
+    WHERE status = 'active'
+    ORDER BY entry_time DESC
+    """
+
+CLOSE_SESSION_QUERY = f"""
+    UPDATE session
+    SET licence_plate_exit = ?,
+        exit_time = ?,
+        exit_station = ?,
+        status = 'exited'
+    WHERE id = (
+        SELECT id
+        FROM session
+        WHERE licence_plate_entry_normalized = ?
+        AND status = 'active'
+        ORDER BY entry_time DESC
+        LIMIT 1
+    )
+    RETURNING {SESSION_COLUMNS}
+    """
+
+SESSION_QUERIES = {
+    "session_by_license_plate": SESSION_BY_LICENSE_PLATE_QUERY,
+    "active_session_by_id": ACTIVE_SESSION_BY_ID_QUERY,
+    "sessions_by_entry_time_and_entry_station": SESSIONS_BY_ENTRY_TIME_AND_ENTRY_STATION_QUERY,
+    "sessions_by_entry_time_interval_and_entry_station": SESSIONS_BY_ENTRY_TIME_INTERVAL_AND_ENTRY_STATION_QUERY,
+    "session_with_payments_by_license_plate": SESSION_WITH_PAYMENTS_BY_LICENSE_PLATE_QUERY,
+    "open_session": OPEN_SESSION_QUERY,
+    "active_sessions": ACTIVE_SESSIONS_QUERY,
+    "close_session": CLOSE_SESSION_QUERY,
+}
+
 
 class SessionRepository:
 
-    def __init__(self, db_name):
-        self.db_name = db_name
-        self.db_connection = sqlite3.connect(self.db_name)
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        writer: SQLiteWriter,
+        active_sessions: ActiveSessionIndex = None
+    ):
+        self.pool = pool
+        self.writer = writer
+        self.active_sessions = active_sessions
+
+    def get_active_session_by_id(
+        self,
+        session_id: int,
+    ) -> Union[Optional[Session], Exception]:
+        """
+        Read a session from the database, if it's still active.
+        """
+        query = ACTIVE_SESSION_BY_ID_QUERY
 
-    def __del__(self):
-        if self.db_connection:
-            self.db_connection.close()
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, (session_id,))
+                result = cursor.fetchone()
+                return Session(*result) if result else None
+        except sqlite3.Error as e:
+            logger.info(f"Database error for session ID {session_id}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for session ID {session_id}: {str(e)}")
+            return e
 
     def get_session_by_license_plate(
         self,
         license_plate: str,
     ) -> Union[Optional[Session], Exception]:
-        query = """
-            SELECT *
-            FROM session
-            WHERE UPPER(licence_plate_entry) = UPPER(?)
-            AND status = 'active'
-            ORDER BY entry_time DESC
-            """
+        """
+        Get the latest active session of a plate.
+
+        Always read from the database, not the active session index. Kiosks
+        update balances and open sessions behind this process, so a hit in
+        the index would still have to be read back and a miss proves
+        nothing, while the plate query is a single index lookup.
+        """
+        query = SESSION_BY_LICENSE_PLATE_QUERY
 
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute(
-                query,
-                (license_plate,)
-            )
-            result = cursor.fetchone()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    query,
+                    (normalize_plate(license_plate),)
+                )
+                result = cursor.fetchone()
+
+                logger.info(f"Executed query for license plate {license_plate}")
+
+                if not result:
+                    return None
+
+                logger.info(f"Session found for license plate {license_plate}: {result}")
+
+                return Session(*result)
+        except sqlite3.Error as e:
+            logger.info(f"Database error for license plate {license_plate}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for license plate {license_plate}: {str(e)}")
+            return e
+
+    def get_session_with_payments_by_license_plate(
+        self,
+        license_plate: str,
+    ) -> Union[Optional[SessionPayments], Exception]:
+        """
+        Get the latest active session of a plate with all of its payments and
+        their approved and declined totals, in one query.
+        """
+        query = SESSION_WITH_PAYMENTS_BY_LICENSE_PLATE_QUERY
 
-            logger.info(f"Executed query for license plate {license_plate}")
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    query,
+                    (normalize_plate(license_plate),)
+                )
+                rows = cursor.fetchall()
 
-            if not result:
+            if not rows:
                 return None
 
-            logger.info(f"Session found for license plate {license_plate}: {result}")
+            session_length = len(fields(Session))
+            payment_length = len(fields(Payment))
+            *_, approved_cents, declined_cents = rows[0]
+
+            # A session without payments is joined with a single row of NULLs
+            payments = [
+                Payment(*row[session_length:session_length + payment_length])
+                for row in rows
+                if row[session_length] is not None
+            ]
 
-            return Session(*result)
+            logger.info(f"Session found for license plate {license_plate} with {len(payments)} payments")
+
+            return SessionPayments(
+                Session(*rows[0][:session_length]),
+                payments,
+                approved_cents,
+                declined_cents
+            )
         except sqlite3.Error as e:
             logger.info(f"Database error for license plate {license_plate}: {str(e)}")
-            return Exception('Database error: {str(e)}')
+            return Exception(f'Database error: {str(e)}')
         except Exception as e:
             logger.info(f"Unexpected error for license plate {license_plate}: {str(e)}")
             return e
@@ -60,29 +247,25 @@ class SessionRepository:
         entry_time: datetime,
         entry_station: int
     ) -> Union[list[Session], Exception]:
-        query = """
-            SELECT *
-            FROM session
-            WHERE entry_time = ?
-            AND entry_station = ?
-            AND status = 'active'
-            ORDER BY entry_time DESC
-            """
+        # Queried every time, sessions missing from the index can't be told
+        # apart from sessions that don't exist
+        query = SESSIONS_BY_ENTRY_TIME_AND_ENTRY_STATION_QUERY
 
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute(
-                query,
-                (
-                    entry_time,
-                    entry_station
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    query,
+                    (
+                        entry_time,
+                        entry_station
+                    )
                 )
-            )
-            result = cursor.fetchall()
-            if not result:
-                return []
+                result = cursor.fetchall()
+                if not result:
+                    return []
 
-            return [Session(*row) for row in result]
+                return [Session(*row) for row in result]
         except sqlite3.Error as e:
             logger.info(f"Database error for entry_time {entry_time} and entry_station {entry_station}: {str(e)}")
             return Exception(f'Database error: {str(e)}')
@@ -95,35 +278,110 @@ class SessionRepository:
         entry_time_interval: (datetime, datetime),
         entry_station: int,
     ) -> Union[list[Session], Exception]:
-        query = """
-            SELECT *
-            FROM session
-            WHERE entry_time BETWEEN ? AND ?
-            AND entry_station = ?
-            AND status = 'active'
-            ORDER BY entry_time DESC
-            """
+        query = SESSIONS_BY_ENTRY_TIME_INTERVAL_AND_ENTRY_STATION_QUERY
+
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    query,
+                    (
+                        entry_time_interval[0],
+                        entry_time_interval[1],
+                        entry_station
+                    )
+                )
+                results = cursor.fetchall()
+                if not results:
+                    return []
+
+                return [Session(*row) for row in results]
+        except sqlite3.Error as e:
+            logger.info(f"Database error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            return e
+
+    def get_active_sessions(self) -> Union[list[Session], Exception]:
+        query = ACTIVE_SESSIONS_QUERY
 
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute(
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query)
+                return [Session(*row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.info(f"Database error for active sessions: {str(e)}")
+            return Exception(f'Database error: {str(e)}')
+        except Exception as e:
+            logger.info(f"Unexpected error for active sessions: {str(e)}")
+            return e
+
+    def load_active_sessions(self) -> Union[int, Exception]:
+        """
+        Load the active sessions into the active session index.
+
+        Returns:
+            Union[int, Exception]: Number of active sessions.
+        """
+        if self.active_sessions is None:
+            return 0
+
+        version = self.active_sessions.version()
+        sessions = self.get_active_sessions()
+        if isinstance(sessions, Exception):
+            return sessions
+
+        return self.active_sessions.replace(sessions, version)
+
+    # The index follows the commits, also those landing after the caller
+    # stopped waiting
+    def _index_opened(self, session: Session):
+        if self.active_sessions is not None:
+            self.active_sessions.add(session)
+
+    def _index_closed(self, session: Optional[Session]):
+        if self.active_sessions is not None and session is not None:
+            self.active_sessions.remove(session.id)
+
+    def open_session(
+        self,
+        entry_time: datetime,
+        entry_station: int,
+        licence_plate_entry: str,
+        ticket_id: Optional[int] = None
+    ) -> Union[Session, Exception]:
+        query = OPEN_SESSION_QUERY
+
+        def insert(connection: sqlite3.Connection) -> Session:
+            cursor = connection.execute(
                 query,
                 (
-                    entry_time_interval[0],
-                    entry_time_interval[1],
-                    entry_station
+                    ticket_id,
+                    # Same format as the entry terminals write
+                    entry_time.isoformat() if isinstance(entry_time, datetime) else entry_time,
+                    entry_station,
+                    SessionStatus.ACTIVE.value,
+                    licence_plate_entry,
+                    normalize_plate(licence_plate_entry)
                 )
             )
-            results = cursor.fetchall()
-            if not results:
-                return []
+            return Session(*cursor.fetchone())
 
-            return [Session(*row) for row in results]
+        try:
+            session = self.writer.execute(insert, on_commit=self._index_opened)
+
+            logger.info(f"Opened session {session.id} for license plate {licence_plate_entry}")
+            return session
+        except DatabaseWriteTimeoutError as e:
+            logger.warning(f"Opening session for license plate {licence_plate_entry} is still pending: {str(e)}")
+            return e
         except sqlite3.Error as e:
-            logger.info(f"Database error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            logger.info(f"Database error while opening session for license plate {licence_plate_entry}: {str(e)}")
             return Exception(f'Database error: {str(e)}')
         except Exception as e:
-            logger.info(f"Unexpected error for entry_time interval {entry_time_interval} and entry_station {entry_station}: {str(e)}")
+            logger.info(f"Unexpected error while opening session for license plate {licence_plate_entry}: {str(e)}")
             return e
 
     def close_session(
@@ -133,36 +391,34 @@ class SessionRepository:
         exit_time: datetime,
         exit_station: int
     ) -> Union[Optional[Session], Exception]:
-        query = """
-            UPDATE session
-            SET licence_plate_exit = ?,
-                exit_time = ?,
-                exit_station = ?,
-                status = 'exited'
-            WHERE UPPER(licence_plate_entry) = UPPER(?)
-            AND status = 'active'
-            ORDER BY entry_time DESC
-            LIMIT 1
-            """
+        query = CLOSE_SESSION_QUERY
 
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute(
+        def update(connection: sqlite3.Connection) -> Optional[Session]:
+            # Picking and closing the session is one statement, so two lanes
+            # can't close the same session
+            cursor = connection.execute(
                 query,
                 (
                     exit_license_plate,
                     exit_time,
                     exit_station,
-                    license_plate
+                    normalize_plate(license_plate)
                 )
             )
-            self.db_connection.commit()
+            row = cursor.fetchone()
+            return Session(*row) if row else None
 
-            if cursor.rowcount == 0:
+        try:
+            session = self.writer.execute(update, on_commit=self._index_closed)
+            if session is None:
                 logger.info(f"No active session found to update for license plate {license_plate}")
                 return None
 
-            return self.get_session_by_license_plate(exit_license_plate)
+            logger.info(f"Closed session {session.id} for license plate {license_plate}")
+            return session
+        except DatabaseWriteTimeoutError as e:
+            logger.warning(f"Closing session for license plate {license_plate} is still pending: {str(e)}")
+            return e
         except sqlite3.Error as e:
             logger.info(f"Database error while updating session for license plate {license_plate}: {str(e)}")
             return Exception(f'Database error: {str(e)}')
@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
-from app.api.routers import resolve
+from app.api.routers import resolve, metrics, health
 
 api_router = APIRouter()
 api_router.prefix = "/api"
 api_router.default_response_class = JSONResponse
 
 
-api_router.include_router(resolve.router, prefix="/resolve", tags=["Resolve"])
\ No newline at end of file
+api_router.include_router(resolve.router, prefix="/resolve", tags=["Resolve"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
\ No newline at end of file
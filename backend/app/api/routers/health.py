@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Response, status
+
+import config
+from app.core.audio import get_transcriber_warm_up_state
+from app.core.speech import SpeechSynthesizer, WarmUpState, get_speech_synthesizer
+
+router = APIRouter()
+
+
+@router.get(
+    "/ready",
+)
+def get_readiness(
+    response: Response,
+    speech_synthesizer: SpeechSynthesizer = Depends(get_speech_synthesizer)
+):
+    """
+    The app is ready once every model warmed up at startup is loaded, that is
+    the speech synthesizer unless TTS_WARM_UP is false and the speech
+    recognition model with the local transcriber. Responds 503 until then.
+    """
+    models = {
+        "speech_synthesizer": speech_synthesizer.warm_up_state
+    }
+    warming_up = []
+    if config.env_optional_param('TTS_WARM_UP') != 'false':
+        warming_up.append(speech_synthesizer.warm_up_state)
+
+    transcriber_state = get_transcriber_warm_up_state()
+    if transcriber_state is not None:
+        models["transcriber"] = transcriber_state
+        warming_up.append(transcriber_state)
+
+    ready = all(state == WarmUpState.READY for state in warming_up)
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "ready": ready,
+        "voice_ready": speech_synthesizer.warm_up_state == WarmUpState.READY,
+        "models": {name: state.value for name, state in models.items()}
+    }
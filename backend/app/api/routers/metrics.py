@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+
+from app.api.repositories import ActiveSessionIndex, get_active_session_index
+from app.core.audio import TranscriptionLimiter, get_transcription_limiter
+from app.core.conversation import ConversationStore, get_conversation_store
+from app.core.database import DatabaseManager, get_database_manager
+from app.core.plate import PlateIndex, get_plate_index
+from app.core.speech import AudioResponseStore, SpeechSynthesizer, get_audio_store, get_speech_synthesizer
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+)
+def get_metrics(
+    conversation_store: ConversationStore = Depends(get_conversation_store),
+    speech_synthesizer: SpeechSynthesizer = Depends(get_speech_synthesizer),
+    audio_store: AudioResponseStore = Depends(get_audio_store),
+    transcription_limiter: TranscriptionLimiter = Depends(get_transcription_limiter),
+    database: DatabaseManager = Depends(get_database_manager),
+    plate_index: PlateIndex = Depends(get_plate_index),
+    active_sessions: ActiveSessionIndex = Depends(get_active_session_index)
+):
+    return {
+        "conversation_store": conversation_store.stats(),
+        "speech_synthesizer": speech_synthesizer.stats(),
+        "audio_store": audio_store.stats(),
+        "transcription": transcription_limiter.stats(),
+        "database": database.stats(),
+        "plate_index": plate_index.stats(),
+        "active_sessions": active_sessions.stats()
+    }
@@ -1,31 +1,49 @@
+import asyncio
+import base64
 import json
 import os
 import sqlite3
-from pathlib import Path
 
-import numpy as np
 from app.config.logging import logging
 from enum import Enum
-from typing import Union, Optional
+from typing import AsyncIterator, Union, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, status, UploadFile, Form
+from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall, Function
 from pydantic import BaseModel
-from starlette.responses import FileResponse
-
-from transformers import pipeline
-import soundfile as sf
+from starlette.responses import Response, StreamingResponse
 
 import config
 
-from app.core.document import BaseDocumentProcessor, get_document_processor
-from app.core.audio import AudioTranscriber, get_transcriber
+from app.core.document import BaseDocumentProcessor, DocumentTooLargeError, get_document_processor
+from app.core.audio import (
+    AudioDecodeError,
+    AudioPreprocessor,
+    TranscriberBusyError,
+    TranscriptionLimiter,
+    get_audio_preprocessor,
+    get_transcription_limiter
+)
 from app.config.tools import tools
-from app.core.agent import get_openai_client, OpenAI
+from app.core.agent import get_async_openai_client, AsyncOpenAI
+from app.core.conversation import ConversationStore, get_conversation_store
+from app.core.speech import (
+    AudioFormat,
+    AudioResponseStore,
+    SpeechSynthesizer,
+    SynthesizerBusyError,
+    audio_formats,
+    get_audio_format,
+    get_audio_store,
+    get_speech_synthesizer
+)
+from app.core.speech.streaming import SentenceAudio, SentenceAudioStream
 
 import config
 
 from app.api.service.session_service import SessionService
 
+from app.api.tools.executor import ToolExecutor
 from app.api.tools.lost_ticket import tool_name as lost_ticket_tool_name, LostTicketTool
 from app.api.tools.customer_payment_failed import tool_name as customer_payment_failed_tool_name, CustomerPaymentFailedTool
 from app.api.tools.invalid_license_plate import tool_name as invalid_license_plate_tool_name, InvalidLicensePlateTool
@@ -35,7 +53,6 @@ router = APIRouter()
 logger = logging.getLogger('resolve')
 
 
-conversation_history = []
 system_prompt = """
 You are a highly intelligent AI assistant specialized in managing customer parking sessions and resolving payment related problems.
 
@@ -91,12 +108,23 @@ tool_functions = {
     invalid_license_plate_tool_name: InvalidLicensePlateTool().execute
 }
 
-synthesizer = pipeline(
-    task="text-to-speech",
-    model="suno/bark-small",
-    token=os.environ['HUGGINGFACE_API_KEY']
+tool_executor = ToolExecutor(
+    tool_functions,
+    max_workers=config.env_int_param('TOOL_MAX_WORKERS', 4),
+    timeout_seconds=config.env_float_param('TOOL_TIMEOUT_SECONDS', 10),
+    # These close sessions
+    write_tools=[lost_ticket_tool_name, customer_payment_failed_tool_name, invalid_license_plate_tool_name]
 )
 
+chat_timeout = config.env_float_param('OPENAI_CHAT_TIMEOUT_SECONDS', 30)
+
+# 'memory' transcribes uploads without touching the disk, 'disk' stores them first
+voice_upload_mode = config.env_optional_param('VOICE_UPLOAD_MODE') or 'memory'
+persist_voice_uploads = config.env_optional_param('PERSIST_VOICE_UPLOADS') == 'true'
+preprocess_voice_uploads = config.env_optional_param('AUDIO_PREPROCESSING') != 'false'
+
+busy_message = "All our operators are busy right now. Please repeat your request in a moment."
+
 
 def create_message(tool_call, message):
     return {
@@ -107,30 +135,32 @@ def create_message(tool_call, message):
     }
 
 
-def synthesize_response_voice(response: ResolveResponse, output_path: str = "output.wav"):
-    audio_array = synthesizer(response.text)
-
-    audio_data = audio_array["audio"]
-    sampling_rate = audio_array["sampling_rate"]
+async def synthesize_response_voice(
+    response: ResolveResponse,
+    synthesizer: SpeechSynthesizer,
+    audio_store: AudioResponseStore,
+    audio_format: AudioFormat
+):
+    try:
+        audio = await synthesizer.synthesize(response.text, audio_format)
+    except SynthesizerBusyError:
+        logger.warning("Speech synthesis is busy, replying with text only")
+        return
 
-    full_output_path = f'uploads/output/{output_path}'
-    sf.write(
-        full_output_path,
-        np.ravel(audio_data),
-        samplerate=sampling_rate
-    )
+    audio_id = await asyncio.to_thread(audio_store.put, audio, audio_formats[audio_format].media_type)
 
-    response.audio_path = full_output_path
+    response.audio_path = f"/api/resolve/voice-response/{audio_id}"
     response.is_audio = True
 
 
-def chat_with_openai(messages, client, model='gpt-4o') -> ResolveResponse:
+async def chat_with_openai(messages, client: AsyncOpenAI, model='gpt-4o') -> ResolveResponse:
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=messages,
             tools=tools,
-            tool_choice='auto'
+            tool_choice='auto',
+            timeout=chat_timeout
         )
 
         response_message = response.choices[0].message
@@ -139,28 +169,17 @@ def chat_with_openai(messages, client, model='gpt-4o') -> ResolveResponse:
         if response_message.tool_calls:
             messages.append(response_message)
 
-            for tool_call in response_message.tool_calls:
-                function_name = tool_call.function.name
-                args = json.loads(tool_call.function.arguments)
+            results = await tool_executor.execute(response_message.tool_calls)
+            for tool_call, (result, executed) in zip(response_message.tool_calls, results):
+                messages.append(create_message(tool_call, result))
+                is_tool_executed = is_tool_executed or executed
 
-                if function_name not in tool_functions:
-                    messages.append(
-                        create_message(
-                            tool_call,
-                            f"Error: Function {function_name} not implemented."
-                        )
-                    )
-                else:
-                    result = tool_functions[function_name](**args)
-                    messages.append(create_message(tool_call, str(result)))
-
-                    is_tool_executed = True
-
-            second_response = client.chat.completions.create(
+            second_response = await client.chat.completions.create(
                 model=model,
                 messages=messages,
                 tools=tools,
-                tool_choice='auto'
+                tool_choice='auto',
+                timeout=chat_timeout
             )
             return ResolveResponse.model_validate({
                 "text": second_response.choices[0].message.content,
@@ -173,80 +192,426 @@ def chat_with_openai(messages, client, model='gpt-4o') -> ResolveResponse:
             })
 
     except Exception as e:
+        logger.error(f"Error completing chat: {str(e)}")
         return ResolveResponse.model_validate({
             "text": f"Encountered technical errors. Please contact the helpdesk.",
             "is_finished": True
         })
 
 
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def format_audio_event(chunk: SentenceAudio, audio_format: AudioFormat) -> str:
+    return format_event("audio", {
+        "index": chunk.index,
+        "text": chunk.text,
+        "media_type": audio_formats[audio_format].media_type,
+        "audio": base64.b64encode(chunk.audio).decode("ascii")
+    })
+
+
+async def stream_completion(
+    messages,
+    client: AsyncOpenAI,
+    model: str,
+    tool_call_deltas: dict[int, dict]
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    Stream one chat completion, yielding ``("token", text)`` for content
+    tokens and ``("tool", name)`` as soon as the name of a tool call arrives.
+
+    Args:
+        messages: Messages to send.
+        client (AsyncOpenAI): OpenAI client.
+        model (str): Model name.
+        tool_call_deltas (dict[int, dict]): Collects the streamed tool calls by their index.
+    """
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        tools=tools,
+        tool_choice='auto',
+        stream=True,
+        timeout=chat_timeout
+    )
+
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+
+        delta = chunk.choices[0].delta
+        if delta.content:
+            yield "token", delta.content
+
+        for tool_call_delta in delta.tool_calls or []:
+            tool_call = tool_call_deltas.setdefault(
+                tool_call_delta.index,
+                {"id": None, "name": "", "arguments": ""}
+            )
+            if tool_call_delta.id:
+                tool_call["id"] = tool_call_delta.id
+            if tool_call_delta.function:
+                started = not tool_call["name"]
+                tool_call["name"] += tool_call_delta.function.name or ""
+                tool_call["arguments"] += tool_call_delta.function.arguments or ""
+                if started and tool_call["name"]:
+                    yield "tool", tool_call["name"]
+
+
+async def stream_chat_with_openai(
+    messages,
+    client: AsyncOpenAI,
+    response: ResolveResponse,
+    model='gpt-4o'
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Streaming variant of chat_with_openai, yielding (event, data) pairs.
+
+    Tokens are sent as they are generated. A tool call is announced as soon
+    as the model starts it, and the tokens of that turn generated after it are
+    held back. When the model also calls tools, a ``reset`` event tells the
+    client to drop the tokens sent so far before the tokens of the answer
+    written from the tool results. An error after tokens were sent also emits
+    ``reset``, the error reply follows in the response. The final text and
+    state are written to the given response.
+    """
+    try:
+        tool_call_deltas: dict[int, dict] = {}
+        content = ""
+        async for kind, value in stream_completion(messages, client, model, tool_call_deltas):
+            if kind == "tool":
+                yield "tool", {"name": value, "status": "started"}
+                continue
+
+            content += value
+            if not tool_call_deltas:
+                response.text += value
+                yield "token", {"text": value}
+
+        if tool_call_deltas:
+            tool_calls = [
+                ChatCompletionMessageToolCall(
+                    id=tool_call["id"],
+                    type="function",
+                    function=Function(name=tool_call["name"], arguments=tool_call["arguments"])
+                )
+                for _, tool_call in sorted(tool_call_deltas.items())
+            ]
+            messages.append({
+                "role": "assistant",
+                "content": content or None,
+                "tool_calls": [tool_call.model_dump() for tool_call in tool_calls]
+            })
+
+            results = await tool_executor.execute(tool_calls)
+            for tool_call, (result, executed) in zip(tool_calls, results):
+                messages.append(create_message(tool_call, result))
+                response.is_finished = response.is_finished or executed
+                yield "tool", {
+                    "name": tool_call.function.name,
+                    "status": "finished" if executed else "failed"
+                }
+
+            # The client already shows the text sent with the tool calls,
+            # it's replaced by the answer written from the tool results
+            if response.text:
+                response.text = ""
+                yield "reset", {}
+            async for kind, value in stream_completion(messages, client, model, {}):
+                if kind == "token":
+                    response.text += value
+                    yield "token", {"text": value}
+
+    except Exception as e:
+        logger.error(f"Error streaming chat: {str(e)}")
+        # The client drops the partial answer, the error reply replaces it
+        if response.text:
+            yield "reset", {}
+        response.text = "Encountered technical errors. Please contact the helpdesk."
+        response.is_finished = True
+
+
+async def get_request_message(
+    request_type: RequestType,
+    request_value: Union[str, UploadFile],
+    document_processor: BaseDocumentProcessor,
+    transcription_limiter: TranscriptionLimiter,
+    audio_preprocessor: AudioPreprocessor,
+    background_tasks: BackgroundTasks
+) -> str:
+    if request_type == RequestType.VOICE_REQUEST:
+        logger.info(f'Received CV {request_value.filename}')
+
+        if voice_upload_mode == 'disk':
+            document_path = await document_processor.process(request_value)
+
+            # Call transcriber
+            return await transcription_limiter.transcribe(document_path)
+
+        # The upload goes straight to the transcriber, storing it is off the critical path
+        audio = await document_processor.read(request_value)
+        filename = request_value.filename or "audio.wav"
+        if persist_voice_uploads:
+            background_tasks.add_task(document_processor.save, audio, request_value.filename)
+
+        if preprocess_voice_uploads:
+            # Silent clips are rejected here, before paying for recognition
+            try:
+                audio = await asyncio.to_thread(audio_preprocessor.process, audio)
+                filename = "audio.wav"
+            except AudioDecodeError as e:
+                logger.warning(f"Sending audio without preprocessing: {str(e)}")
+
+        return await transcription_limiter.transcribe_bytes(audio, filename)
+
+    return request_value
+
+
 @router.post(
     "/",
 )
 async def resolve(
     request_type: RequestType = Form(...),
     request_value: Union[str, UploadFile] = Form(...),
+    conversation_id: str = Form('default'),
+    audio_format: Optional[AudioFormat] = Form(None),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
     document_processor: BaseDocumentProcessor = Depends(get_document_processor),
-    transcriber: AudioTranscriber = Depends(get_transcriber),
-    client: OpenAI = Depends(get_openai_client)
+    transcription_limiter: TranscriptionLimiter = Depends(get_transcription_limiter),
+    audio_preprocessor: AudioPreprocessor = Depends(get_audio_preprocessor),
+    client: AsyncOpenAI = Depends(get_async_openai_client),
+    conversation_store: ConversationStore = Depends(get_conversation_store),
+    speech_synthesizer: SpeechSynthesizer = Depends(get_speech_synthesizer),
+    audio_store: AudioResponseStore = Depends(get_audio_store)
 ) -> ResolveResponse:
-    if request_type == RequestType.VOICE_REQUEST:
-        logger.info(f'Received CV {request_value.filename}')
-
-        document_path = await document_processor.process(request_value)
-
-        try:
-            # Call transcriber
-            message = transcriber.transcribe(document_path)
-        except Exception as e:
-            return ResolveResponse.model_validate({
-                "text": f"Error transcribing audio: {str(e)}",
-                "is_finished": False
-            })
-    else:
-        message = request_value
+    try:
+        message = await get_request_message(
+            request_type,
+            request_value,
+            document_processor,
+            transcription_limiter,
+            audio_preprocessor,
+            background_tasks
+        )
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except TranscriberBusyError as e:
+        logger.warning(f"Transcription rejected: {str(e)}")
+        return ResolveResponse.model_validate({
+            "text": busy_message,
+            "is_finished": False
+        })
+    except Exception as e:
+        return ResolveResponse.model_validate({
+            "text": f"Error transcribing audio: {str(e)}",
+            "is_finished": False
+        })
 
-    conversation_history.append({"role": "user", "content": message})
+    conversation_store.append(conversation_id, {"role": "user", "content": message})
 
     # Prepare messages with system prompt
-    messages = [{"role": "system", "content": system_prompt}, *conversation_history]
+    messages = [{"role": "system", "content": system_prompt}, *conversation_store.get_history(conversation_id)]
 
     # Get response using the chat function
-    response: ResolveResponse = chat_with_openai(
+    response: ResolveResponse = await chat_with_openai(
         messages,
         client,
         config.env_param('OPENAI_MODEL')
     )
 
     # Add assistant response to history
-    conversation_history.append({"role": "assistant", "content": response.text})
+    conversation_store.append(conversation_id, {"role": "assistant", "content": response.text})
 
     if request_type == RequestType.VOICE_REQUEST:
         try:
-            synthesize_response_voice(response)
+            await synthesize_response_voice(
+                response,
+                speech_synthesizer,
+                audio_store,
+                get_audio_format(conversation_id, audio_format)
+            )
         except Exception as e:
             logger.error(f"Error synthesizing voice: {str(e)}")
 
     return response
 
 
+@router.post(
+    "/stream",
+)
+async def resolve_stream(
+    request_type: RequestType = Form(...),
+    request_value: Union[str, UploadFile] = Form(...),
+    conversation_id: str = Form('default'),
+    stream_audio: bool = Form(False),
+    audio_format: Optional[AudioFormat] = Form(None),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    document_processor: BaseDocumentProcessor = Depends(get_document_processor),
+    transcription_limiter: TranscriptionLimiter = Depends(get_transcription_limiter),
+    audio_preprocessor: AudioPreprocessor = Depends(get_audio_preprocessor),
+    client: AsyncOpenAI = Depends(get_async_openai_client),
+    conversation_store: ConversationStore = Depends(get_conversation_store),
+    speech_synthesizer: SpeechSynthesizer = Depends(get_speech_synthesizer),
+    audio_store: AudioResponseStore = Depends(get_audio_store)
+) -> StreamingResponse:
+    """
+    Streaming variant of resolve using server-sent events.
+
+    Emits ``tool`` events with the tool execution status, ``token`` events with
+    the answer as it is generated, a ``reset`` event when the tokens sent so
+    far are replaced by the answer written from tool results or by an error
+    reply, and a terminal ``done`` event carrying the ResolveResponse. With
+    ``stream_audio`` a voice reply is synthesized sentence by sentence and
+    sent as ``audio`` events, while later sentences are still being generated.
+    """
+    response = ResolveResponse(text="")
+
+    # The upload is consumed before streaming starts, it is closed once the handler returns
+    try:
+        message = await get_request_message(
+            request_type,
+            request_value,
+            document_processor,
+            transcription_limiter,
+            audio_preprocessor,
+            background_tasks
+        )
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except TranscriberBusyError as e:
+        logger.warning(f"Transcription rejected: {str(e)}")
+        message = None
+        response.text = busy_message
+    except Exception as e:
+        message = None
+        response.text = f"Error transcribing audio: {str(e)}"
+
+    async def events() -> AsyncIterator[str]:
+        if message is None:
+            yield format_event("done", response.model_dump())
+            return
+
+        conversation_store.append(conversation_id, {"role": "user", "content": message})
+
+        messages = [{"role": "system", "content": system_prompt}, *conversation_store.get_history(conversation_id)]
+
+        audio_stream = None
+        if request_type == RequestType.VOICE_REQUEST and stream_audio:
+            audio_stream = SentenceAudioStream(speech_synthesizer, get_audio_format(conversation_id, audio_format))
+
+        try:
+            streamed_text = ""
+            async for event, data in stream_chat_with_openai(messages, client, response, config.env_param('OPENAI_MODEL')):
+                yield format_event(event, data)
+
+                if audio_stream:
+                    if event == "token":
+                        streamed_text += data["text"]
+                        audio_stream.feed(data["text"])
+                    elif event == "reset":
+                        streamed_text = ""
+                    for chunk in audio_stream.ready():
+                        if chunk.audio:
+                            yield format_audio_event(chunk, audio_stream.audio_format)
+
+            conversation_store.append(conversation_id, {"role": "assistant", "content": response.text})
+
+            if audio_stream:
+                # Error replies are not streamed as tokens
+                if not streamed_text:
+                    audio_stream.feed(response.text)
+                audio_stream.close()
+
+                async for chunk in audio_stream.drain():
+                    if chunk.audio:
+                        response.is_audio = True
+                        yield format_audio_event(chunk, audio_stream.audio_format)
+            elif request_type == RequestType.VOICE_REQUEST:
+                try:
+                    await synthesize_response_voice(
+                        response,
+                        speech_synthesizer,
+                        audio_store,
+                        get_audio_format(conversation_id, audio_format)
+                    )
+                except Exception as e:
+                    logger.error(f"Error synthesizing voice: {str(e)}")
+
+            yield format_event("done", response.model_dump())
+        finally:
+            if audio_stream:
+                audio_stream.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post(
     "/close",
 )
-def close_conversation():
-    conversation_history.clear()
+def close_conversation(
+    conversation_id: str = Form('default'),
+    conversation_store: ConversationStore = Depends(get_conversation_store)
+):
+    conversation_store.clear(conversation_id)
     return {"status": "Conversation history cleared."}
 
 
-@router.get("/voice-repsonse/download")
-def download_file(
-        file_path: str
+def parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single ``bytes=start-end`` range into inclusive offsets.
+    """
+    unit, _, value = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in value:
+        return None
+
+    start, _, end = value.strip().partition("-")
+    try:
+        if start:
+            first, last = int(start), int(end) if end else size - 1
+        else:
+            first, last = size - int(end), size - 1
+    except ValueError:
+        return None
+
+    first, last = max(first, 0), min(last, size - 1)
+    if first > last:
+        return None
+    return first, last
+
+
+@router.get("/voice-response/{audio_id}")
+def download_voice_response(
+    audio_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    audio_store: AudioResponseStore = Depends(get_audio_store)
 ):
-    current_dir = Path.cwd()
-    if os.path.exists(str(current_dir) + file_path):
-        return FileResponse(
-            path=str(current_dir) + file_path,
-            filename="voice.wav",  # download name
-            media_type="audio/wav"  # optional: correct MIME type
+    audio = audio_store.get(audio_id)
+    if audio is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voice response not found")
+
+    size = len(audio.data)
+    headers = {"Accept-Ranges": "bytes"}
+
+    if range_header is None:
+        return Response(content=audio.data, media_type=audio.media_type, headers=headers)
+
+    byte_range = parse_range(range_header, size)
+    if byte_range is None:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
         )
-    return {"error": "File not found"}
 
+    first, last = byte_range
+    return Response(
+        content=audio.data[first:last + 1],
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=audio.media_type,
+        headers={**headers, "Content-Range": f"bytes {first}-{last}/{size}"}
+    )
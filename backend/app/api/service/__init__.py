@@ -1,5 +1,29 @@
-from .session_service import SessionService
+import asyncio
+
+import config
+from app.config.logging import logging
+
+from .session_service import SessionService, get_close_session_error
+
+logger = logging.getLogger('session_service')
 
 
 def get_session_service():
     return SessionService()
+
+
+async def sync_active_sessions_periodically():
+    """
+    Load the active sessions at startup, then re-sync them with the database
+    every ACTIVE_SESSIONS_SYNC_INTERVAL_SECONDS to pick up other writers.
+    """
+    interval = config.env_float_param('ACTIVE_SESSIONS_SYNC_INTERVAL_SECONDS', 60)
+    session_service = get_session_service()
+
+    while True:
+        try:
+            active = await session_service.sync_active_sessions()
+            logger.debug(f"Synced {active} active sessions")
+        except Exception as e:
+            logger.error(f"Error syncing the active sessions: {str(e)}")
+        await asyncio.sleep(interval)
@@ -4,47 +4,78 @@ from typing import Union, Optional
 
 from app.api.model.session import Session
 
-from app.api.repositories import SessionRepository, get_session_repository
+from app.api.repositories import AsyncSessionRepository, get_async_session_repository
+from app.core.database import DatabaseWriteTimeoutError
+from app.core.plate import PlateIndex, PlateMatcher, get_plate_index, get_plate_matcher
 
 logger = logging.getLogger('session_service')
 
 
+def get_close_session_error(
+    license_plate: str,
+    closed: Union[Optional[Session], Exception]
+) -> Optional[str]:
+    """
+    Get the message for the customer when closing a session didn't succeed.
+
+    Args:
+        license_plate (str): The license plate the customer gave.
+        closed (Union[Optional[Session], Exception]): Result of closing the session.
+
+    Returns:
+        Optional[str]: The message, None when the session was closed.
+    """
+    if isinstance(closed, DatabaseWriteTimeoutError):
+        # The exit may still be committed, don't report it as failed
+        logger.warning(f"Closing session for license plate {license_plate} is still pending")
+        return f"The exit for license plate {license_plate} is still being registered. Please wait a moment, and call the helpdesk if the barrier doesn't open."
+    if isinstance(closed, Exception):
+        logger.info(f"Error closing session for license plate {license_plate}: {str(closed)}")
+        return f"Error closing session for license plate {license_plate}: {str(closed)}. Call the helpdesk for further assistance."
+    if closed is None:
+        logger.info(f"No active session left to close for license plate {license_plate}")
+        return f"No active session found for license plate {license_plate}, it may already be closed. Call the helpdesk for further assistance."
+    return None
+
+
 class SessionService:
 
-    def __init__(self, session_repository: SessionRepository = None):
-        self.session_repository = session_repository or get_session_repository()
+    def __init__(
+        self,
+        session_repository: AsyncSessionRepository = None,
+        plate_matcher: PlateMatcher = None,
+        plate_index: PlateIndex = None
+    ):
+        self.session_repository = session_repository or get_async_session_repository()
+        self.plate_matcher = plate_matcher or get_plate_matcher()
+        self.plate_index = plate_index or get_plate_index()
 
     def _get_closest_license_plate(
         self,
         license_plate: str,
         sessions: list[Session]
     ) -> Union[Optional[Session], Exception]:
-        license_plate_length = len(license_plate)
-        similarities: list[(Session, int)] = []
-        for session in sessions:
-            similarities_score = 0
-
-            for i in range(min(license_plate_length, len(session.licence_plate_entry))):
-                if license_plate[i] == session.licence_plate_entry[i]:
-                    similarities_score += 1
-
-            similarities.append((session, similarities_score))
-
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        closest_session, similarity_score = similarities[0] if len(similarities) > 0 else (None, 0)
-
-        if similarity_score / len(license_plate) < 0.5:
+        matches = self.plate_matcher.rank(
+            license_plate,
+            sessions,
+            key=lambda session: session.licence_plate_entry,
+            limit=3
+        )
+
+        if not matches:
             logger.info(
                 f"No sufficiently similar session found for license plate {license_plate}")
             return Exception(
                 f'No sufficiently similar session found for license plate {license_plate}')
 
         logger.info(
-            f"Found similar session for license plate {license_plate}")
+            f"Found similar sessions for license plate {license_plate}: " + ", ".join(
+                f"{match.plate} ({match.confidence:.2f})" for match in matches
+            ))
 
-        return closest_session
+        return matches[0].candidate
 
-    def get_similar_by_license_plate_entry_time_interval_and_entry_station(
+    async def get_similar_by_license_plate_entry_time_interval_and_entry_station(
         self,
         license_plate: str,
         entry_time_interval: (datetime, datetime),
@@ -52,7 +83,7 @@ class SessionService:
         **kwargs
     ) -> Union[Optional[Session], Exception]:
         try:
-            result: Union[list[Session], Exception] = self.session_repository.get_session_by_entry_time_interval_and_entry_station(
+            result: Union[list[Session], Exception] = await self.session_repository.get_session_by_entry_time_interval_and_entry_station(
                 entry_time_interval,
                 entry_station
             )
@@ -79,7 +110,7 @@ class SessionService:
             logger.info(f"Error retrieving similar sessions for license plate {license_plate}, entry_time_interval {entry_time_interval}, and entry_station {entry_station}: {str(e)}")
             return e
 
-    def get_similar_by_license_plate_entry_time_and_entry_station(
+    async def get_similar_by_license_plate_entry_time_and_entry_station(
         self,
         license_plate: str,
         entry_time: datetime,
@@ -87,7 +118,7 @@ class SessionService:
         **kwargs
     ) -> Union[Optional[Session], Exception]:
         try:
-            result: Union[list[Session], Exception] = self.session_repository.get_session_by_entry_time_and_entry_station(
+            result: Union[list[Session], Exception] = await self.session_repository.get_session_by_entry_time_and_entry_station(
                 entry_time,
                 entry_station
             )
@@ -104,17 +135,74 @@ class SessionService:
             logger.info(f"Error retrieving similar sessions for license plate {license_plate}, entry_time {entry_time}, and entry_station {entry_station}: {str(e)}")
             return e
 
-    def get_session_by_license_plate(
+    async def get_session_by_license_plate(
         self,
         license_plate: str,
         **kwargs
     ) -> Union[Optional[Session], Exception]:
         try:
-            result: Union[list[Session], Exception] = self.session_repository.get_session_by_license_plate(
+            result: Union[list[Session], Exception] = await self.session_repository.get_session_by_license_plate(
                 license_plate
             )
 
             return result
         except Exception as e:
             logger.info(f"Error retrieving sessions for license plate {license_plate}: {str(e)}")
-            return e
\ No newline at end of file
+            return e
+
+    async def get_similar_by_license_plate(
+        self,
+        license_plate: str,
+        **kwargs
+    ) -> Union[Optional[Session], Exception]:
+        """
+        Find the active session with the closest plate across the whole lot.
+
+        The plate index knows the sessions of this process and of the last
+        periodic sync, a miss doesn't reload the active sessions. The matched
+        session is read back from the database.
+        """
+        try:
+            matches = self.plate_index.nearest(license_plate, limit=3)
+            if not matches:
+                logger.info(f"No similar plate in the lot for license plate {license_plate}")
+                return None
+
+            logger.info(
+                f"Found similar plates in the lot for license plate {license_plate}: " + ", ".join(
+                    f"{match.plate} ({match.confidence:.2f})" for match in matches
+                ))
+
+            if len(matches) > 1 and matches[0].distance == matches[1].distance:
+                return Exception(f'Several sessions match license plate {license_plate} equally well')
+
+            return await self.session_repository.get_active_session_by_id(matches[0].candidate.id)
+        except Exception as e:
+            logger.info(f"Error retrieving similar sessions for license plate {license_plate}: {str(e)}")
+            return e
+
+    async def close_session(
+        self,
+        license_plate: str,
+        exit_license_plate: str,
+        exit_time: datetime,
+        exit_station: int
+    ) -> Union[Optional[Session], Exception]:
+        return await self.session_repository.close_session(
+            license_plate=license_plate,
+            exit_license_plate=exit_license_plate,
+            exit_time=exit_time,
+            exit_station=exit_station
+        )
+
+    async def sync_active_sessions(self) -> int:
+        """
+        Bring the active session and plate indexes in line with the database.
+
+        Returns:
+            int: Number of active sessions.
+        """
+        result = await self.session_repository.load_active_sessions()
+        if isinstance(result, Exception):
+            raise result
+        return result
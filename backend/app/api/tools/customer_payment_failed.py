@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from app.api.repositories import get_session_repository, SessionRepository, get_payment_repository, PaymentRepository
+from app.api.repositories import get_async_session_repository, AsyncSessionRepository
+from app.api.service import get_close_session_error
 from app.config.logging import logging
 
 logger = logging.getLogger('customer_payment_failed_tool')
@@ -13,46 +14,46 @@ class CustomerPaymentFailedTool:
 
     def __init__(
         self,
-        session_repository: SessionRepository = None,
-        payment_repository: PaymentRepository = None
+        session_repository: AsyncSessionRepository = None
     ):
-        self.session_repository = session_repository or get_session_repository()
-        self.payment_repository = payment_repository or get_payment_repository()
+        self.session_repository = session_repository or get_async_session_repository()
 
-    def execute(
+    async def execute(
         self,
         license_plate: str
     ) -> str:
         try:
-            session = self.session_repository.get_session_by_license_plate(license_plate)
-            if isinstance(session, Exception):
-                logger.info(f"Error retrieving session for license plate {license_plate}: {str(session)}")
-                return f"Error retrieving session for license plate {license_plate}: {str(session)}. Call the helpdesk for further assistance."
-            if session is None:
+            session_payments = await self.session_repository.get_session_with_payments_by_license_plate(license_plate)
+            if isinstance(session_payments, Exception):
+                logger.info(f"Error retrieving session for license plate {license_plate}: {str(session_payments)}")
+                return f"Error retrieving session for license plate {license_plate}: {str(session_payments)}. Call the helpdesk for further assistance."
+            if session_payments is None:
                 logger.info(f"No active session found for license plate {license_plate}")
                 return f"No active session found for license plate {license_plate}. Call the helpdesk for further assistance."
 
-            payment = self.payment_repository.get_payment_by_session_id(session.id)
-            if isinstance(payment, Exception):
-                logger.info(f"Error retrieving payment for license plate {license_plate}: {str(payment)}")
-                return f"Error retrieving payment for license plate {license_plate}: {str(payment)}. Call the helpdesk for further assistance."
-            if payment is None:
+            payments = session_payments.payments
+            if not payments:
                 logger.info(f"No payment record found for license plate {license_plate}")
                 return f"No payment record found for license plate {license_plate}. Please complete the payment or call the helpdesk for further assistance."
 
-            if not payment.approved:
-                logger.info(f"Payment for license plate {license_plate} was declined")
-                return f"Payment for license plate {license_plate} was declined. Please try another payment method or call the helpdesk for further assistance."
-            if session.amount_due_cents > session.amount_paid_cents:
+            outstanding_cents = session_payments.session.outstanding_cents
+            if outstanding_cents > 0:
+                if not payments[-1].approved:
+                    logger.info(f"Payment for license plate {license_plate} was declined")
+                    return f"Payment for license plate {license_plate} was declined. Please try another payment method or call the helpdesk for further assistance."
+
                 logger.info(
-                    f"Outstanding balance for license plate {license_plate}: {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}")
-                return f"You still owe {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}. Please complete the payment or call the helpdesk for further assistance."
+                    f"Outstanding balance for license plate {license_plate}: {outstanding_cents / 100:.2f}")
+                return f"You still owe {outstanding_cents / 100:.2f}. Please complete the payment or call the helpdesk for further assistance."
 
             logger.info(f"Payment for license plate {license_plate} was successful")
 
-            self.session_repository.close_session(license_plate=license_plate, exit_license_plate=license_plate,
+            closed = await self.session_repository.close_session(license_plate=license_plate, exit_license_plate=license_plate,
                 exit_station=2,  # TODO: Fix later
                 exit_time=datetime.now())
+            close_error = get_close_session_error(license_plate, closed)
+            if close_error:
+                return close_error
 
             return f"Payment for license plate {license_plate} was successful. You may proceed to exit."
         except Exception as e:
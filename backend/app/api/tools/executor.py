@@ -0,0 +1,80 @@
+import asyncio
+import functools
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, Union
+
+from app.config.logging import logging
+
+logger = logging.getLogger('tool_executor')
+
+
+class ToolExecutor:
+    """
+    Executes the tool calls of one model turn concurrently.
+
+    Coroutine tools run on the event loop, blocking ones on a bounded thread pool.
+
+    Only read-only tools are timed out. A timed-out coroutine is cancelled and
+    a blocking tool's thread is abandoned, but a database write either of them
+    already submitted still commits after the model was told the tool failed.
+    Tools named in ``write_tools`` therefore run to completion, bounded by the
+    database timeouts instead.
+    """
+
+    def __init__(
+        self,
+        tool_functions: dict[str, Callable[..., Union[str, Awaitable[str]]]],
+        max_workers: int = 4,
+        timeout_seconds: float = 10,
+        write_tools: Iterable[str] = ()
+    ):
+        self.tool_functions = tool_functions
+        self.timeout_seconds = timeout_seconds
+        self.write_tools = frozenset(write_tools)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tool')
+
+    async def _execute_one(self, tool_call) -> tuple[str, bool]:
+        function_name = tool_call.function.name
+
+        if function_name not in self.tool_functions:
+            return f"Error: Function {function_name} not implemented.", False
+
+        try:
+            args = json.loads(tool_call.function.arguments)
+            function = self.tool_functions[function_name]
+            if inspect.iscoroutinefunction(function):
+                call = function(**args)
+            else:
+                loop = asyncio.get_running_loop()
+                call = loop.run_in_executor(self._executor, functools.partial(function, **args))
+
+            if function_name in self.write_tools:
+                result = await call
+            else:
+                result = await asyncio.wait_for(call, timeout=self.timeout_seconds)
+            return str(result), True
+        except asyncio.TimeoutError:
+            # Coroutines are cancelled, worker threads can't be interrupted and finish in the background
+            logger.error(f"Function {function_name} timed out after {self.timeout_seconds}s")
+            return f"Error: Function {function_name} timed out. Call the helpdesk for further assistance.", False
+        except Exception as e:
+            logger.error(f"Function {function_name} failed: {str(e)}")
+            return f"Error: Function {function_name} failed: {str(e)}. Call the helpdesk for further assistance.", False
+
+    async def execute(self, tool_calls: list) -> list[tuple[str, bool]]:
+        """
+        Execute the tool calls concurrently.
+
+        Args:
+            tool_calls (list): Tool calls returned by the model.
+
+        Returns:
+            list[tuple[str, bool]]: Result message and whether the tool was executed,
+                in the original tool call order.
+        """
+        return await asyncio.gather(*(self._execute_one(tool_call) for tool_call in tool_calls))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from app.api.service import get_session_service, SessionService
+from app.api.service import get_close_session_error, get_session_service, SessionService
 from app.config.logging import logging
 
 logger = logging.getLogger('invalid_license_plate_tool')
@@ -17,15 +18,18 @@ class InvalidLicensePlateTool:
     ):
         self.session_service = session_service or get_session_service()
 
-    def execute(
+    async def execute(
         self,
         license_plate: str,
-        entry_time_interval: (str, str),
-        entry_station: int,
+        entry_time_interval: Optional[tuple[str, str]] = None,
+        entry_station: Optional[int] = None,
     ) -> str:
         try:
-            session = self.session_service.get_similar_by_license_plate_entry_time_interval_and_entry_station(
-                license_plate, entry_time_interval, entry_station)
+            if entry_time_interval and entry_station is not None:
+                session = await self.session_service.get_similar_by_license_plate_entry_time_interval_and_entry_station(
+                    license_plate, entry_time_interval, entry_station)
+            else:
+                session = await self.session_service.get_similar_by_license_plate(license_plate)
 
             if isinstance(session, Exception):
                 logger.info(f"Error retrieving session for license plate {license_plate}: {str(session)}")
@@ -34,14 +38,16 @@ class InvalidLicensePlateTool:
                 logger.info(f"No active session found for license plate {license_plate}")
                 return f"No active session found for license plate {license_plate}. Call the helpdesk for further assistance."
 
-            if session.amount_due_cents > session.amount_paid_cents:
-                logger.info(f"Outstanding balance for license plate {license_plate}: {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}")
-                return f"An active session was found for license plate {license_plate}, but there is an outstanding balance of {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}. Please proceed to payment or call the helpdesk for further assistance."
+            if session.outstanding_cents > 0:
+                logger.info(f"Outstanding balance for license plate {license_plate}: {session.outstanding_cents / 100:.2f}")
+                return f"An active session was found for license plate {license_plate}, but there is an outstanding balance of {session.outstanding_cents / 100:.2f}. Please proceed to payment or call the helpdesk for further assistance."
 
-            session_repository = self.session_service.session_repository
-            session_repository.close_session(license_plate=session.licence_plate_entry,
+            closed = await self.session_service.close_session(license_plate=session.licence_plate_entry,
                 exit_license_plate=license_plate, exit_station=2,  # TODO: Fix later
                 exit_time=datetime.now())
+            close_error = get_close_session_error(license_plate, closed)
+            if close_error:
+                return close_error
 
             if session.licence_plate_entry != license_plate:
                 logger.info(f"License plate corrected from {license_plate} to {session.licence_plate_entry}")
@@ -61,6 +67,7 @@ tool_description = {
         "description": """
             Should be used when the client's session is not found due to plate number mismatch on entry and exit gates.
             Assist a customer who entered a ticket-less gate and had their license plate number scanned incorrectly by the camera by asking their license plate number, entry time, and entered gate, and checking for an active session with these details. The goal is to find a session with similar details to identify the session with an incorrectly identified license plate number.
+            Entry time and gate may be null, the closest plate across the whole parking lot is searched then. Ask for them if that search fails.
         """,
         "parameters": {
             "type": "object",
@@ -70,18 +77,18 @@ tool_description = {
                     "description": "The license plate number to search for (e.g., 'ABC123')"
                 },
                 "entry_time_interval": {
-                    "type": "array",
+                    "type": ["array", "null"],
                     "items": {
                         "type": "string",
                         "format": "date-time"
                     },
                     "minItems": 2,
                     "maxItems": 2,
-                    "description": "The entry time interval (start and end) to search within (e.g., ['2023-10-01T08:00:00', '2023-10-01T10:00:00'])"
+                    "description": "The entry time interval (start and end) to search within (e.g., ['2023-10-01T08:00:00', '2023-10-01T10:00:00']), or null when unknown"
                 },
                 "entry_station": {
-                    "type": "integer",
-                    "description": "The entry station ID where the vehicle entered (e.g., 1)"
+                    "type": ["integer", "null"],
+                    "description": "The entry station ID where the vehicle entered (e.g., 1), or null when unknown"
                 },
             },
             "required": ["license_plate", "entry_time_interval", "entry_station"],
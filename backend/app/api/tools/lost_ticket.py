@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from app.api.repositories import get_session_repository, SessionRepository
+from app.api.repositories import get_async_session_repository, AsyncSessionRepository
+from app.api.service import get_close_session_error
 from app.config.logging import logging
 
 logger = logging.getLogger('lost_ticket_tool')
@@ -13,16 +14,16 @@ class LostTicketTool:
 
     def __init__(
         self,
-        session_repository: SessionRepository = None
+        session_repository: AsyncSessionRepository = None
     ):
-        self.session_repository = session_repository or get_session_repository()
+        self.session_repository = session_repository or get_async_session_repository()
 
-    def execute(
+    async def execute(
         self,
         license_plate: str,
     ) -> str:
         try:
-            session = self.session_repository.get_session_by_license_plate(license_plate)
+            session = await self.session_repository.get_session_by_license_plate(license_plate)
             if isinstance(session, Exception):
                 logger.info(f"Error retrieving session for license plate {license_plate}: {str(session)}")
                 return f"Error retrieving session for license plate {license_plate}: {str(session)}. Call the helpdesk for further assistance."
@@ -30,16 +31,19 @@ class LostTicketTool:
                 logger.info(f"No active session found for license plate {license_plate}")
                 return f"No active session found for license plate {license_plate}. Call the helpdesk for further assistance."
 
-            if session.amount_due_cents > session.amount_paid_cents:
-                logger.info(f"Outstanding balance for license plate {license_plate}: {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}")
-                return f"An active session was found for license plate {license_plate}, but there is an outstanding balance of {(session.amount_due_cents - session.amount_paid_cents) / 100:.2f}. Please proceed to payment or call the helpdesk for further assistance."
+            if session.outstanding_cents > 0:
+                logger.info(f"Outstanding balance for license plate {license_plate}: {session.outstanding_cents / 100:.2f}")
+                return f"An active session was found for license plate {license_plate}, but there is an outstanding balance of {session.outstanding_cents / 100:.2f}. Please proceed to payment or call the helpdesk for further assistance."
 
-            self.session_repository.close_session(
+            closed = await self.session_repository.close_session(
                 license_plate=license_plate,
                 exit_license_plate=license_plate,
                 exit_station=2,  # TODO: Fix later
                 exit_time=datetime.now()
             )
+            close_error = get_close_session_error(license_plate, closed)
+            if close_error:
+                return close_error
 
             logger.info(f"Payment for license plate {license_plate} was successful")
             return f"An active session was found for license plate {license_plate} with no outstanding balance. You may proceed to exit."
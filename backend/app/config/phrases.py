@@ -0,0 +1,9 @@
+# Phrases synthesized ahead of time, so the most common replies are served from the speech cache
+prewarm_phrases = [
+    "You may proceed to exit.",
+    "Call the helpdesk for further assistance.",
+    "Please stand by, an attendant will assist you at the lane.",
+    "Encountered technical errors. Please contact the helpdesk.",
+    "Please proceed to payment or call the helpdesk for further assistance.",
+    "Could you please tell me your license plate number?",
+]
@@ -2,11 +2,13 @@
 from typing import Optional
 
 import openai
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
 
 import config
 
 __openai_client: Optional[OpenAI] = None
+__async_openai_client: Optional[AsyncOpenAI] = None
 
 def chat_with_openai(messages):
     try:
@@ -52,3 +54,38 @@ def get_openai_client(
             api_key=config.env_param('OPENAI_API_KEY')
         )
     return __openai_client
+
+
+def get_async_openai_client(
+) -> AsyncOpenAI:
+    """
+    Get the shared async OpenAI client.
+
+    All requests go through one keep-alive connection pool, so concurrent
+    chat completions don't block the event loop or each other.
+    """
+    global __async_openai_client
+    if not __async_openai_client:
+        __async_openai_client = AsyncOpenAI(
+            api_key=config.env_param('OPENAI_API_KEY'),
+            timeout=config.env_float_param('OPENAI_TIMEOUT_SECONDS', 30),
+            max_retries=config.env_int_param('OPENAI_MAX_RETRIES', 2),
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.env_int_param('OPENAI_MAX_CONNECTIONS', 100),
+                    max_keepalive_connections=config.env_int_param('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20),
+                    keepalive_expiry=config.env_float_param('OPENAI_KEEPALIVE_EXPIRY_SECONDS', 30)
+                )
+            )
+        )
+    return __async_openai_client
+
+
+async def close_async_openai_client():
+    """
+    Close the shared async OpenAI client and its connection pool.
+    """
+    global __async_openai_client
+    if __async_openai_client:
+        await __async_openai_client.close()
+        __async_openai_client = None
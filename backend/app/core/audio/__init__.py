@@ -4,19 +4,89 @@ from typing import Optional
 import config
 from fastapi import Depends
 
+from .base_transcriber import BaseAudioTranscriber
+from .limiter import TranscriberBusyError, TranscriptionLimiter
+from .local_transcriber import LocalWhisperTranscriber
+from .preprocessing import AudioDecodeError, AudioPreprocessor, AudioTooLongError, EmptyAudioError
 from .transcriber import AudioTranscriber
-from ..agent import get_openai_client, OpenAI
+from ..agent import get_async_openai_client, get_openai_client, AsyncOpenAI, OpenAI
+from ..speech import WarmUpState
 
-__transcriber: Optional[AudioTranscriber] = None
+__transcriber: Optional[BaseAudioTranscriber] = None
+__audio_preprocessor: Optional[AudioPreprocessor] = None
+__transcription_limiter: Optional[TranscriptionLimiter] = None
 
 
 def get_transcriber(
-    openai_client: OpenAI = Depends(get_openai_client)
-) -> AudioTranscriber:
+    openai_client: OpenAI = Depends(get_openai_client),
+    async_openai_client: AsyncOpenAI = Depends(get_async_openai_client)
+) -> BaseAudioTranscriber:
     """
-    Get the document processor instance.
+    Get the transcriber instance, 'openai' or 'local' as set in TRANSCRIBER_BACKEND.
     """
     global __transcriber
     if not __transcriber:
-        __transcriber = AudioTranscriber(openai_client)
+        if config.env_optional_param('TRANSCRIBER_BACKEND') == 'local':
+            __transcriber = LocalWhisperTranscriber(
+                model=config.env_optional_param('LOCAL_ASR_MODEL') or "openai/whisper-base",
+                batch_window_seconds=config.env_float_param('LOCAL_ASR_BATCH_WINDOW_SECONDS', 0.02),
+                max_batch_size=config.env_int_param('LOCAL_ASR_MAX_BATCH_SIZE', 8),
+                num_threads=config.env_int_param('LOCAL_ASR_THREADS', 0) or None,
+                sample_rate=config.env_int_param('ASR_SAMPLE_RATE', 16000),
+                max_duration_seconds=config.env_float_param('UPLOAD_MAX_DURATION_SECONDS', 60)
+            )
+        else:
+            __transcriber = AudioTranscriber(openai_client, async_openai_client)
     return __transcriber
+
+
+def get_transcription_limiter(
+    transcriber: BaseAudioTranscriber = Depends(get_transcriber)
+) -> TranscriptionLimiter:
+    """
+    Get the transcription limiter instance, wrapping the transcriber.
+    """
+    global __transcription_limiter
+    if not __transcription_limiter:
+        __transcription_limiter = TranscriptionLimiter(
+            transcriber,
+            max_concurrency=config.env_int_param('ASR_MAX_CONCURRENCY', 4),
+            max_queue=config.env_int_param('ASR_MAX_QUEUE', 16),
+            timeout_seconds=config.env_float_param('ASR_TIMEOUT_SECONDS', 15)
+        )
+    return __transcription_limiter
+
+
+def warm_up_transcriber():
+    """
+    Load the local speech recognition model, when that backend is used.
+    """
+    if config.env_optional_param('TRANSCRIBER_BACKEND') == 'local':
+        transcriber = get_transcriber(get_openai_client(), get_async_openai_client())
+        transcriber.warm_up()
+
+
+def get_transcriber_warm_up_state() -> Optional[WarmUpState]:
+    """
+    Get the warm-up state of the local speech recognition model, None when
+    recognition runs remotely.
+    """
+    if config.env_optional_param('TRANSCRIBER_BACKEND') == 'local':
+        return get_transcriber(get_openai_client(), get_async_openai_client()).warm_up_state
+    return None
+
+
+def get_audio_preprocessor() -> AudioPreprocessor:
+    """
+    Get the audio preprocessor instance.
+    """
+    global __audio_preprocessor
+    if not __audio_preprocessor:
+        __audio_preprocessor = AudioPreprocessor(
+            sample_rate=config.env_int_param('ASR_SAMPLE_RATE', 16000),
+            margin_db=config.env_float_param('VAD_MARGIN_DB', 10),
+            min_db=config.env_float_param('VAD_MIN_DB', -50),
+            min_speech_seconds=config.env_float_param('VAD_MIN_SPEECH_SECONDS', 0.2),
+            max_duration_seconds=config.env_float_param('UPLOAD_MAX_DURATION_SECONDS', 60)
+        )
+    return __audio_preprocessor
@@ -0,0 +1,48 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+
+class BaseAudioTranscriber(ABC):
+    """
+    Base class for speech to text backends.
+    """
+
+    @abstractmethod
+    def transcribe(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text.
+
+        Args:
+            audio_file_path (str): Path to the audio file
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @abstractmethod
+    def transcribe_bytes(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text.
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def transcribe_async(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text without blocking the event loop.
+
+        Args:
+            audio_file_path (str): Path to the audio file
+        """
+        return await asyncio.to_thread(self.transcribe, audio_file_path)
+
+    async def transcribe_bytes_async(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text without blocking the event loop.
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+        """
+        return await asyncio.to_thread(self.transcribe_bytes, audio, filename)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from app.config.logging import logging
+from app.core.audio.base_transcriber import BaseAudioTranscriber
+
+logger = logging.getLogger('transcription_limiter')
+
+
+class TranscriberBusyError(Exception):
+    pass
+
+
+class TranscriptionLimiter:
+    """
+    Caps concurrent transcriptions and bounds the number of waiting requests.
+
+    At most ``max_concurrency`` transcriptions run at once and at most
+    ``max_queue`` wait for a slot, further requests fail fast with
+    TranscriberBusyError. Every request has a deadline of ``timeout_seconds``
+    covering both the wait and the transcription, past it the transcription
+    is cancelled. Its slot is held until the cancellation completes.
+    """
+
+    def __init__(
+        self,
+        transcriber: BaseAudioTranscriber,
+        max_concurrency: int = 4,
+        max_queue: int = 16,
+        timeout_seconds: float = 15
+    ):
+        self.transcriber = transcriber
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._active = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def _release(self, _):
+        self._active -= 1
+        self._semaphore.release()
+
+    async def _run(self, transcribe: Callable[[], Awaitable[str]]) -> str:
+        deadline = time.monotonic() + self.timeout_seconds
+
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise TranscriberBusyError("Transcription queue is full")
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout_seconds)
+            except asyncio.TimeoutError:
+                self._timed_out += 1
+                raise TranscriberBusyError("Timed out waiting for a transcription slot")
+            finally:
+                self._waiting -= 1
+
+        self._active += 1
+        task = asyncio.ensure_future(transcribe())
+        task.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(task, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            raise TranscriberBusyError("Transcription deadline exceeded")
+
+    async def transcribe(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text within the concurrency limits.
+
+        Args:
+            audio_file_path (str): Path to the audio file
+        """
+        return await self._run(lambda: self.transcriber.transcribe_async(audio_file_path))
+
+    async def transcribe_bytes(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text within the concurrency limits.
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+        """
+        return await self._run(lambda: self.transcriber.transcribe_bytes_async(audio, filename))
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "queue_depth": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+        }
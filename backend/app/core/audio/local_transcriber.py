@@ -0,0 +1,233 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from app.config.logging import logging
+from app.core.audio.base_transcriber import BaseAudioTranscriber
+from app.core.audio.preprocessing import AudioPreprocessor, AudioTooLongError
+from app.core.speech.formats import resample
+from app.core.speech.synthesizer import WarmUpState
+
+logger = logging.getLogger('local_transcriber')
+
+
+class LocalWhisperTranscriber(BaseAudioTranscriber):
+    """
+    Offline transcriber running a transformers Whisper model on the local CPU.
+
+    Concurrent requests are micro-batched: the first request opens a window
+    of ``batch_window_seconds`` during which further requests join the same
+    forward pass, up to ``max_batch_size``.
+
+    Whisper reads 30 second windows, longer clips are split into
+    ``chunk_length_seconds`` chunks overlapping by ``stride_length_seconds``
+    and their transcripts merged.
+    """
+
+    def __init__(
+        self,
+        model: str = "openai/whisper-base",
+        batch_window_seconds: float = 0.02,
+        max_batch_size: int = 8,
+        num_threads: Optional[int] = None,
+        sample_rate: int = 16000,
+        max_duration_seconds: Optional[float] = None,
+        chunk_length_seconds: float = 30,
+        stride_length_seconds: float = 5
+    ):
+        self.model = model
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
+        self.num_threads = num_threads
+        self.sample_rate = sample_rate
+        self.chunk_length_seconds = chunk_length_seconds
+        self.stride_length_seconds = stride_length_seconds
+
+        self._decoder = AudioPreprocessor(sample_rate=sample_rate, max_duration_seconds=max_duration_seconds)
+        self._pipeline = None
+        self._requests: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._pipeline_lock = threading.Lock()
+        self.warm_up_state = WarmUpState.COLD
+
+    def _get_pipeline(self):
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._pipeline = self._load_pipeline()
+        return self._pipeline
+
+    def _load_pipeline(self):
+        import torch
+        from transformers import pipeline
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        logger.info(f"Loading local speech recognition model {self.model}")
+        return pipeline(
+            task="automatic-speech-recognition",
+            model=self.model,
+            device="cpu"
+        )
+
+    def _collect_batch(self) -> list[tuple[object, Future]]:
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.batch_window_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _transcribe(self, inputs: list[dict]) -> list[str]:
+        results = self._get_pipeline()(
+            inputs,
+            batch_size=len(inputs),
+            chunk_length_s=self.chunk_length_seconds,
+            stride_length_s=self.stride_length_seconds
+        )
+        return [result["text"].strip() for result in results]
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            futures = [future for _, future in batch if future.set_running_or_notify_cancel()]
+            inputs = [{"raw": audio, "sampling_rate": self.sample_rate} for audio, future in batch if future in futures]
+            if not inputs:
+                continue
+
+            try:
+                texts = self._transcribe(inputs)
+            except Exception as e:
+                logger.error(f"Local transcription of a batch of {len(inputs)} failed: {str(e)}")
+                if len(inputs) == 1:
+                    futures[0].set_exception(e)
+                    continue
+
+                # A clip that fails the batch doesn't fail the others with it
+                for future, clip in zip(futures, inputs):
+                    try:
+                        future.set_result(self._transcribe([clip])[0])
+                    except Exception as clip_error:
+                        future.set_exception(clip_error)
+                continue
+
+            for future, text in zip(futures, texts):
+                future.set_result(text)
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="local-transcriber", daemon=True)
+                self._worker.start()
+
+    def submit(self, audio: bytes) -> Future:
+        """
+        Queue encoded audio for the next batch.
+
+        Args:
+            audio (bytes): Encoded audio
+
+        Returns:
+            Future: Resolves to the transcribed text.
+        """
+        signal, sample_rate = self._decoder.decode(audio)
+        signal = resample(signal, sample_rate, self.sample_rate)
+
+        self._ensure_worker()
+        future = Future()
+        self._requests.put((signal, future))
+        return future
+
+    def transcribe(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text using the local Whisper model
+
+        Args:
+            audio_file_path (str): Path to the audio file
+
+        Returns:
+            str: Transcribed text
+        """
+        with open(audio_file_path, "rb") as audio_file:
+            return self.transcribe_bytes(audio_file.read())
+
+    def transcribe_bytes(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text using the local Whisper model
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            return self.submit(audio).result()
+        except AudioTooLongError:
+            raise
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
+
+    async def transcribe_async(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text, awaiting the batch without a thread per request
+
+        Args:
+            audio_file_path (str): Path to the audio file
+
+        Returns:
+            str: Transcribed text
+        """
+        def read() -> bytes:
+            with open(audio_file_path, "rb") as audio_file:
+                return audio_file.read()
+
+        try:
+            audio = await asyncio.to_thread(read)
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
+        return await self.transcribe_bytes_async(audio)
+
+    async def transcribe_bytes_async(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text, awaiting the batch without a thread per request
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            # Decoding and resampling may run ffmpeg, keep them off the event loop
+            future = await asyncio.to_thread(self.submit, audio)
+            return await asyncio.wrap_future(future)
+        except AudioTooLongError:
+            raise
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
+
+    def warm_up(self):
+        """
+        Load the model ahead of the first request.
+        """
+        self.warm_up_state = WarmUpState.WARMING
+        try:
+            self._get_pipeline()
+            self.warm_up_state = WarmUpState.READY
+            logger.info("Local speech recognition model is ready")
+        except Exception as e:
+            self.warm_up_state = WarmUpState.FAILED
+            logger.error(f"Local speech recognition warm-up failed: {str(e)}")
@@ -0,0 +1,163 @@
+import io
+import shutil
+import subprocess
+from typing import Optional
+
+from app.config.logging import logging
+from app.core.document.base_document_processor import DocumentTooLargeError
+from app.core.speech.formats import resample
+
+logger = logging.getLogger('audio_preprocessing')
+
+WEBM_MAGIC = b"\x1a\x45\xdf\xa3"
+
+
+class AudioDecodeError(Exception):
+    pass
+
+
+class EmptyAudioError(Exception):
+    pass
+
+
+class AudioTooLongError(DocumentTooLargeError):
+    pass
+
+
+class AudioPreprocessor:
+    """
+    Prepares recorded clips for speech recognition.
+
+    Clips are decoded, downmixed to mono, resampled, and trimmed to the
+    voiced part found by an energy based voice activity detection. The
+    result is a compact 16 bit PCM WAV.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_seconds: float = 0.03,
+        margin_db: float = 10,
+        min_db: float = -50,
+        min_speech_seconds: float = 0.2,
+        padding_seconds: float = 0.2,
+        max_duration_seconds: Optional[float] = None
+    ):
+        self.sample_rate = sample_rate
+        self.frame_seconds = frame_seconds
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.min_speech_seconds = min_speech_seconds
+        self.padding_seconds = padding_seconds
+        self.max_duration_seconds = max_duration_seconds
+
+    def _decode_with_ffmpeg(self, data: bytes):
+        import numpy as np
+
+        if not shutil.which("ffmpeg"):
+            raise AudioDecodeError("ffmpeg is required to decode this audio format")
+
+        result = subprocess.run(
+            [
+                "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "f32le", "-ac", "1", "-ar", str(self.sample_rate), "pipe:1"
+            ],
+            input=data,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise AudioDecodeError(f"Could not decode audio: {result.stderr.decode(errors='replace').strip()}")
+
+        return np.frombuffer(result.stdout, dtype=np.float32), self.sample_rate
+
+    def _decode(self, data: bytes):
+        import soundfile as sf
+
+        if data[:4] == WEBM_MAGIC:
+            return self._decode_with_ffmpeg(data)
+
+        try:
+            audio, sample_rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+        except Exception:
+            return self._decode_with_ffmpeg(data)
+
+        return audio.mean(axis=1), sample_rate
+
+    def decode(self, data: bytes):
+        """
+        Decode audio to a mono float signal.
+
+        WAV, FLAC and OGG are decoded with soundfile, WebM/Opus and other
+        containers go through ffmpeg. The duration limit is checked on the
+        decoded signal, since only WAV headers tell it before decoding.
+
+        Args:
+            data (bytes): Encoded audio.
+
+        Returns:
+            tuple[np.ndarray, int]: The mono signal and its sampling rate.
+
+        Raises:
+            AudioTooLongError: The audio is longer than ``max_duration_seconds``.
+        """
+        audio, sample_rate = self._decode(data)
+
+        if self.max_duration_seconds and len(audio) > self.max_duration_seconds * sample_rate:
+            raise AudioTooLongError(f"Upload exceeds the {self.max_duration_seconds} seconds limit")
+        return audio, sample_rate
+
+    def trim_silence(self, audio):
+        """
+        Trim leading and trailing silence.
+
+        Frames louder than the noise floor (10th percentile frame energy) by
+        ``margin_db`` and louder than ``min_db`` are voiced.
+
+        Args:
+            audio (np.ndarray): Mono signal at the target sampling rate.
+
+        Returns:
+            np.ndarray: The voiced part of the signal, padded by ``padding_seconds``.
+        """
+        import numpy as np
+
+        frame_length = max(1, int(self.frame_seconds * self.sample_rate))
+        frame_count = len(audio) // frame_length
+        if frame_count == 0:
+            raise EmptyAudioError("No speech detected in the audio")
+
+        frames = audio[:frame_count * frame_length].reshape(frame_count, frame_length)
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+        threshold_db = max(np.percentile(energy_db, 10) + self.margin_db, self.min_db)
+
+        voiced = np.flatnonzero(energy_db > threshold_db)
+        if len(voiced) * self.frame_seconds < self.min_speech_seconds:
+            raise EmptyAudioError("No speech detected in the audio")
+
+        padding = int(self.padding_seconds * self.sample_rate)
+        start = max(0, voiced[0] * frame_length - padding)
+        end = min(len(audio), (voiced[-1] + 1) * frame_length + padding)
+        return audio[start:end]
+
+    def process(self, data: bytes) -> bytes:
+        """
+        Preprocess a recorded clip for speech recognition.
+
+        Args:
+            data (bytes): Encoded audio.
+
+        Returns:
+            bytes: 16 bit PCM mono WAV at the target sampling rate.
+        """
+        import numpy as np
+        import soundfile as sf
+
+        audio, sample_rate = self.decode(data)
+        audio = resample(audio, sample_rate, self.sample_rate)
+        audio = self.trim_silence(audio)
+
+        buffer = io.BytesIO()
+        sf.write(buffer, np.clip(audio, -1.0, 1.0), samplerate=self.sample_rate, format="WAV", subtype="PCM_16")
+
+        logger.info(f"Preprocessed {len(data)} bytes of audio into {buffer.tell()} bytes")
+        return buffer.getvalue()
@@ -1,10 +1,29 @@
-from openai import OpenAI
+import asyncio
+import os
+from typing import Optional
 
+from openai import AsyncOpenAI, OpenAI
 
-class AudioTranscriber:
+from app.core.audio.base_transcriber import BaseAudioTranscriber
 
-    def __init__(self, client: OpenAI):
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+class AudioTranscriber(BaseAudioTranscriber):
+    """
+    Transcriber using the remote OpenAI Whisper API.
+
+    The async methods use the shared async client when one is given, so
+    cancelling a transcription cancels its HTTP request instead of leaving
+    it running on a thread.
+    """
+
+    def __init__(self, client: OpenAI, async_client: Optional[AsyncOpenAI] = None):
         self.client = client
+        self.async_client = async_client
 
     def transcribe(self, audio_file_path: str) -> str:
         """
@@ -26,3 +45,67 @@ class AudioTranscriber:
             return transcript.strip()
         except Exception as e:
             return f"Error transcribing audio: {str(e)}"
+
+    def transcribe_bytes(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text using OpenAI Whisper
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            transcript = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename, audio),
+                response_format="text"
+            )
+            return transcript.strip()
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
+
+    async def transcribe_async(self, audio_file_path: str) -> str:
+        """
+        Transcribe audio file to text using OpenAI Whisper without blocking the event loop
+
+        Args:
+            audio_file_path (str): Path to the audio file
+
+        Returns:
+            str: Transcribed text
+        """
+        if self.async_client is None:
+            return await super().transcribe_async(audio_file_path)
+
+        try:
+            audio = await asyncio.to_thread(_read_file, audio_file_path)
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
+        return await self.transcribe_bytes_async(audio, os.path.basename(audio_file_path))
+
+    async def transcribe_bytes_async(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Transcribe in-memory audio to text using OpenAI Whisper without blocking the event loop
+
+        Args:
+            audio (bytes): Encoded audio
+            filename (str): Filename hinting the audio format
+
+        Returns:
+            str: Transcribed text
+        """
+        if self.async_client is None:
+            return await super().transcribe_bytes_async(audio, filename)
+
+        try:
+            transcript = await self.async_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename, audio),
+                response_format="text"
+            )
+            return transcript.strip()
+        except Exception as e:
+            return f"Error transcribing audio: {str(e)}"
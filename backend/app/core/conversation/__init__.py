@@ -0,0 +1,22 @@
+from typing import Optional
+
+import config
+
+from .conversation_store import ConversationStore
+
+__conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """
+    Get the conversation store instance.
+    """
+    global __conversation_store
+    if not __conversation_store:
+        __conversation_store = ConversationStore(
+            max_turns=config.env_int_param('CONVERSATION_MAX_TURNS', 20),
+            max_bytes=config.env_int_param('CONVERSATION_MAX_BYTES', 32 * 1024),
+            max_conversations=config.env_int_param('CONVERSATION_MAX_CONVERSATIONS', 256),
+            idle_ttl_seconds=config.env_float_param('CONVERSATION_IDLE_TTL_SECONDS', 15 * 60)
+        )
+    return __conversation_store
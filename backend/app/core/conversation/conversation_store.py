@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from app.config.logging import logging
+
+logger = logging.getLogger('conversation_store')
+
+
+@dataclass
+class Conversation:
+    messages: deque = field(default_factory=deque)
+    size_bytes: int = 0
+    last_access: float = field(default_factory=time.monotonic)
+
+
+class ConversationStore:
+    """
+    In-memory conversation history keyed by conversation (lane) id.
+
+    Every conversation is capped by number of turns and by size in bytes,
+    oldest messages are dropped first. Across conversations the store keeps
+    at most ``max_conversations`` entries, evicting the least recently used
+    one, and drops conversations that were idle longer than ``idle_ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 20,
+        max_bytes: int = 32 * 1024,
+        max_conversations: int = 256,
+        idle_ttl_seconds: float = 15 * 60
+    ):
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.max_conversations = max_conversations
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        self._conversations: OrderedDict[str, Conversation] = OrderedDict()
+        self._lock = threading.Lock()
+        self._evicted_lru = 0
+        self._evicted_idle = 0
+
+    @staticmethod
+    def _message_size(message: dict) -> int:
+        return len(str(message.get('content') or '').encode('utf-8'))
+
+    def _evict_idle(self, now: float):
+        # Conversations are ordered by last access, so the idle ones are at the front
+        while self._conversations:
+            conversation_id, conversation = next(iter(self._conversations.items()))
+            if now - conversation.last_access < self.idle_ttl_seconds:
+                break
+            del self._conversations[conversation_id]
+            self._evicted_idle += 1
+            logger.info(f"Evicted idle conversation {conversation_id}")
+
+    def _touch(self, conversation_id: str, create: bool) -> Conversation | None:
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            if not create:
+                return None
+
+            conversation = Conversation()
+            self._conversations[conversation_id] = conversation
+
+            while len(self._conversations) > self.max_conversations:
+                evicted_id, _ = self._conversations.popitem(last=False)
+                self._evicted_lru += 1
+                logger.info(f"Evicted least recently used conversation {evicted_id}")
+
+        conversation.last_access = now
+        self._conversations.move_to_end(conversation_id)
+        return conversation
+
+    def _trim(self, conversation: Conversation):
+        messages = conversation.messages
+        # The latest message is always kept, so the current turn reaches the model
+        while len(messages) > 1 and (
+            len(messages) > self.max_turns * 2 or conversation.size_bytes > self.max_bytes
+        ):
+            conversation.size_bytes -= self._message_size(messages.popleft())
+
+        # History must never start in the middle of a turn
+        while len(messages) > 1 and messages[0].get('role') != 'user':
+            conversation.size_bytes -= self._message_size(messages.popleft())
+
+    def get_history(self, conversation_id: str) -> list[dict]:
+        """
+        Get a copy of the conversation history.
+
+        Args:
+            conversation_id (str): The conversation (lane) id.
+
+        Returns:
+            list[dict]: Messages in chronological order.
+        """
+        with self._lock:
+            conversation = self._touch(conversation_id, create=False)
+            return list(conversation.messages) if conversation else []
+
+    def append(self, conversation_id: str, message: dict):
+        """
+        Append a message to the conversation, trimming it to the configured limits.
+
+        Args:
+            conversation_id (str): The conversation (lane) id.
+            message (dict): Chat message with ``role`` and ``content``.
+        """
+        with self._lock:
+            conversation = self._touch(conversation_id, create=True)
+            conversation.messages.append(message)
+            conversation.size_bytes += self._message_size(message)
+            self._trim(conversation)
+
+    def clear(self, conversation_id: str) -> bool:
+        """
+        Remove the conversation.
+
+        Args:
+            conversation_id (str): The conversation (lane) id.
+
+        Returns:
+            bool: Whether the conversation existed.
+        """
+        with self._lock:
+            return self._conversations.pop(conversation_id, None) is not None
+
+    def stats(self) -> dict:
+        """
+        Get the store size and eviction counters.
+        """
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            return {
+                "conversations": len(self._conversations),
+                "messages": sum(len(c.messages) for c in self._conversations.values()),
+                "bytes": sum(c.size_bytes for c in self._conversations.values()),
+                "max_conversations": self.max_conversations,
+                "evicted_lru": self._evicted_lru,
+                "evicted_idle": self._evicted_idle,
+            }
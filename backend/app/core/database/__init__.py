@@ -0,0 +1,162 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import quote
+
+import config
+
+from .errors import DatabaseWriteTimeoutError
+from .manager import DatabaseManager, SQLiteDatabaseManager
+from .schema import ensure_sqlite_schema
+from .sqlite_manager import SQLiteConnectionPool, SQLitePoolTimeoutError
+from .writer import SQLiteWriter, SQLiteWriteTimeoutError
+
+__sqlite_pool: Optional[SQLiteConnectionPool] = None
+__sqlite_writer: Optional[SQLiteWriter] = None
+__database_executor: Optional[ThreadPoolExecutor] = None
+__database_manager: Optional[DatabaseManager] = None
+
+
+def get_database_backend() -> str:
+    """
+    Get the configured database backend, ``sqlite`` or ``postgres``.
+    """
+    backend = (config.env_optional_param('DATABASE_BACKEND') or "sqlite").lower()
+    if backend not in ("sqlite", "postgres"):
+        raise EnvironmentError(f'Unsupported DATABASE_BACKEND "{backend}"')
+    return backend
+
+
+def get_postgres_dsn() -> str:
+    """
+    Get the PostgreSQL DSN, built from the POSTGRES_* variables of the
+    compose file unless POSTGRES_DSN is set.
+    """
+    dsn = config.env_optional_param('POSTGRES_DSN')
+    if dsn:
+        return dsn
+
+    host = config.env_optional_param('POSTGRES_HOST') or "db"
+    port = config.env_int_param('POSTGRES_PORT', 5432)
+    return (
+        f"postgresql://{quote(config.env_param('POSTGRES_USER'), safe='')}"
+        f":{quote(config.env_param('POSTGRES_PASSWORD'), safe='')}"
+        f"@{host}:{port}/{config.env_param('POSTGRES_DB')}"
+    )
+
+
+def get_sqlite_pool() -> SQLiteConnectionPool:
+    """
+    Get the shared SQLite connection pool.
+    """
+    global __sqlite_pool
+    if not __sqlite_pool:
+        __sqlite_pool = SQLiteConnectionPool(
+            config.env_param('SQLITE_DATABASE_NAME'),
+            size=config.env_int_param('SQLITE_POOL_SIZE', 8),
+            checkout_timeout_seconds=config.env_float_param('SQLITE_POOL_TIMEOUT_SECONDS', 5),
+            busy_timeout_ms=config.env_int_param('SQLITE_BUSY_TIMEOUT_MS', 5000),
+            synchronous=config.env_optional_param('SQLITE_SYNCHRONOUS') or "NORMAL",
+            cache_size=config.env_int_param('SQLITE_CACHE_SIZE', -16000),
+            mmap_size=config.env_int_param('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+        )
+    return __sqlite_pool
+
+
+def get_sqlite_writer() -> SQLiteWriter:
+    """
+    Get the SQLite writer instance.
+    """
+    global __sqlite_writer
+    if not __sqlite_writer:
+        __sqlite_writer = SQLiteWriter(
+            get_sqlite_pool(),
+            batch_window_ms=config.env_float_param('SQLITE_WRITER_BATCH_WINDOW_MS', 2),
+            max_batch=config.env_int_param('SQLITE_WRITER_MAX_BATCH', 64),
+            timeout_seconds=config.env_float_param('SQLITE_WRITER_TIMEOUT_SECONDS', 5)
+        )
+    return __sqlite_writer
+
+
+def get_database_executor() -> ThreadPoolExecutor:
+    """
+    Get the executor running the database work of the async repositories.
+
+    It's sized like the connection pool, so a blocked query holds a database
+    thread instead of the event loop or the default executor.
+    """
+    global __database_executor
+    if not __database_executor:
+        __database_executor = ThreadPoolExecutor(
+            max_workers=config.env_int_param('DATABASE_EXECUTOR_WORKERS', get_sqlite_pool().size),
+            thread_name_prefix='database'
+        )
+    return __database_executor
+
+
+def ensure_database_schema():
+    """
+    Bring the SQLite database up to the schema the repositories query, so a
+    fresh deploy of the shipped database works without running the
+    migrations by hand. The PostgreSQL schema is created by its migration.
+    """
+    if get_database_backend() == "sqlite":
+        ensure_sqlite_schema(config.env_param('SQLITE_DATABASE_NAME'))
+
+
+def get_database_manager() -> DatabaseManager:
+    """
+    Get the database manager instance of the configured backend.
+    """
+    global __database_manager
+    if not __database_manager:
+        if get_database_backend() == "postgres":
+            # asyncpg is only needed with the PostgreSQL backend
+            from .postgres_manager import PostgresDatabaseManager
+
+            __database_manager = PostgresDatabaseManager(
+                get_postgres_dsn(),
+                min_size=config.env_int_param('POSTGRES_POOL_MIN_SIZE', 2),
+                max_size=config.env_int_param('POSTGRES_POOL_MAX_SIZE', 10),
+                command_timeout_seconds=config.env_float_param('POSTGRES_COMMAND_TIMEOUT_SECONDS', 5)
+            )
+        else:
+            __database_manager = SQLiteDatabaseManager(
+                get_sqlite_pool(),
+                get_sqlite_writer(),
+                get_database_executor()
+            )
+    return __database_manager
+
+
+async def close_database_manager():
+    """
+    Close the connections of the database manager.
+    """
+    global __sqlite_pool, __sqlite_writer, __database_executor, __database_manager
+    manager, __database_manager = __database_manager, None
+    if manager:
+        await manager.close()
+        if isinstance(manager, SQLiteDatabaseManager):
+            __sqlite_pool = None
+            __sqlite_writer = None
+            __database_executor = None
+    # SQLite resources opened without the manager, e.g. by scripts
+    await asyncio.to_thread(close_sqlite_pool)
+
+
+def close_sqlite_pool():
+    """
+    Stop the database executor and the SQLite writer, then close the shared
+    SQLite connection pool.
+    """
+    global __sqlite_pool, __sqlite_writer, __database_executor
+    if __database_executor:
+        __database_executor.shutdown(wait=True, cancel_futures=True)
+        __database_executor = None
+    if __sqlite_writer:
+        __sqlite_writer.close()
+        __sqlite_writer = None
+    if __sqlite_pool:
+        __sqlite_pool.close()
+        __sqlite_pool = None
@@ -0,0 +1,5 @@
+class DatabaseWriteTimeoutError(Exception):
+    """
+    Raised when a write wasn't committed in time, it may still be committed.
+    """
+    pass
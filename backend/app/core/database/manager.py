@@ -0,0 +1,66 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.database.sqlite_manager import SQLiteConnectionPool
+from app.core.database.writer import SQLiteWriter
+
+
+class DatabaseManager(ABC):
+    """
+    Owns the connections of a database backend for the repositories.
+    """
+
+    backend: str
+
+    @abstractmethod
+    async def start(self):
+        """
+        Open the connections, backends may also open them lazily.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self):
+        """
+        Close the connections.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """
+    Per-process SQLite file, shared through a connection pool, a group
+    committing writer and a database executor for the async repositories.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, pool: SQLiteConnectionPool, writer: SQLiteWriter, executor: ThreadPoolExecutor):
+        self.pool = pool
+        self.writer = writer
+        self.executor = executor
+
+    async def start(self):
+        # Connections are opened on first use
+        pass
+
+    def _close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.writer.close()
+        self.pool.close()
+
+    async def close(self):
+        # Waits for the running queries and the queued writes
+        await asyncio.to_thread(self._close)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "pool": self.pool.stats(),
+            "writer": self.writer.stats(),
+        }
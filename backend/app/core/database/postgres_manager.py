@@ -0,0 +1,119 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import asyncpg
+
+from app.config.logging import logging
+from app.core.database.manager import DatabaseManager
+
+logger = logging.getLogger('postgres_manager')
+
+
+class PreparedConnection(asyncpg.Connection):
+    """
+    Connection holding the statements prepared for it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
+class PostgresDatabaseManager(DatabaseManager):
+    """
+    PostgreSQL store shared by every node, through an asyncpg pool.
+
+    The registered statements are prepared once on every new connection,
+    statements registered later are prepared on first use.
+    """
+
+    backend = "postgres"
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        command_timeout_seconds: float = 5
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout_seconds = command_timeout_seconds
+
+        self.statements: dict[str, str] = {}
+        self._pool: Optional[asyncpg.Pool] = None
+        self._lock = asyncio.Lock()
+
+    def register_statements(self, statements: dict[str, str]):
+        """
+        Register named statements to prepare on every connection.
+        """
+        self.statements.update(statements)
+
+    async def _prepare_all(self, connection: PreparedConnection):
+        for name, query in self.statements.items():
+            connection.prepared[name] = await connection.prepare(query)
+
+    async def start(self):
+        async with self._lock:
+            if self._pool:
+                return
+            self._pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout_seconds,
+                connection_class=PreparedConnection,
+                init=self._prepare_all
+            )
+            logger.info(f"Opened PostgreSQL pool of {self.min_size}-{self.max_size} connections")
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[PreparedConnection]:
+        """
+        Acquire a connection from the pool for the duration of the block.
+        """
+        if not self._pool:
+            await self.start()
+        async with self._pool.acquire() as connection:
+            yield connection
+
+    async def statement(self, connection: PreparedConnection, name: str) -> asyncpg.prepared_stmt.PreparedStatement:
+        """
+        Get a registered statement prepared on the connection.
+        """
+        prepared = connection.prepared.get(name)
+        if prepared is None:
+            prepared = connection.prepared[name] = await connection.prepare(self.statements[name])
+        return prepared
+
+    async def fetch(self, name: str, *args) -> list[asyncpg.Record]:
+        """
+        Run a registered statement and get all of its rows.
+        """
+        async with self.connection() as connection:
+            statement = await self.statement(connection, name)
+            return await statement.fetch(*args)
+
+    async def fetchrow(self, name: str, *args) -> Optional[asyncpg.Record]:
+        """
+        Run a registered statement and get its first row.
+        """
+        async with self.connection() as connection:
+            statement = await self.statement(connection, name)
+            return await statement.fetchrow(*args)
+
+    async def close(self):
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "size": self._pool.get_size() if self._pool else 0,
+            "idle": self._pool.get_idle_size() if self._pool else 0,
+            "max_size": self.max_size,
+        }
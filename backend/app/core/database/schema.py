@@ -0,0 +1,121 @@
+import sqlite3
+
+from app.config.logging import logging
+from app.core.plate import normalized_plate_sql
+
+logger = logging.getLogger('sqlite_schema')
+
+SESSION_PLATE_COLUMN = "licence_plate_entry_normalized"
+
+# Keep the column in sync for every writer, not only the API
+SESSION_PLATE_TRIGGERS = {
+    "trg_session_plate_normalized_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_session_plate_normalized_insert
+        AFTER INSERT ON session
+        BEGIN
+            UPDATE session
+            SET {SESSION_PLATE_COLUMN} = {normalized_plate_sql('NEW.licence_plate_entry')}
+            WHERE id = NEW.id;
+        END
+    """,
+    "trg_session_plate_normalized_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_session_plate_normalized_update
+        AFTER UPDATE OF licence_plate_entry ON session
+        BEGIN
+            UPDATE session
+            SET {SESSION_PLATE_COLUMN} = {normalized_plate_sql('NEW.licence_plate_entry')}
+            WHERE id = NEW.id;
+        END
+    """,
+}
+
+SESSION_PLATE_INDEXES = {
+    "idx_session_plate_status": f"session({SESSION_PLATE_COLUMN}, status, entry_time)",
+}
+
+SEARCH_INDEXES = {
+    # Entry station time-window searches of the invalid license plate tool
+    "idx_session_station_status_time": "session(entry_station, status, entry_time)",
+    # Loading the active sessions of the lot
+    "idx_session_status_time": "session(status, entry_time)",
+    "idx_payment_session": "payment(session_id)",
+}
+
+
+def add_session_normalized_plate(cursor: sqlite3.Cursor) -> int:
+    """
+    Add the normalized entry plate column to session, backfill it and keep it
+    in sync with triggers.
+
+    Returns:
+        int: Number of backfilled sessions.
+    """
+    cursor.execute("PRAGMA table_info(session)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if not columns:
+        raise sqlite3.OperationalError("no such table: session")
+    if SESSION_PLATE_COLUMN not in columns:
+        cursor.execute(f"ALTER TABLE session ADD COLUMN {SESSION_PLATE_COLUMN} TEXT")
+
+    cursor.execute(f"""
+        UPDATE session
+        SET {SESSION_PLATE_COLUMN} = {normalized_plate_sql('licence_plate_entry')}
+        WHERE licence_plate_entry IS NOT NULL
+    """)
+    backfilled = cursor.rowcount
+
+    for trigger in SESSION_PLATE_TRIGGERS.values():
+        cursor.execute(trigger)
+    add_indexes(cursor, SESSION_PLATE_INDEXES)
+    return backfilled
+
+
+def add_indexes(cursor: sqlite3.Cursor, indexes: dict[str, str]):
+    for name, definition in indexes.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def get_missing_schema(cursor: sqlite3.Cursor) -> list[str]:
+    """
+    Get the columns, triggers and indexes the repositories need that the
+    database lacks.
+    """
+    cursor.execute("PRAGMA table_info(session)")
+    missing = [] if SESSION_PLATE_COLUMN in {row[1] for row in cursor.fetchall()} else [SESSION_PLATE_COLUMN]
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('trigger', 'index')")
+    existing = {row[0] for row in cursor.fetchall()}
+    expected = [*SESSION_PLATE_TRIGGERS, *SESSION_PLATE_INDEXES, *SEARCH_INDEXES]
+    return missing + [name for name in expected if name not in existing]
+
+
+def ensure_sqlite_schema(database: str) -> list[str]:
+    """
+    Apply the session plate and search index migrations when the database
+    lacks any part of them. Both are idempotent.
+
+    Args:
+        database (str): Path of the SQLite database.
+
+    Returns:
+        list[str]: The schema objects that were missing.
+    """
+    connection = sqlite3.connect(database)
+    try:
+        cursor = connection.cursor()
+        missing = get_missing_schema(cursor)
+        if not missing:
+            return []
+
+        logger.info(f"Migrating {database}, missing {', '.join(missing)}")
+        backfilled = add_session_normalized_plate(cursor)
+        add_indexes(cursor, SEARCH_INDEXES)
+        connection.commit()
+        cursor.execute("ANALYZE")
+        logger.info(f"Migrated {database}, backfilled {backfilled} sessions")
+        return missing
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
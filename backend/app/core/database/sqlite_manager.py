@@ -0,0 +1,132 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.config.logging import logging
+
+logger = logging.getLogger('sqlite_manager')
+
+
+class SQLitePoolTimeoutError(Exception):
+    pass
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of SQLite connections shared by all repositories.
+
+    Connections are opened lazily up to ``size``, run in WAL mode so readers
+    don't block on the writer, and are tuned with the given pragmas once when
+    they are opened.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        size: int = 8,
+        checkout_timeout_seconds: float = 5,
+        busy_timeout_ms: int = 5000,
+        synchronous: str = "NORMAL",
+        cache_size: int = -16000,
+        mmap_size: int = 256 * 1024 * 1024
+    ):
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous pragma value {synchronous}")
+
+        self.database = database
+        self.size = size
+        self.checkout_timeout_seconds = checkout_timeout_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open a new connection tuned like the pooled ones, outside the pool.
+        """
+        connection = sqlite3.connect(
+            self.database,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        return connection
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self.connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.checkout_timeout_seconds)
+        except queue.Empty:
+            raise SQLitePoolTimeoutError(f"No SQLite connection available within {self.checkout_timeout_seconds}s")
+
+    def _return(self, connection: sqlite3.Connection):
+        if connection.in_transaction:
+            connection.rollback()
+
+        if self._closed:
+            connection.close()
+            return
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for the duration of the block.
+
+        Uncommitted work is rolled back when the connection is returned.
+        """
+        connection = self._checkout()
+        try:
+            yield connection
+        finally:
+            self._return(connection)
+
+    def close(self):
+        """
+        Close the idle connections, checked out ones are closed when returned.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "opened": self._opened,
+            "idle": self._idle.qsize(),
+        }
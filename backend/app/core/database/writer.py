@@ -0,0 +1,194 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from app.config.logging import logging
+from app.core.database.errors import DatabaseWriteTimeoutError
+from app.core.database.sqlite_manager import SQLiteConnectionPool
+
+logger = logging.getLogger('sqlite_writer')
+
+Operation = Callable[[sqlite3.Connection], Any]
+
+
+class SQLiteWriteTimeoutError(DatabaseWriteTimeoutError):
+    """
+    Raised when the writer didn't commit a write in time, it may still be committed.
+    """
+    pass
+
+
+class SQLiteWriter:
+    """
+    Single writer thread that group-commits write operations.
+
+    Operations submitted within ``batch_window_ms`` of each other run in one
+    ``BEGIN IMMEDIATE`` transaction, each inside its own savepoint so that a
+    failing operation is rolled back alone. Results are handed out once the
+    transaction is committed.
+    """
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        batch_window_ms: float = 2,
+        max_batch: int = 64,
+        timeout_seconds: float = 5
+    ):
+        self.pool = pool
+        self.batch_window_ms = batch_window_ms
+        self.max_batch = max_batch
+        self.timeout_seconds = timeout_seconds
+
+        self._queue: queue.Queue[Optional[tuple[Operation, Future]]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._transactions = 0
+        self._operations = 0
+
+    def _start(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SQLite writer is closed")
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def _collect(self, first: tuple[Operation, Future]) -> tuple[list[tuple[Operation, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window_ms / 1000
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, connection: sqlite3.Connection, batch: list[tuple[Operation, Future]]):
+        results: list[tuple[Future, bool, Any]] = []
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                connection.execute("SAVEPOINT operation")
+                try:
+                    results.append((future, True, operation(connection)))
+                except Exception as e:
+                    connection.execute("ROLLBACK TO operation")
+                    results.append((future, False, e))
+                connection.execute("RELEASE operation")
+            connection.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Error committing {len(batch)} write operations: {str(e)}")
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            for _, future in batch:
+                if not future.done():
+                    if not future.running():
+                        future.set_running_or_notify_cancel()
+                    future.set_exception(e)
+            return
+
+        self._transactions += 1
+        self._operations += len(results)
+        for future, succeeded, result in results:
+            if succeeded:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    def _run(self):
+        connection = self.pool.connect()
+        # Transactions are managed explicitly
+        connection.isolation_level = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+
+                batch, stop = self._collect(item)
+                self._commit(connection, batch)
+                if stop:
+                    break
+        finally:
+            connection.close()
+
+    def submit(self, operation: Operation) -> Future:
+        """
+        Queue a write operation.
+
+        Args:
+            operation (Operation): Function running the writes on the given
+                connection. It must not commit or roll back.
+
+        Returns:
+            Future: Result of the operation, set once it's committed.
+        """
+        self._start()
+        future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def execute(self, operation: Operation, on_commit: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Run a write operation and wait for it to be committed.
+
+        Args:
+            operation (Operation): Function running the writes.
+            on_commit (Optional[Callable[[Any], None]]): Called with the result
+                on the writer thread once committed, also when that happens
+                after the wait timed out.
+
+        Returns:
+            Any: Result of the operation.
+
+        Raises:
+            SQLiteWriteTimeoutError: The operation wasn't committed within
+                ``timeout_seconds``, it may still be.
+        """
+        future = self.submit(operation)
+        if on_commit:
+            future.add_done_callback(lambda done: self._notify_commit(done, on_commit))
+
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            raise SQLiteWriteTimeoutError(f"Write not committed within {self.timeout_seconds} seconds")
+
+    @staticmethod
+    def _notify_commit(future: Future, on_commit: Callable[[Any], None]):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            on_commit(future.result())
+        except Exception as e:
+            logger.error(f"Error handling a committed write operation: {str(e)}")
+
+    def close(self):
+        """
+        Commit the queued operations and stop the writer thread.
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "transactions": self._transactions,
+            "operations": self._operations,
+        }
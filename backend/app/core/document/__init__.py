@@ -1,10 +1,15 @@
+import asyncio
 from typing import Optional
 
 import config
+from app.config.logging import logging
 
-from .base_document_processor import BaseDocumentProcessor
+from .base_document_processor import BaseDocumentProcessor, DocumentTooLargeError
+from .body_limit import RequestBodyLimitMiddleware
 from .local_document_processor import LocalDocumentProcessor
 
+logger = logging.getLogger('document_processor')
+
 __document_processor: Optional[BaseDocumentProcessor] = None
 
 
@@ -14,5 +19,36 @@ def get_document_processor() -> BaseDocumentProcessor:
     """
     global __document_processor
     if not __document_processor:
-        __document_processor = LocalDocumentProcessor(config.env_param('UPLOAD_DIR'))
+        __document_processor = LocalDocumentProcessor(
+            config.env_param('UPLOAD_DIR'),
+            max_bytes=config.env_int_param('UPLOAD_MAX_BYTES', 10 * 1024 * 1024),
+            max_duration_seconds=config.env_float_param('UPLOAD_MAX_DURATION_SECONDS', 60),
+            chunk_size=config.env_int_param('UPLOAD_CHUNK_BYTES', 64 * 1024)
+        )
     return __document_processor
+
+
+def get_request_max_bytes() -> int:
+    """
+    Get the request body limit, by default the upload limit plus room for the
+    other form fields.
+    """
+    return config.env_int_param(
+        'REQUEST_MAX_BYTES',
+        config.env_int_param('UPLOAD_MAX_BYTES', 10 * 1024 * 1024) + 64 * 1024
+    )
+
+
+async def cleanup_documents_periodically():
+    """
+    Remove old uploads every UPLOAD_CLEANUP_INTERVAL_SECONDS.
+    """
+    interval = config.env_float_param('UPLOAD_CLEANUP_INTERVAL_SECONDS', 10 * 60)
+    retention = config.env_float_param('UPLOAD_RETENTION_SECONDS', 60 * 60)
+
+    while True:
+        try:
+            await asyncio.to_thread(get_document_processor().cleanup, retention)
+        except Exception as e:
+            logger.error(f"Error cleaning up uploads: {str(e)}")
+        await asyncio.sleep(interval)
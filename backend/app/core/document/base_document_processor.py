@@ -4,6 +4,13 @@ from typing import Optional
 from fastapi import UploadFile
 
 
+class DocumentTooLargeError(Exception):
+    """
+    Raised when an uploaded document exceeds the configured size or duration.
+    """
+    pass
+
+
 class BaseDocumentProcessor(ABC):
     """
     Base class for document processors.
@@ -23,6 +30,28 @@ class BaseDocumentProcessor(ABC):
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    @abstractmethod
+    async def read(self, document: UploadFile) -> bytes:
+        """
+        Read the document into memory, without storing it.
+
+        Args:
+            document: The document to read.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @abstractmethod
+    async def save(self, data: bytes, filename: Optional[str] = None, sub_paths: Optional[list[str]] = None) -> str:
+        """
+        Store document content that was already read.
+
+        Args:
+            data: The document content.
+            filename: Original filename, used for the extension.
+            sub_paths: Optional subdirectories to create within the upload directory.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
     @abstractmethod
     def get_absolute_url_from_path(self, path: str) -> str:
         """
@@ -31,4 +60,17 @@ class BaseDocumentProcessor(ABC):
         Args:
             path (str): The path to the document.
         """
-        raise NotImplementedError("Subclasses must implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @abstractmethod
+    def cleanup(self, max_age_seconds: float) -> int:
+        """
+        Remove processed documents older than the given age.
+
+        Args:
+            max_age_seconds (float): Maximal age of the kept documents.
+
+        Returns:
+            int: Number of removed documents.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
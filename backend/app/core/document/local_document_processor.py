@@ -1,41 +1,161 @@
+import asyncio
 import os
-from typing import Optional
+import re
+import struct
+import time
+import uuid
+from typing import AsyncIterator, Optional
 
-from app.core.document.base_document_processor import BaseDocumentProcessor
+from app.config.logging import logging
+from app.core.document.base_document_processor import BaseDocumentProcessor, DocumentTooLargeError
 from fastapi import UploadFile
 
 import config
 
+logger = logging.getLogger('local_document_processor')
+
+GENERATED_NAME = re.compile(r"^[0-9a-f]{32}(\.[A-Za-z0-9]{1,10})?$")
+
+
+def get_wav_byte_rate(header: bytes) -> Optional[int]:
+    """
+    Get the byte rate from a RIFF/WAVE header, if the data is a WAV file.
+    """
+    if len(header) < 32 or header[:4] != b"RIFF" or header[8:12] != b"WAVE" or header[12:16] != b"fmt ":
+        return None
+    return struct.unpack("<I", header[28:32])[0] or None
+
 
 class LocalDocumentProcessor(BaseDocumentProcessor):
     """
     Local document processor for handling file uploads.
     """
 
-    def __init__(self, upload_directory: str):
+    def __init__(
+        self,
+        upload_directory: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_duration_seconds: Optional[float] = None,
+        chunk_size: int = 64 * 1024
+    ):
         self.upload_directory = upload_directory
+        self.max_bytes = max_bytes
+        self.max_duration_seconds = max_duration_seconds
+        self.chunk_size = chunk_size
+
+    async def _read_chunks(self, document: UploadFile) -> AsyncIterator[bytes]:
+        """
+        Read the document in chunks, enforcing the size and, for WAV audio, the duration limits.
+        """
+        size = 0
+        byte_rate = None
+        while chunk := await document.read(self.chunk_size):
+            if size == 0:
+                byte_rate = get_wav_byte_rate(chunk)
+            size += len(chunk)
+
+            if size > self.max_bytes:
+                raise DocumentTooLargeError(f"Upload exceeds the {self.max_bytes} bytes limit")
+            if byte_rate and self.max_duration_seconds and size / byte_rate > self.max_duration_seconds:
+                raise DocumentTooLargeError(f"Upload exceeds the {self.max_duration_seconds} seconds limit")
+
+            yield chunk
+
+    def _get_file_location(self, filename: Optional[str], sub_paths: Optional[list[str]]) -> str:
+        position_directory = os.path.join(self.upload_directory, *(sub_paths or []))
+        if not os.path.exists(position_directory):
+            os.makedirs(position_directory, exist_ok=True)
+
+        extension = os.path.splitext(os.path.basename(filename or ""))[1]
+        if not re.fullmatch(r"\.[A-Za-z0-9]{1,10}", extension):
+            extension = ""
+        return os.path.join(position_directory, f"{uuid.uuid4().hex}{extension}")
 
     async def process(self, document: UploadFile, sub_paths: Optional[list[str]] = None) -> str:
         """
-        Process the document by saving it to a local directory.
+        Process the document by streaming it to a local directory under a generated name.
+
+        The upload was already received and spooled by Starlette, the request
+        body size is limited before that by RequestBodyLimitMiddleware. The
+        limits are enforced again while copying, which holds at most one
+        chunk in memory.
 
         Args:
             document: The document to process.
             sub_paths: Optional subdirectories to create within the upload directory.
         """
-        sub_paths = sub_paths or []
-        position_directory = os.path.join(self.upload_directory, *sub_paths)
-        if not os.path.exists(position_directory):
-            os.makedirs(position_directory)
+        file_location = await asyncio.to_thread(self._get_file_location, document.filename, sub_paths)
+
+        buffer = await asyncio.to_thread(open, file_location, "wb")
+        try:
+            async for chunk in self._read_chunks(document):
+                await asyncio.to_thread(buffer.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(buffer.close)
+            await asyncio.to_thread(os.remove, file_location)
+            raise
+
+        await asyncio.to_thread(buffer.close)
+
+        return file_location
+
+    async def read(self, document: UploadFile) -> bytes:
+        """
+        Read the document into memory, enforcing the same limits as process.
+
+        Args:
+            document: The document to read.
+        """
+        data = bytearray()
+        async for chunk in self._read_chunks(document):
+            data += chunk
+        return bytes(data)
 
-        file_location = os.path.join(position_directory, document.filename)
+    async def save(self, data: bytes, filename: Optional[str] = None, sub_paths: Optional[list[str]] = None) -> str:
+        """
+        Store document content that was already read under a generated name.
 
-        with open(file_location, "wb") as buffer:
-            buffer.write(await document.read())
+        Args:
+            data: The document content.
+            filename: Original filename, used for the extension.
+            sub_paths: Optional subdirectories to create within the upload directory.
+        """
+        file_location = await asyncio.to_thread(self._get_file_location, filename, sub_paths)
 
-        # You can process the description and other form data here
+        def write():
+            with open(file_location, "wb") as buffer:
+                buffer.write(data)
+
+        await asyncio.to_thread(write)
         return file_location
 
+    def cleanup(self, max_age_seconds: float) -> int:
+        """
+        Remove uploads older than the given age.
+
+        Only files named by this processor are removed, other content of the
+        upload directory is left alone.
+
+        Args:
+            max_age_seconds (float): Maximal age of the kept uploads.
+        """
+        removed = 0
+        threshold = time.time() - max_age_seconds
+
+        for directory, _, filenames in os.walk(self.upload_directory):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    if GENERATED_NAME.match(filename) and os.path.getmtime(path) < threshold:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+
+        if removed:
+            logger.info(f"Removed {removed} upload(s) older than {max_age_seconds}s")
+        return removed
+
     def get_absolute_url_from_path(self, path: str) -> str:
         """
         Get the absolute URL from the given path.
@@ -43,4 +163,4 @@ class LocalDocumentProcessor(BaseDocumentProcessor):
         Args:
             path (str): The path to the document.
         """
-        return config.env_param('APP_BASE') + path
\ No newline at end of file
+        return config.env_param('APP_BASE') + path
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import config
+
+from .index import PlateIndex, fold_plate
+from .matching import OCR_CONFUSIONS, PlateMatch, PlateMatcher, weighted_distance
+from .normalization import PLATE_SEPARATORS, normalize_plate, normalized_plate_sql
+
+__plate_matcher: Optional[PlateMatcher] = None
+__plate_index: Optional[PlateIndex] = None
+
+
+def get_plate_matcher() -> PlateMatcher:
+    """
+    Get the plate matcher instance.
+    """
+    global __plate_matcher
+    if not __plate_matcher:
+        __plate_matcher = PlateMatcher(
+            min_confidence=config.env_float_param('PLATE_MATCH_MIN_CONFIDENCE', 0.5)
+        )
+    return __plate_matcher
+
+
+def get_plate_index() -> PlateIndex:
+    """
+    Get the lot-wide plate index instance.
+    """
+    global __plate_index
+    if not __plate_index:
+        __plate_index = PlateIndex(
+            PlateMatcher(min_confidence=config.env_float_param('PLATE_INDEX_MIN_CONFIDENCE', 0.7)),
+            max_edits=config.env_int_param('PLATE_INDEX_MAX_EDITS', 2)
+        )
+    return __plate_index
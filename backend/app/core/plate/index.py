@@ -0,0 +1,160 @@
+import threading
+from typing import Generic, Hashable, Optional, TypeVar
+
+from app.core.plate.matching import OCR_CONFUSIONS, PlateMatch, PlateMatcher
+from app.core.plate.normalization import normalize_plate
+
+T = TypeVar("T")
+
+
+def _fold_classes() -> dict[str, str]:
+    # Characters connected by any OCR confusion share a representative
+    parent: dict[str, str] = {}
+
+    def find(char: str) -> str:
+        while parent.setdefault(char, char) != char:
+            char = parent[char]
+        return char
+
+    for pair in OCR_CONFUSIONS:
+        a, b = sorted(find(char) for char in pair)
+        parent[b] = a
+
+    return {char: find(char) for char in parent}
+
+
+OCR_FOLD = str.maketrans(_fold_classes())
+
+
+def fold_plate(plate: str) -> str:
+    """
+    Map a normalized plate to its OCR confusion class.
+
+    Confusable characters share a representative, so the unit edit distance
+    between folded plates never exceeds their ``weighted_distance``.
+    """
+    return plate.translate(OCR_FOLD)
+
+
+def deletion_variants(key: str, max_deletions: int) -> set[str]:
+    """
+    Get the strings obtained by deleting up to ``max_deletions`` characters.
+    """
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_deletions):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+class PlateIndex(Generic[T]):
+    """
+    Similarity index over the plates of a lot.
+
+    Folded plates are indexed by their deletion variants, two plates within
+    ``max_edits`` unit edits always share one, so every plate within the
+    allowed weighted distance is retrieved with a few dictionary lookups and
+    then ranked by ``matcher``. Entries are added and removed incrementally.
+    """
+
+    def __init__(self, matcher: PlateMatcher, max_edits: int = 2):
+        self.matcher = matcher
+        self.max_edits = max_edits
+
+        self._entries: dict[Hashable, tuple[str, str, T]] = {}
+        self._variants: dict[str, set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _remove(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        folded, _, value = entry
+        for variant in deletion_variants(folded, self.max_edits):
+            keys = self._variants[variant]
+            keys.discard(key)
+            if not keys:
+                del self._variants[variant]
+        return value
+
+    def add(self, key: Hashable, plate: str, value: T):
+        """
+        Add or replace the plate of an entry.
+
+        Args:
+            key (Hashable): Entry identifier, e.g. the session ID.
+            plate (str): License plate of the entry.
+            value (T): Value returned by lookups.
+        """
+        folded = fold_plate(normalize_plate(plate))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (folded, plate, value)
+            for variant in deletion_variants(folded, self.max_edits):
+                self._variants.setdefault(variant, set()).add(key)
+
+    def remove(self, key: Hashable) -> Optional[T]:
+        """
+        Remove an entry.
+
+        Returns:
+            Optional[T]: The removed value, if the entry was indexed.
+        """
+        with self._lock:
+            return self._remove(key)
+
+    def candidates(self, plate: str, max_edits: int) -> list[tuple[str, T]]:
+        """
+        Get the entries whose folded plate may be within ``max_edits`` unit edits.
+
+        ``max_edits`` is capped at the index ``max_edits``.
+        """
+        folded = fold_plate(normalize_plate(plate))
+        with self._lock:
+            keys = set()
+            for variant in deletion_variants(folded, min(max_edits, self.max_edits)):
+                keys |= self._variants.get(variant, set())
+            return [self._entries[key][1:] for key in keys]
+
+    def nearest(self, plate: str, limit: int = 5) -> list[PlateMatch[T]]:
+        """
+        Get the indexed entries closest to a plate, best first.
+
+        Args:
+            plate (str): Plate as read.
+            limit (int): Maximal number of matches.
+
+        Returns:
+            list[PlateMatch[T]]: Matches with at least the matcher's minimal
+                confidence, within the index ``max_edits`` folded edits.
+        """
+        query = normalize_plate(plate)
+        max_distance = (1.0 - self.matcher.min_confidence) * len(query)
+        # Folded unit edits lower-bound the weighted distance
+        max_edits = int(max_distance / min(1.0, self.matcher.indel_cost))
+
+        matches = self.matcher.rank(
+            query,
+            self.candidates(query, max_edits),
+            key=lambda candidate: candidate[0],
+            limit=limit
+        )
+        return [
+            PlateMatch(match.candidate[1], match.plate, match.distance, match.confidence)
+            for match in matches
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "variants": len(self._variants),
+        }
@@ -0,0 +1,169 @@
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from app.core.plate.normalization import normalize_plate
+
+T = TypeVar("T")
+
+# Substitution cost of character pairs ANPR cameras commonly mistake for each other
+OCR_CONFUSIONS: dict[frozenset[str], float] = {
+    frozenset(pair): cost
+    for pair, cost in {
+        ("0", "O"): 0.2,
+        ("0", "D"): 0.4,
+        ("0", "Q"): 0.4,
+        ("O", "D"): 0.4,
+        ("O", "Q"): 0.4,
+        ("8", "B"): 0.2,
+        ("1", "I"): 0.2,
+        ("1", "L"): 0.4,
+        ("1", "T"): 0.5,
+        ("I", "L"): 0.4,
+        ("5", "S"): 0.2,
+        ("2", "Z"): 0.3,
+        ("6", "G"): 0.3,
+        ("4", "A"): 0.5,
+        ("7", "T"): 0.5,
+        ("U", "V"): 0.4,
+        ("M", "N"): 0.5,
+        ("C", "G"): 0.5,
+    }.items()
+}
+
+
+def substitution_cost(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    return OCR_CONFUSIONS.get(frozenset((a, b)), 1.0)
+
+
+def weighted_distance(
+    a: str,
+    b: str,
+    max_distance: float = float("inf"),
+    indel_cost: float = 1.0
+) -> float:
+    """
+    Edit distance between two normalized plates, aware of OCR confusions.
+
+    Inserting or dropping a character costs ``indel_cost``, substituting one
+    costs ``OCR_CONFUSIONS`` for common camera misreads and 1 otherwise.
+
+    Args:
+        a (str): Normalized plate.
+        b (str): Normalized plate.
+        max_distance (float): Stop as soon as the distance is known to exceed it.
+        indel_cost (float): Cost of an inserted or dropped character.
+
+    Returns:
+        float: The distance, or ``inf`` when it exceeds ``max_distance``.
+    """
+    if abs(len(a) - len(b)) * indel_cost > max_distance:
+        return float("inf")
+
+    previous = [i * indel_cost for i in range(len(b) + 1)]
+    for i, char_a in enumerate(a, start=1):
+        current = [i * indel_cost]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + indel_cost,
+                current[j - 1] + indel_cost,
+                previous[j - 1] + substitution_cost(char_a, char_b)
+            ))
+
+        # Every path to the end goes through this row
+        if min(current) > max_distance:
+            return float("inf")
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else float("inf")
+
+
+@dataclass
+class PlateMatch(Generic[T]):
+    candidate: T
+    plate: str
+    distance: float
+    confidence: float
+
+
+class PlateMatcher:
+    """
+    Ranks candidate plates by their similarity to a read plate.
+
+    Candidates are compared with ``weighted_distance``. Confidence is
+    ``1 - distance / len(plate)``, and candidates below ``min_confidence``
+    are dropped without finishing their distance computation.
+    """
+
+    def __init__(self, min_confidence: float = 0.5, indel_cost: float = 1.0):
+        self.min_confidence = min_confidence
+        self.indel_cost = indel_cost
+
+    def confidence(self, plate: str, distance: float) -> float:
+        return max(0.0, 1.0 - distance / len(plate)) if plate else 0.0
+
+    def rank(
+        self,
+        plate: str,
+        candidates: Iterable[T],
+        key: Callable[[T], Optional[str]] = lambda candidate: candidate,
+        limit: int = 5
+    ) -> list[PlateMatch[T]]:
+        """
+        Get the best matching candidates, best first.
+
+        Keeps a bounded heap of the ``limit`` best candidates so far, and
+        tightens the early termination threshold to the worst of them once
+        it's full. Ties keep the earlier candidate.
+
+        Args:
+            plate (str): Plate as read.
+            candidates (Iterable[T]): Candidates to rank.
+            key (Callable[[T], Optional[str]]): Plate of a candidate.
+            limit (int): Maximal number of matches.
+
+        Returns:
+            list[PlateMatch[T]]: Matches with at least ``min_confidence``.
+        """
+        query = normalize_plate(plate)
+        if not query or limit <= 0:
+            return []
+
+        max_distance = (1.0 - self.min_confidence) * len(query)
+
+        # Max-heap on (distance, index) of the best matches so far
+        heap: list[tuple[float, int, str, T]] = []
+        for index, candidate in enumerate(candidates):
+            candidate_plate = key(candidate)
+            if not candidate_plate:
+                continue
+
+            bound = -heap[0][0] if len(heap) == limit else max_distance
+            distance = weighted_distance(query, normalize_plate(candidate_plate), bound, self.indel_cost)
+            if distance > bound or (len(heap) == limit and distance == bound):
+                continue
+
+            entry = (-distance, -index, candidate_plate, candidate)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+        return [
+            PlateMatch(candidate, candidate_plate, -distance, self.confidence(query, -distance))
+            for distance, _, candidate_plate, candidate in sorted(heap, reverse=True)
+        ]
+
+    def best(
+        self,
+        plate: str,
+        candidates: Iterable[T],
+        key: Callable[[T], Optional[str]] = lambda candidate: candidate
+    ) -> Optional[PlateMatch[T]]:
+        """
+        Get the best matching candidate, if any is similar enough.
+        """
+        matches = self.rank(plate, candidates, key, limit=1)
+        return matches[0] if matches else None
@@ -0,0 +1,46 @@
+# Characters drivers, OCR and operators put between plate groups
+PLATE_SEPARATORS = " \t-._/"
+
+
+def normalize_plate(plate: str) -> str:
+    """
+    Normalize a license plate for lookups.
+
+    The plate is uppercased and stripped of spaces and separators, so
+    ``"abc 123"``, ``"ABC-123"`` and ``"ABC123"`` are the same plate. Only
+    ASCII letters are uppercased, the same way SQLite ``UPPER`` does.
+
+    Args:
+        plate (str): License plate as read or typed.
+
+    Returns:
+        str: The normalized plate.
+    """
+    return "".join(
+        char.upper() if char.isascii() else char
+        for char in plate
+        if char not in PLATE_SEPARATORS
+    )
+
+
+def normalized_plate_sql(column: str, dialect: str = "sqlite") -> str:
+    """
+    Build the SQL expression computing ``normalize_plate`` of a column.
+
+    Args:
+        column (str): Column or expression holding the plate.
+        dialect (str): ``sqlite`` or ``postgres``.
+
+    Returns:
+        str: The SQL expression.
+    """
+    expression = f"UPPER({column})"
+    for separator in PLATE_SEPARATORS:
+        expression = f"REPLACE({expression}, {_sql_literal(separator, dialect)}, '')"
+    return expression
+
+
+def _sql_literal(text: str, dialect: str) -> str:
+    if text == "\t":
+        return "chr(9)" if dialect == "postgres" else "char(9)"
+    return "'" + text.replace("'", "''") + "'"
@@ -0,0 +1,99 @@
+from typing import Optional
+
+import config
+from app.config.phrases import prewarm_phrases
+
+from .audio_store import AudioResponseStore, StoredAudio
+from .cache import SpeechCache
+from .formats import AudioFormat, audio_formats
+from .synthesizer import SpeechSynthesizer, SynthesizerBusyError, WarmUpState
+
+__speech_synthesizer: Optional[SpeechSynthesizer] = None
+__audio_store: Optional[AudioResponseStore] = None
+
+
+def get_speech_synthesizer() -> SpeechSynthesizer:
+    """
+    Get the speech synthesizer instance.
+    """
+    global __speech_synthesizer
+    if not __speech_synthesizer:
+        cache = None
+        if config.env_optional_param('TTS_CACHE') != 'false':
+            cache = SpeechCache(
+                max_memory_bytes=config.env_int_param('TTS_CACHE_MAX_MEMORY_BYTES', 64 * 1024 * 1024),
+                directory=config.env_optional_param('TTS_CACHE_DIR') or 'uploads/tts_cache',
+                max_disk_bytes=config.env_int_param('TTS_CACHE_MAX_DISK_BYTES', 1024 * 1024 * 1024)
+            )
+
+        __speech_synthesizer = SpeechSynthesizer(
+            model=config.env_optional_param('TTS_MODEL') or "suno/bark-small",
+            token=config.env_optional_param('HUGGINGFACE_API_KEY'),
+            max_workers=config.env_int_param('TTS_WORKERS', 1),
+            max_queue=config.env_int_param('TTS_MAX_QUEUE', 4),
+            timeout_seconds=config.env_float_param('TTS_TIMEOUT_SECONDS', 60),
+            cache=cache
+        )
+    return __speech_synthesizer
+
+
+def get_audio_store() -> AudioResponseStore:
+    """
+    Get the generated audio store instance.
+    """
+    global __audio_store
+    if not __audio_store:
+        __audio_store = AudioResponseStore(
+            ttl_seconds=config.env_float_param('AUDIO_STORE_TTL_SECONDS', 5 * 60),
+            max_bytes=config.env_int_param('AUDIO_STORE_MAX_BYTES', 64 * 1024 * 1024),
+            spill_directory=config.env_optional_param('AUDIO_STORE_SPILL_DIR')
+        )
+    return __audio_store
+
+
+def get_audio_format(conversation_id: str, requested: Optional[AudioFormat] = None) -> AudioFormat:
+    """
+    Get the voice reply format: the requested one, the lane one from
+    TTS_LANE_AUDIO_FORMATS (``lane=format,...``) or the TTS_AUDIO_FORMAT default.
+    """
+    if requested:
+        return requested
+
+    lane_formats = dict(
+        item.strip().split('=', 1)
+        for item in (config.env_optional_param('TTS_LANE_AUDIO_FORMATS') or '').split(',')
+        if '=' in item
+    )
+    value = lane_formats.get(conversation_id) or config.env_optional_param('TTS_AUDIO_FORMAT')
+    return AudioFormat(value) if value else AudioFormat.OGG_OPUS
+
+
+def get_prewarm_phrases() -> list[str]:
+    """
+    Get the phrases to prewarm, one per line in TTS_PREWARM_PHRASES_FILE or the defaults.
+    """
+    phrases_file = config.env_optional_param('TTS_PREWARM_PHRASES_FILE')
+    if not phrases_file:
+        return prewarm_phrases
+
+    with open(phrases_file, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+async def warm_up_speech_synthesizer():
+    """
+    Load the speech models and prewarm the speech cache.
+    """
+    synthesizer = get_speech_synthesizer()
+    await synthesizer.warm_up()
+    await synthesizer.prewarm(get_prewarm_phrases(), get_audio_format(''))
+
+
+def shutdown_speech_synthesizer():
+    """
+    Stop the speech synthesizer worker processes.
+    """
+    global __speech_synthesizer
+    if __speech_synthesizer:
+        __speech_synthesizer.shutdown()
+        __speech_synthesizer = None
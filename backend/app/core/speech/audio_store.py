@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config.logging import logging
+
+logger = logging.getLogger('audio_store')
+
+
+@dataclass
+class StoredAudio:
+    data: bytes
+    media_type: str
+    expires_at: float
+
+
+@dataclass
+class SpilledAudio:
+    path: str
+    media_type: str
+    expires_at: float
+
+
+class AudioResponseStore:
+    """
+    In-memory store for generated voice replies, keyed by unique response ids.
+
+    Entries expire after ``ttl_seconds``. When the store grows over
+    ``max_bytes`` the oldest entries are evicted, or moved to
+    ``spill_directory`` when one is configured.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5 * 60,
+        max_bytes: int = 64 * 1024 * 1024,
+        spill_directory: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+
+        # Every entry lives for the same TTL, so insertion order is expiry order
+        self._entries: OrderedDict[str, StoredAudio] = OrderedDict()
+        self._spilled: OrderedDict[str, SpilledAudio] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        if self.spill_directory:
+            os.makedirs(self.spill_directory, exist_ok=True)
+
+    def _spill(self, audio_id: str, audio: StoredAudio):
+        path = os.path.join(self.spill_directory, audio_id)
+        with open(path, "wb") as file:
+            file.write(audio.data)
+        self._spilled[audio_id] = SpilledAudio(path, audio.media_type, audio.expires_at)
+
+    def _evict(self, now: float):
+        while self._entries:
+            audio_id, audio = next(iter(self._entries.items()))
+            if audio.expires_at > now and self._bytes <= self.max_bytes:
+                break
+
+            del self._entries[audio_id]
+            self._bytes -= len(audio.data)
+
+            if audio.expires_at > now and self.spill_directory:
+                self._spill(audio_id, audio)
+
+        while self._spilled:
+            audio_id, spilled = next(iter(self._spilled.items()))
+            if spilled.expires_at > now:
+                break
+
+            del self._spilled[audio_id]
+            try:
+                os.remove(spilled.path)
+            except FileNotFoundError:
+                pass
+
+    def put(self, data: bytes, media_type: str) -> str:
+        """
+        Store generated audio.
+
+        Args:
+            data (bytes): Encoded audio.
+            media_type (str): Media type of the audio.
+
+        Returns:
+            str: Unique id of the stored audio.
+        """
+        audio_id = uuid.uuid4().hex
+        now = time.monotonic()
+
+        with self._lock:
+            self._entries[audio_id] = StoredAudio(data, media_type, now + self.ttl_seconds)
+            self._bytes += len(data)
+            self._evict(now)
+
+        return audio_id
+
+    def get(self, audio_id: str) -> Optional[StoredAudio]:
+        """
+        Get stored audio by id.
+
+        Args:
+            audio_id (str): Id returned by put.
+
+        Returns:
+            Optional[StoredAudio]: The audio, or None when it is unknown or expired.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict(now)
+
+            audio = self._entries.get(audio_id)
+            if audio is not None:
+                return audio
+
+            spilled = self._spilled.get(audio_id)
+
+        if spilled is None:
+            return None
+
+        try:
+            with open(spilled.path, "rb") as file:
+                return StoredAudio(file.read(), spilled.media_type, spilled.expires_at)
+        except FileNotFoundError:
+            return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._evict(time.monotonic())
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "spilled": len(self._spilled),
+            }
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.config.logging import logging
+
+logger = logging.getLogger('speech_cache')
+
+
+class SpeechCache:
+    """
+    Content addressed cache for synthesized speech.
+
+    Entries are keyed by a hash of the normalized text and the synthesis
+    settings. A memory tier bounded by ``max_memory_bytes`` evicts the least
+    recently used entries, an optional disk tier in ``directory`` survives
+    restarts and is bounded by ``max_disk_bytes``.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        # Keys whose disk file is being written
+        self._writing: set[str] = set()
+        self._lock = threading.Lock()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip()
+
+    @classmethod
+    def key(cls, text: str, **settings) -> str:
+        """
+        Get the cache key for the text synthesized with the given settings.
+        """
+        parts = [cls.normalize(text), *(f"{name}={settings[name]}" for name in sorted(settings))]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) > self.max_memory_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._entries[key] = audio
+        self._memory_bytes += len(audio)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_entries(self) -> list[os.DirEntry]:
+        # Files being written are left alone
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith(".audio")]
+
+    def _prune_disk(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            self._disk_bytes -= size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get cached audio, promoting disk entries to memory.
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return audio
+
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as file:
+                    audio = file.read()
+                os.utime(self._path(key))
+            except FileNotFoundError:
+                audio = None
+
+            if audio is not None:
+                with self._lock:
+                    self._remember(key, audio)
+                    self._disk_hits += 1
+                return audio
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, audio: bytes):
+        """
+        Store audio in memory and, when configured, on disk.
+        """
+        with self._lock:
+            self._remember(key, audio)
+
+            if not self.directory:
+                return
+            path = self._path(key)
+            # Concurrent puts of a key write and count its file once
+            if key in self._writing or os.path.exists(path):
+                return
+            self._writing.add(key)
+            self._disk_bytes += len(audio)
+
+        try:
+            # Written aside and renamed, so readers never see a partial file
+            temporary_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(audio)
+            os.replace(temporary_path, path)
+        except Exception:
+            with self._lock:
+                self._disk_bytes -= len(audio)
+            raise
+        finally:
+            with self._lock:
+                self._writing.discard(key)
+
+        with self._lock:
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,93 @@
+import io
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class AudioFormat(Enum):
+    WAV = "wav"
+    PCM16 = "pcm16"
+    ULAW = "ulaw"
+    OGG_OPUS = "ogg_opus"
+
+
+@dataclass(frozen=True)
+class AudioFormatSpec:
+    container: str
+    subtype: str
+    media_type: str
+    extension: str
+    # None keeps the model sampling rate
+    sample_rate: Optional[int]
+
+
+audio_formats: dict[AudioFormat, AudioFormatSpec] = {
+    AudioFormat.WAV: AudioFormatSpec("WAV", "FLOAT", "audio/wav", "wav", None),
+    AudioFormat.PCM16: AudioFormatSpec("WAV", "PCM_16", "audio/wav", "wav", 16000),
+    AudioFormat.ULAW: AudioFormatSpec("WAV", "ULAW", "audio/wav", "wav", 8000),
+    AudioFormat.OGG_OPUS: AudioFormatSpec("OGG", "OPUS", "audio/ogg", "ogg", 24000),
+}
+
+
+def resample(audio, sample_rate: int, target_sample_rate: int):
+    """
+    Resample a mono signal with linear interpolation.
+
+    When downsampling, the signal is low-passed with a windowed-sinc filter
+    at the target Nyquist frequency first, to avoid aliasing.
+
+    Args:
+        audio (np.ndarray): Mono signal.
+        sample_rate (int): Sampling rate of the signal.
+        target_sample_rate (int): Wanted sampling rate.
+
+    Returns:
+        np.ndarray: The resampled signal.
+    """
+    import numpy as np
+
+    if sample_rate == target_sample_rate or len(audio) == 0:
+        return audio
+
+    if target_sample_rate < sample_rate:
+        cutoff = target_sample_rate / sample_rate / 2
+        taps = np.arange(-32, 33)
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(len(taps))
+        audio = np.convolve(audio, kernel / kernel.sum(), mode="same")
+
+    length = int(len(audio) * target_sample_rate / sample_rate)
+    positions = np.arange(length) * (sample_rate / target_sample_rate)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+
+def encode(audio, sample_rate: int, audio_format: AudioFormat) -> bytes:
+    """
+    Encode a mono float signal in the given format.
+
+    Args:
+        audio (np.ndarray): Mono signal.
+        sample_rate (int): Sampling rate of the signal.
+        audio_format (AudioFormat): Output format.
+
+    Returns:
+        bytes: The encoded audio.
+    """
+    import numpy as np
+    import soundfile as sf
+
+    spec = audio_formats[audio_format]
+    audio = np.ravel(audio).astype(np.float32)
+
+    if spec.sample_rate:
+        audio = resample(audio, sample_rate, spec.sample_rate)
+        sample_rate = spec.sample_rate
+
+    buffer = io.BytesIO()
+    sf.write(
+        buffer,
+        np.clip(audio, -1.0, 1.0),
+        samplerate=sample_rate,
+        format=spec.container,
+        subtype=spec.subtype
+    )
+    return buffer.getvalue()
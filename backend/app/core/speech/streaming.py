@@ -0,0 +1,133 @@
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from app.config.logging import logging
+from app.core.speech.formats import AudioFormat
+from app.core.speech.synthesizer import SpeechSynthesizer
+
+logger = logging.getLogger('speech_streaming')
+
+SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+
+def split_sentences(text: str, min_length: int = 12) -> tuple[list[str], str]:
+    """
+    Split off the complete sentences of the text.
+
+    Fragments shorter than ``min_length`` are joined with the following
+    sentence, so abbreviations and short interjections don't become chunks.
+
+    Args:
+        text (str): Text, possibly ending with an unfinished sentence.
+        min_length (int): Minimal length of a sentence chunk.
+
+    Returns:
+        tuple[list[str], str]: Complete sentences and the unfinished remainder.
+    """
+    parts = SENTENCE_END.split(text)
+    remainder = parts.pop()
+
+    sentences = []
+    current = ""
+    for part in parts:
+        current = f"{current} {part}" if current else part
+        if len(current) >= min_length:
+            sentences.append(current.strip())
+            current = ""
+
+    if current:
+        remainder = f"{current} {remainder}" if remainder else current
+    return sentences, remainder
+
+
+@dataclass
+class SentenceAudio:
+    index: int
+    text: str
+    audio: Optional[bytes]
+
+
+class SentenceAudioStream:
+    """
+    Synthesizes a reply sentence by sentence while it is still being generated.
+
+    Text is fed as it arrives, complete sentences are submitted to the
+    synthesizer with at most ``max_in_flight`` jobs at a time, and the audio
+    is handed out in sentence order.
+    """
+
+    def __init__(
+        self,
+        synthesizer: SpeechSynthesizer,
+        audio_format: AudioFormat = AudioFormat.WAV,
+        max_in_flight: Optional[int] = None
+    ):
+        self.synthesizer = synthesizer
+        self.audio_format = audio_format
+        self.max_in_flight = max_in_flight or synthesizer.max_workers
+
+        self._buffer = ""
+        self._index = 0
+        self._sentences: deque[str] = deque()
+        self._tasks: deque[tuple[int, str, asyncio.Task]] = deque()
+
+    async def _synthesize(self, sentence: str) -> Optional[bytes]:
+        try:
+            return await self.synthesizer.synthesize(sentence, self.audio_format)
+        except Exception as e:
+            logger.error(f"Error synthesizing sentence '{sentence}': {str(e)}")
+            return None
+
+    def _schedule(self):
+        while self._sentences and len(self._tasks) < self.max_in_flight:
+            sentence = self._sentences.popleft()
+            self._tasks.append((self._index, sentence, asyncio.create_task(self._synthesize(sentence))))
+            self._index += 1
+
+    def feed(self, text: str):
+        """
+        Add generated text, submitting every completed sentence.
+        """
+        self._buffer += text
+        sentences, self._buffer = split_sentences(self._buffer)
+        self._sentences.extend(sentences)
+        self._schedule()
+
+    def close(self):
+        """
+        Submit the unfinished remainder as the last sentence.
+        """
+        if self._buffer.strip():
+            self._sentences.append(self._buffer.strip())
+        self._buffer = ""
+        self._schedule()
+
+    def ready(self) -> list[SentenceAudio]:
+        """
+        Get the sentences whose audio is ready, without waiting and in order.
+        """
+        chunks = []
+        while self._tasks and self._tasks[0][2].done():
+            index, sentence, task = self._tasks.popleft()
+            chunks.append(SentenceAudio(index, sentence, task.result()))
+            self._schedule()
+        return chunks
+
+    async def drain(self) -> AsyncIterator[SentenceAudio]:
+        """
+        Wait for the audio of all remaining sentences, in order.
+        """
+        while self._tasks:
+            index, sentence, task = self._tasks.popleft()
+            audio = await task
+            self._schedule()
+            yield SentenceAudio(index, sentence, audio)
+
+    def cancel(self):
+        for _, _, task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._sentences.clear()
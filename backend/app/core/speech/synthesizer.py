@@ -0,0 +1,215 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Optional
+
+from app.config.logging import logging
+from app.core.speech.cache import SpeechCache
+from app.core.speech.formats import AudioFormat, encode
+
+logger = logging.getLogger('speech_synthesizer')
+
+# Loaded once per worker process
+__pipeline = None
+# Shared by the workers, set when they start
+__warm_up_barrier = None
+
+
+def _init_worker(warm_up_barrier):
+    global __warm_up_barrier
+    __warm_up_barrier = warm_up_barrier
+
+
+def _get_pipeline(model: str, token: Optional[str]):
+    global __pipeline
+    if __pipeline is None:
+        from transformers import pipeline
+
+        __pipeline = pipeline(
+            task="text-to-speech",
+            model=model,
+            token=token
+        )
+    return __pipeline
+
+
+def _warm_up(model: str, token: Optional[str]) -> int:
+    try:
+        _get_pipeline(model, token)
+    except Exception:
+        # The other workers would wait for this one forever
+        __warm_up_barrier.abort()
+        raise
+
+    # The worker is held until every worker loaded the model, so each
+    # warm-up job runs on a different worker
+    __warm_up_barrier.wait()
+    return os.getpid()
+
+
+def _synthesize(text: str, model: str, token: Optional[str], audio_format: str) -> bytes:
+    audio_array = _get_pipeline(model, token)(text)
+
+    return encode(audio_array["audio"], audio_array["sampling_rate"], AudioFormat(audio_format))
+
+
+class SynthesizerBusyError(Exception):
+    pass
+
+
+class WarmUpState(Enum):
+    COLD = "cold"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class SpeechSynthesizer:
+    """
+    Text-to-speech running in a dedicated process pool.
+
+    At most ``max_workers + max_queue`` jobs are accepted at once, further
+    requests fail fast with SynthesizerBusyError so callers can fall back to text.
+    """
+
+    def __init__(
+        self,
+        model: str = "suno/bark-small",
+        token: Optional[str] = None,
+        max_workers: int = 1,
+        max_queue: int = 4,
+        timeout_seconds: float = 60,
+        cache: Optional[SpeechCache] = None
+    ):
+        self.model = model
+        self.token = token
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.cache = cache
+
+        # torch does not survive fork, workers are spawned
+        mp_context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(mp_context.Barrier(max_workers),)
+        )
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._rejected = 0
+        self._timed_out = 0
+        self.warm_up_state = WarmUpState.COLD
+
+    async def warm_up(self):
+        """
+        Load the model in every worker process ahead of the first request.
+
+        One job is submitted per worker and each waits until all of them
+        loaded the model, so a fast worker can't take several of them and
+        report ready while others are still loading.
+        """
+        self.warm_up_state = WarmUpState.WARMING
+        logger.info(f"Warming up {self.max_workers} speech synthesis worker(s) with {self.model}")
+
+        try:
+            await asyncio.gather(*(
+                asyncio.wrap_future(self._executor.submit(_warm_up, self.model, self.token))
+                for _ in range(self.max_workers)
+            ))
+            self.warm_up_state = WarmUpState.READY
+            logger.info("Speech synthesis workers are ready")
+        except Exception as e:
+            self.warm_up_state = WarmUpState.FAILED
+            logger.error(f"Speech synthesis warm-up failed: {str(e)}")
+
+    def cache_key(self, text: str, audio_format: AudioFormat) -> str:
+        return SpeechCache.key(text, model=self.model, format=audio_format.value)
+
+    async def synthesize(self, text: str, audio_format: AudioFormat = AudioFormat.WAV) -> bytes:
+        """
+        Synthesize text to speech, serving repeated phrases from the cache.
+
+        Args:
+            text (str): Text to synthesize.
+            audio_format (AudioFormat): Output format.
+
+        Returns:
+            bytes: The encoded audio.
+        """
+        key = self.cache_key(text, audio_format)
+        if self.cache:
+            audio = await asyncio.to_thread(self.cache.get, key)
+            if audio is not None:
+                return audio
+
+        with self._pending_lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise SynthesizerBusyError("Speech synthesis queue is full")
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(
+                _synthesize,
+                SpeechCache.normalize(text),
+                self.model,
+                self.token,
+                audio_format.value
+            )
+        except Exception:
+            self._release()
+            raise
+        # A job holds its slot until the worker is done with it, not until
+        # the caller stops waiting
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            audio = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # Queued jobs are dropped, a job that already started keeps its
+            # worker and its slot until it finishes
+            future.cancel()
+            self._timed_out += 1
+            raise
+
+        if self.cache:
+            await asyncio.to_thread(self.cache.put, key, audio)
+        return audio
+
+    def _release(self):
+        with self._pending_lock:
+            self._pending -= 1
+
+    async def prewarm(self, phrases: list[str], audio_format: AudioFormat = AudioFormat.WAV):
+        """
+        Synthesize the phrases into the cache ahead of the first request.
+        """
+        if not self.cache:
+            return
+
+        for phrase in phrases:
+            try:
+                await self.synthesize(phrase, audio_format)
+            except Exception as e:
+                logger.warning(f"Could not prewarm phrase '{phrase}': {str(e)}")
+
+        logger.info(f"Prewarmed {len(phrases)} phrase(s) into the speech cache")
+
+    def stats(self) -> dict:
+        return {
+            "cache": self.cache.stats() if self.cache else None,
+            "state": self.warm_up_state.value,
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "capacity": self.max_workers + self.max_queue,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
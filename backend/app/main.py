@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from contextlib import asynccontextmanager
@@ -7,17 +8,44 @@ from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 
 from app.api.routers.api import api_router
+from app.api.service import sync_active_sessions_periodically
+from app.core.agent import close_async_openai_client
+from app.core.audio import warm_up_transcriber
+from app.core.database import close_database_manager, ensure_database_schema
+from app.core.document import RequestBodyLimitMiddleware, cleanup_documents_periodically, get_request_max_bytes
+from app.core.speech import warm_up_speech_synthesizer, shutdown_speech_synthesizer
 from fastapi.encoders import jsonable_encoder
 
 from app.config.logging import setup_logging
 
+import config
+
 log = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Fails the startup when the database can't be migrated
+    await asyncio.to_thread(ensure_database_schema)
+
+    # Heavy models load in the background, text requests are served right away
+    warm_up_task = None
+    if config.env_optional_param('TTS_WARM_UP') != 'false':
+        warm_up_task = asyncio.create_task(warm_up_speech_synthesizer())
+    transcriber_warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up_transcriber))
+    cleanup_task = asyncio.create_task(cleanup_documents_periodically())
+    active_sessions_task = asyncio.create_task(sync_active_sessions_periodically())
+
     yield
 
+    if warm_up_task:
+        warm_up_task.cancel()
+    cleanup_task.cancel()
+    active_sessions_task.cancel()
+    await close_async_openai_client()
+    await close_database_manager()
+    shutdown_speech_synthesizer()
+
 
 # Setup logging
 setup_logging()
@@ -37,6 +65,9 @@ app = FastAPI(
 # Include the routers
 app.include_router(api_router)
 
+# Oversized uploads are rejected before they are spooled to disk
+app.add_middleware(RequestBodyLimitMiddleware, max_bytes=get_request_max_bytes())
+
 
 @app.exception_handler(status.HTTP_500_INTERNAL_SERVER_ERROR)
 async def error_500(_: Request, error: HTTPException):
@@ -12,4 +12,16 @@ def env_param(name: str) -> str:
 
 
 def env_optional_param(name: str) -> str | None:
-    return os.environ.get(name, None)
\ No newline at end of file
+    return os.environ.get(name, None)
+
+
+def env_int_param(name: str, default: int) -> int:
+    """Get integer env variable value or the given default."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_float_param(name: str, default: float) -> float:
+    """Get float env variable value or the given default."""
+    value = os.environ.get(name)
+    return float(value) if value else default
@@ -1,6 +1,8 @@
 import logging
 import asyncio
 import signal
+import subprocess
+import sys
 
 import click
 
@@ -31,19 +33,53 @@ def cli():
     pass
 
 
+def print_import_times(module: str = "app.main", limit: int = 25):
+    """
+    Import the app in a fresh interpreter with -X importtime and print the slowest modules.
+
+    :param module:      Module to import.
+    :param limit:       Number of modules to print.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+
+    if result.returncode != 0:
+        logger.error(f"Importing {module} failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+
+    rows.sort(reverse=True)
+    click.echo(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    for cumulative_us, self_us, name in rows[:limit]:
+        click.echo(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {name}")
+
+
 @cli.command()
 @click.option("-p", "--port", default=5000)
 @click.option("-h", "--host", default="0.0.0.0")
+@click.option("--import-times", is_flag=True, default=False, help="Print a per-module import time breakdown.")
 def runserver(
-        host: str, port: int
+        host: str, port: int, import_times: bool
 ):
     """
     Run the FastAPI Server.
 
     :param host:        Host to run it on.
     :param port:        Port to run it on.
+    :param import_times: Print a per-module import time breakdown before starting.
     """
 
+    if import_times:
+        print_import_times()
+
     debug = bool(config.env_optional_param("DEBUG"))
 
     if debug:
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database.schema import add_session_normalized_plate  # noqa: E402
+
+DATABASE_NAME = os.environ.get("SQLITE_DATABASE_NAME", "Parking.db")
+
+
+def migrate():
+    """Add the normalized entry plate column to session, backfill and index it"""
+    connection = sqlite3.connect(DATABASE_NAME)
+    cursor = connection.cursor()
+
+    try:
+        backfilled = add_session_normalized_plate(cursor)
+        print(f"✅ Backfilled {backfilled} sessions")
+        cursor.execute("ANALYZE session")
+
+        connection.commit()
+        print("✅ Successfully added normalized plate column and index to session")
+
+        # Verify index was created
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_session_plate_status'")
+        if cursor.fetchone():
+            print("✅ Index verification successful")
+        else:
+            print("❌ Index verification failed")
+
+    except Exception as e:
+        print(f"❌ Error adding normalized plate column: {e}")
+        connection.rollback()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    migrate()
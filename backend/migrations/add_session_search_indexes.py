@@ -0,0 +1,42 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database.schema import SEARCH_INDEXES, add_indexes  # noqa: E402
+
+DATABASE_NAME = os.environ.get("SQLITE_DATABASE_NAME", "Parking.db")
+
+INDEXES = SEARCH_INDEXES
+
+
+def migrate():
+    """Create the indexes used by the session and payment searches"""
+    connection = sqlite3.connect(DATABASE_NAME)
+    cursor = connection.cursor()
+
+    try:
+        add_indexes(cursor, INDEXES)
+        cursor.execute("ANALYZE")
+
+        connection.commit()
+        print("✅ Successfully created session search indexes")
+
+        # Verify indexes were created
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        missing = set(INDEXES) - {row[0] for row in cursor.fetchall()}
+        if not missing:
+            print("✅ Index verification successful")
+        else:
+            print(f"❌ Index verification failed, missing {', '.join(sorted(missing))}")
+
+    except Exception as e:
+        print(f"❌ Error creating session search indexes: {e}")
+        connection.rollback()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    migrate()
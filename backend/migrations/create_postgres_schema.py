@@ -0,0 +1,91 @@
+import asyncio
+import os
+import sys
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import get_postgres_dsn  # noqa: E402
+from app.core.plate import normalized_plate_sql  # noqa: E402
+
+# Stations and tickets stay on the lot controllers, so only the session and
+# payment tables used by the repositories are created
+TABLES = {
+    "session": f"""
+        CREATE TABLE IF NOT EXISTS session (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            ticket_id BIGINT,
+            entry_time TIMESTAMP NOT NULL,
+            entry_station INTEGER,
+            exit_time TIMESTAMP,
+            exit_station INTEGER,
+            status TEXT NOT NULL DEFAULT 'active' CHECK (status IN ('active', 'exited')),
+            amount_due_cents INTEGER NOT NULL DEFAULT 0,
+            amount_paid_cents INTEGER NOT NULL DEFAULT 0,
+            paid_until TIMESTAMP,
+            licence_plate_entry TEXT,
+            licence_plate_exit TEXT,
+            licence_plate_entry_normalized TEXT
+                GENERATED ALWAYS AS ({normalized_plate_sql('licence_plate_entry', 'postgres')}) STORED
+        )
+    """,
+    "payment": """
+        CREATE TABLE IF NOT EXISTS payment (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            session_id BIGINT NOT NULL REFERENCES session(id),
+            station_id INTEGER,
+            method TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            approved BOOLEAN NOT NULL,
+            processor_ref TEXT,
+            created_at TIMESTAMP NOT NULL
+        )
+    """,
+}
+
+# Same indexes as the SQLite migrations
+INDEXES = {
+    "idx_session_plate_status": "session(licence_plate_entry_normalized, status, entry_time)",
+    "idx_session_station_status_time": "session(entry_station, status, entry_time)",
+    "idx_session_status_time": "session(status, entry_time)",
+    "idx_payment_session": "payment(session_id)",
+}
+
+
+async def migrate() -> int:
+    """Create the session and payment tables and their indexes on PostgreSQL, returns the exit code"""
+    try:
+        connection = await asyncpg.connect(get_postgres_dsn())
+    except Exception as e:
+        print(f"❌ Error connecting to PostgreSQL: {e}")
+        return 1
+
+    try:
+        async with connection.transaction():
+            for definition in TABLES.values():
+                await connection.execute(definition)
+            for name, definition in INDEXES.items():
+                await connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+        await connection.execute("ANALYZE session")
+        await connection.execute("ANALYZE payment")
+        print("✅ Successfully created PostgreSQL session and payment schema")
+
+        # Verify indexes were created
+        rows = await connection.fetch("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        missing = set(INDEXES) - {row["indexname"] for row in rows}
+        if not missing:
+            print("✅ Index verification successful")
+            return 0
+
+        print(f"❌ Index verification failed, missing {', '.join(sorted(missing))}")
+        return 1
+    except Exception as e:
+        print(f"❌ Error creating PostgreSQL schema: {e}")
+        return 1
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(migrate()))
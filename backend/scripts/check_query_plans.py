@@ -0,0 +1,62 @@
+import os
+import re
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.repositories.payment_repository import PAYMENT_QUERIES  # noqa: E402
+from app.api.repositories.session_repository import SESSION_QUERIES  # noqa: E402
+
+DATABASE_NAME = os.environ.get("SQLITE_DATABASE_NAME", "Parking.db")
+
+REPOSITORY_QUERIES = {
+    **SESSION_QUERIES,
+    **PAYMENT_QUERIES,
+}
+
+
+def get_full_scans(cursor, query: str) -> list[str]:
+    """Return the full table or index scans in the plan of the query"""
+    # Scanning the result of a common table expression or subquery is fine
+    derived = set(re.findall(r"(\w+)\s+AS\s*\(", query, re.IGNORECASE)) | {"CONSTANT"}
+
+    parameters = (None,) * query.count("?")
+    cursor.execute(f"EXPLAIN QUERY PLAN {query}", parameters)
+    return [
+        detail
+        for _, _, _, detail in cursor.fetchall()
+        if detail.startswith("SCAN ")
+        and not detail.startswith("SCAN (")
+        and detail.split()[1] not in derived
+    ]
+
+
+def check():
+    """Fail when a repository query falls back to a full scan, run after the migrations"""
+    connection = sqlite3.connect(DATABASE_NAME)
+    cursor = connection.cursor()
+
+    failed = False
+    try:
+        for name, query in REPOSITORY_QUERIES.items():
+            try:
+                full_scans = get_full_scans(cursor, query)
+            except sqlite3.Error as e:
+                failed = True
+                print(f"❌ {name}: {e}")
+                continue
+
+            if full_scans:
+                failed = True
+                print(f"❌ {name}: {'; '.join(full_scans)}")
+            else:
+                print(f"✅ {name}")
+    finally:
+        connection.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(check())
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.repositories.postgres_payment_repository import PostgresPaymentRepository  # noqa: E402
+from app.api.repositories.postgres_session_repository import PostgresSessionRepository  # noqa: E402
+from app.core.database import get_postgres_dsn  # noqa: E402
+from app.core.database.postgres_manager import PostgresDatabaseManager  # noqa: E402
+
+ENTRY_STATION = 1
+EXIT_STATION = 2
+
+
+def report(name: str, passed: bool, detail: str = "") -> bool:
+    print(f"{'✅' if passed else '❌'} {name}{f': {detail}' if detail and not passed else ''}")
+    return passed
+
+
+async def check():
+    """Run the PostgreSQL repositories against a local database, run after create_postgres_schema"""
+    database = PostgresDatabaseManager(get_postgres_dsn(), min_size=1, max_size=4)
+    sessions = PostgresSessionRepository(database)
+    payments = PostgresPaymentRepository(database)
+
+    plate = f"T-{uuid.uuid4().hex[:6]}".upper()
+    entry_time = datetime.now().replace(microsecond=0)
+    results = []
+
+    try:
+        session = await sessions.open_session(entry_time, ENTRY_STATION, plate)
+        results.append(report("open_session", not isinstance(session, Exception), str(session)))
+        if isinstance(session, Exception):
+            return 1
+
+        found = await sessions.get_session_by_license_plate(plate.replace("-", " ").lower())
+        results.append(report("get_session_by_license_plate", found == session, str(found)))
+
+        found = await sessions.get_session_by_entry_time_and_entry_station(entry_time.isoformat(), ENTRY_STATION)
+        results.append(report("get_session_by_entry_time_and_entry_station", session in found, str(found)))
+
+        found = await sessions.get_session_by_entry_time_interval_and_entry_station(
+            (entry_time - timedelta(minutes=5), entry_time + timedelta(minutes=5)),
+            ENTRY_STATION
+        )
+        results.append(report("get_session_by_entry_time_interval_and_entry_station", session in found, str(found)))
+
+        async with database.connection() as connection:
+            await connection.executemany(
+                """
+                INSERT INTO payment (session_id, station_id, method, amount_cents, approved, created_at)
+                VALUES ($1, $2, 'card', $3, $4, $5)
+                """,
+                [
+                    (session.id, EXIT_STATION, 500, False, datetime.now()),
+                    (session.id, EXIT_STATION, 300, True, datetime.now()),
+                ]
+            )
+
+        session_payments = await sessions.get_session_with_payments_by_license_plate(plate)
+        results.append(report(
+            "get_session_with_payments_by_license_plate",
+            not isinstance(session_payments, Exception)
+            and session_payments is not None
+            and len(session_payments.payments) == 2
+            and (session_payments.approved_cents, session_payments.declined_cents) == (300, 500),
+            str(session_payments)
+        ))
+
+        payment = await payments.get_payment_by_session_id(session.id)
+        results.append(report("get_payment_by_session_id", getattr(payment, "session_id", None) == session.id, str(payment)))
+
+        # Two lanes closing the same plate at once close it once
+        closed = await asyncio.gather(*(
+            sessions.close_session(plate, plate, datetime.now(), EXIT_STATION)
+            for _ in range(2)
+        ))
+        results.append(report(
+            "close_session",
+            sum(isinstance(result, type(session)) for result in closed) == 1 and None in closed,
+            str(closed)
+        ))
+
+        found = await sessions.get_session_by_license_plate(plate)
+        results.append(report("closed session is no longer active", found is None, str(found)))
+
+        # The repository statements are prepared when a connection opens
+        async with database.connection() as connection:
+            prepared = set(connection.prepared)
+        results.append(report(
+            "prepared statements",
+            set(database.statements) <= prepared,
+            f"missing {set(database.statements) - prepared}"
+        ))
+    finally:
+        async with database.connection() as connection:
+            await connection.execute(
+                "DELETE FROM payment WHERE session_id IN (SELECT id FROM session WHERE licence_plate_entry = $1)",
+                plate
+            )
+            await connection.execute("DELETE FROM session WHERE licence_plate_entry = $1", plate)
+        await database.close()
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check()))
@@ -0,0 +1,126 @@
+import os
+import shutil
+from dataclasses import replace
+from datetime import datetime
+
+from app.api.model.session import Session, SessionStatus
+from app.api.repositories.active_session_index import ActiveSessionIndex
+from app.api.repositories.session_repository import SessionRepository
+from app.core.database import SQLiteConnectionPool, SQLiteWriter, ensure_sqlite_schema
+from app.core.plate import PlateIndex, PlateMatcher
+
+PARKING_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "Parking.db")
+
+
+def make_session(session_id: int, plate: str, status: str = SessionStatus.ACTIVE.value) -> Session:
+    return Session(
+        session_id, None, datetime(2024, 1, 1, 8, session_id % 60), 1, None, None,
+        status, 0, 0, None, plate, None
+    )
+
+
+def test_add_indexes_by_plate_and_skips_inactive_sessions():
+    index = ActiveSessionIndex()
+    index.add(make_session(1, "AB-123"))
+    index.add(make_session(2, "ab 123"))
+    index.add(make_session(3, "XY987", SessionStatus.EXITED.value))
+
+    assert [session.id for session in index.by_plate("AB123")] == [2, 1]
+    assert index.get(3) is None
+
+    index.add(make_session(2, "ab 123", SessionStatus.EXITED.value))
+    assert [session.id for session in index.by_plate("AB123")] == [1]
+
+
+def test_replace_syncs_with_the_database():
+    index = ActiveSessionIndex()
+    index.add(make_session(1, "AB123"))
+    index.add(make_session(2, "XY987"))
+    version = index.version()
+
+    assert index.replace([make_session(2, "XY988"), make_session(3, "CD456")], version) == 2
+    assert index.loaded
+    assert index.get(1) is None
+    assert index.get(2).licence_plate_entry == "XY988"
+    assert index.by_plate("XY987") == []
+    assert index.stats() == {"loaded": True, "sessions": 2, "plates": 2}
+
+
+def test_replace_keeps_writes_made_after_the_read():
+    index = ActiveSessionIndex()
+    index.add(make_session(1, "AB123"))
+    version = index.version()
+    # Database read here, then a session is opened and another closed
+    sessions = [make_session(1, "AB123")]
+    index.add(make_session(2, "XY987"))
+    index.remove(1)
+
+    index.replace(sessions, version)
+
+    assert index.get(1) is None
+    assert index.get(2) is not None
+
+
+def test_replace_applies_writes_made_before_the_read():
+    index = ActiveSessionIndex()
+    index.add(make_session(1, "AB123"))
+    index.remove(1)
+    version = index.version()
+
+    # Another node reopened the session before the read
+    index.replace([make_session(1, "AB123")], version)
+    assert index.get(1) is not None
+
+    # Later syncs no longer protect the earlier write
+    index.replace([], index.version())
+    assert index.get(1) is None
+
+
+def test_plate_index_follows_the_sessions():
+    plate_index = PlateIndex(PlateMatcher(min_confidence=0.7))
+    index = ActiveSessionIndex(plate_index)
+    session = make_session(1, "AB123")
+    index.add(session)
+
+    assert [match.candidate for match in plate_index.nearest("A8123")] == [session]
+
+    index.replace([replace(session, licence_plate_entry="XY987")], index.version())
+    assert plate_index.nearest("A8123") == []
+
+    index.remove(1)
+    assert 1 not in plate_index
+
+
+def test_plate_lookup_reads_sessions_written_by_other_writers(tmp_path):
+    database = str(tmp_path / "Parking.db")
+    shutil.copyfile(PARKING_DB, database)
+    ensure_sqlite_schema(database)
+
+    pool = SQLiteConnectionPool(database, size=2)
+    writer = SQLiteWriter(pool)
+    index = ActiveSessionIndex()
+    repository = SessionRepository(pool, writer, index)
+    try:
+        with pool.connection() as connection:
+            connection.execute(
+                "INSERT INTO session (id, entry_time, entry_station, status, licence_plate_entry) VALUES (?, ?, ?, ?, ?)",
+                (1, "2024-01-01 08:00:00", 1, "active", "AB-123")
+            )
+            connection.commit()
+        index.replace(repository.get_active_sessions(), index.version())
+
+        # A kiosk pays the session and another node opens one, behind the index
+        with pool.connection() as connection:
+            connection.execute("UPDATE session SET amount_paid_cents = 500 WHERE id = 1")
+            connection.execute(
+                "INSERT INTO session (id, entry_time, entry_station, status, licence_plate_entry) VALUES (?, ?, ?, ?, ?)",
+                (2, "2024-01-01 09:00:00", 1, "active", "XY 987")
+            )
+            connection.commit()
+
+        assert repository.get_session_by_license_plate("ab123").amount_paid_cents == 500
+        assert repository.get_session_by_license_plate("XY987").id == 2
+        assert repository.get_session_by_license_plate("CD456") is None
+    finally:
+        writer.close()
+        pool.close()
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from app.core.audio.preprocessing import AudioPreprocessor, AudioTooLongError, EmptyAudioError
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+
+
+def encode(audio, sample_rate: int, format: str = "WAV") -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, samplerate=sample_rate, format=format)
+    return buffer.getvalue()
+
+
+def clip(sample_rate: int, silence_seconds: float, speech_seconds: float):
+    """
+    Stereo clip of speech-like tone between two stretches of faint noise.
+    """
+    generator = np.random.default_rng(7)
+
+    def noise(seconds):
+        return 0.001 * generator.standard_normal(int(seconds * sample_rate))
+
+    time = np.arange(int(speech_seconds * sample_rate)) / sample_rate
+    signal = np.concatenate([noise(silence_seconds), 0.5 * np.sin(2 * np.pi * 220 * time), noise(silence_seconds)])
+    return np.stack([signal, signal], axis=1).astype(np.float32)
+
+
+def decode(data: bytes):
+    audio, sample_rate = sf.read(io.BytesIO(data))
+    return audio, sample_rate
+
+
+def test_clips_are_downmixed_resampled_and_trimmed():
+    preprocessor = AudioPreprocessor(padding_seconds=0.1)
+
+    audio, sample_rate = decode(preprocessor.process(encode(clip(44100, 1.0, 1.0), 44100)))
+
+    assert sample_rate == 16000
+    assert audio.ndim == 1
+    # The speech plus the padding on both sides, give or take a frame
+    assert len(audio) / sample_rate == pytest.approx(1.2, abs=0.05)
+
+
+def test_other_containers_are_decoded():
+    preprocessor = AudioPreprocessor()
+
+    audio, _ = preprocessor.decode(encode(clip(16000, 0.5, 1.0), 16000, format="OGG"))
+
+    assert len(audio) == pytest.approx(2 * 16000, abs=1)
+
+
+def test_silence_raises_empty_audio_error():
+    preprocessor = AudioPreprocessor()
+    silence = encode(clip(16000, 1.0, 0.0), 16000)
+
+    with pytest.raises(EmptyAudioError):
+        preprocessor.process(silence)
+
+
+def test_clips_too_short_to_frame_raise_empty_audio_error():
+    with pytest.raises(EmptyAudioError):
+        AudioPreprocessor().trim_silence(np.zeros(10, dtype=np.float32))
+
+
+def test_audio_over_the_duration_limit_is_rejected():
+    preprocessor = AudioPreprocessor(max_duration_seconds=1.5)
+    data = encode(clip(16000, 0.5, 1.0), 16000, format="OGG")
+
+    with pytest.raises(AudioTooLongError):
+        preprocessor.process(data)
+
+    assert len(AudioPreprocessor(max_duration_seconds=2.5).decode(data)[0]) == 2 * 16000
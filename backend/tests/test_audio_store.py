@@ -0,0 +1,62 @@
+import pytest
+
+from app.core.speech import audio_store
+from app.core.speech.audio_store import AudioResponseStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(audio_store.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock):
+    store = AudioResponseStore(ttl_seconds=10)
+    audio_id = store.put(b"audio", "audio/wav")
+
+    clock.now += 9
+    assert store.get(audio_id).data == b"audio"
+    assert store.get(audio_id).media_type == "audio/wav"
+
+    clock.now += 1
+    assert store.get(audio_id) is None
+    assert store.stats()["bytes"] == 0
+
+
+def test_unknown_ids_are_not_found(clock):
+    assert AudioResponseStore().get("missing") is None
+
+
+def test_oldest_entries_are_evicted_over_the_byte_budget(clock):
+    store = AudioResponseStore(max_bytes=10)
+    first = store.put(b"aaaa", "audio/wav")
+    second = store.put(b"bbbb", "audio/wav")
+    third = store.put(b"cccc", "audio/wav")
+
+    assert store.get(first) is None
+    assert store.get(second).data == b"bbbb"
+    assert store.get(third).data == b"cccc"
+    assert store.stats() == {"entries": 2, "bytes": 8, "max_bytes": 10, "spilled": 0}
+
+
+def test_evicted_entries_spill_to_disk_until_they_expire(clock, tmp_path):
+    store = AudioResponseStore(ttl_seconds=10, max_bytes=4, spill_directory=str(tmp_path))
+    first = store.put(b"aaaa", "audio/mpeg")
+    store.put(b"bbbb", "audio/mpeg")
+
+    spilled = store.get(first)
+    assert (spilled.data, spilled.media_type) == (b"aaaa", "audio/mpeg")
+    assert store.stats()["spilled"] == 1
+
+    clock.now += 10
+    assert store.get(first) is None
+    assert list(tmp_path.iterdir()) == []
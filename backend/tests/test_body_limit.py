@@ -0,0 +1,67 @@
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.document import RequestBodyLimitMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(RequestBodyLimitMiddleware, max_bytes=1024)
+
+    @app.post("/upload")
+    async def upload(document: UploadFile = File(...)):
+        return {"size": len(await document.read())}
+
+    return TestClient(app)
+
+
+def test_bodies_within_the_limit_are_parsed(client):
+    response = client.post("/upload", files={"document": ("audio.wav", b"0" * 512)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 512}
+
+
+def test_announced_oversized_bodies_are_rejected(client):
+    response = client.post("/upload", files={"document": ("audio.wav", b"0" * 2048)})
+
+    assert response.status_code == 413
+
+
+async def test_chunked_bodies_are_cut_off_at_the_limit(client):
+    chunks = [
+        b'--boundary\r\nContent-Disposition: form-data; name="document"; filename="audio.wav"\r\n\r\n',
+        *(b"0" * 256 for _ in range(64)),
+        b"\r\n--boundary--\r\n",
+    ]
+    received = []
+    sent = []
+
+    async def receive():
+        received.append(chunks[len(received)])
+        return {"type": "http.request", "body": received[-1], "more_body": len(received) < len(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    # Without a Content-Length, the body is sent chunked
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/upload",
+        "raw_path": b"/upload",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=boundary")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await client.app(scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert len(received) < len(chunks)
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.api.model.session import Session
+from app.api.service import get_close_session_error
+from app.core.database import DatabaseWriteTimeoutError, SQLiteWriteTimeoutError
+
+
+def make_session() -> Session:
+    return Session(
+        1, None, datetime(2024, 1, 1, 8), 1, None, None,
+        "exited", 0, 0, None, "AB123", None
+    )
+
+
+def test_closed_session_has_no_error():
+    assert get_close_session_error("AB123", make_session()) is None
+
+
+@pytest.mark.parametrize("error", [
+    SQLiteWriteTimeoutError("slow"),
+    DatabaseWriteTimeoutError("slow"),
+])
+def test_write_timeouts_are_reported_as_pending(error):
+    assert "still being registered" in get_close_session_error("AB123", error)
+
+
+def test_errors_and_missing_sessions_are_reported():
+    assert get_close_session_error("AB123", Exception("locked")).startswith("Error closing session")
+    assert "may already be closed" in get_close_session_error("AB123", None)
+
+
+class TimingOutDatabase:
+    command_timeout_seconds = 5
+
+    async def fetchrow(self, *args):
+        raise asyncio.TimeoutError()
+
+
+async def test_postgres_command_timeout_is_a_write_timeout():
+    pytest.importorskip("asyncpg")
+    from app.api.repositories.postgres_session_repository import PostgresSessionRepository
+
+    repository = PostgresSessionRepository(TimingOutDatabase())
+
+    closed = await repository.close_session("AB123", "AB123", datetime(2024, 1, 1, 9), 2)
+
+    assert isinstance(closed, DatabaseWriteTimeoutError)
+    assert "still being registered" in get_close_session_error("AB123", closed)
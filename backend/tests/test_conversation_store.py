@@ -0,0 +1,104 @@
+import pytest
+
+from app.core.conversation import conversation_store
+from app.core.conversation.conversation_store import ConversationStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(conversation_store.time, "monotonic", clock)
+    return clock
+
+
+def user(content: str) -> dict:
+    return {"role": "user", "content": content}
+
+
+def assistant(content: str) -> dict:
+    return {"role": "assistant", "content": content}
+
+
+def test_conversations_are_kept_apart(clock):
+    store = ConversationStore()
+    store.append("lane-1", user("hello"))
+    store.append("lane-2", user("bye"))
+
+    assert store.get_history("lane-1") == [user("hello")]
+    assert store.get_history("lane-2") == [user("bye")]
+    assert store.get_history("lane-3") == []
+    assert store.stats()["conversations"] == 2
+
+
+def test_least_recently_used_conversation_is_evicted(clock):
+    store = ConversationStore(max_conversations=2)
+    store.append("a", user("a"))
+    store.append("b", user("b"))
+    # Reading a conversation counts as using it
+    store.get_history("a")
+
+    store.append("c", user("c"))
+
+    assert store.get_history("b") == []
+    assert store.get_history("a") == [user("a")]
+    assert store.get_history("c") == [user("c")]
+    assert store.stats()["evicted_lru"] == 1
+
+
+def test_idle_conversations_expire(clock):
+    store = ConversationStore(idle_ttl_seconds=60)
+    store.append("a", user("a"))
+    clock.now += 30
+    store.append("b", user("b"))
+
+    clock.now += 30
+
+    assert store.get_history("a") == []
+    assert store.get_history("b") == [user("b")]
+    assert store.stats()["evicted_idle"] == 1
+
+
+def test_history_is_trimmed_to_whole_turns(clock):
+    store = ConversationStore(max_turns=2)
+    for turn in range(3):
+        store.append("a", user(f"question {turn}"))
+        store.append("a", assistant(f"answer {turn}"))
+
+    assert store.get_history("a") == [
+        user("question 1"), assistant("answer 1"), user("question 2"), assistant("answer 2")
+    ]
+
+
+def test_history_is_trimmed_to_the_byte_cap(clock):
+    store = ConversationStore(max_bytes=10)
+    store.append("a", user("12345"))
+    store.append("a", assistant("12345"))
+    store.append("a", user("123"))
+
+    # Dropping the first message would leave the history starting at an answer
+    assert store.get_history("a") == [user("123")]
+    assert store.stats()["bytes"] == 3
+
+
+def test_latest_message_is_kept_over_the_byte_cap(clock):
+    store = ConversationStore(max_bytes=4)
+    store.append("a", user("a long question"))
+
+    assert store.get_history("a") == [user("a long question")]
+
+
+def test_clear_removes_the_conversation(clock):
+    store = ConversationStore()
+    store.append("a", user("a"))
+
+    assert store.clear("a")
+    assert not store.clear("a")
+    assert store.get_history("a") == []
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from app.core.audio.local_transcriber import LocalWhisperTranscriber
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+
+
+def wav(seconds: float, amplitude: float = 0.1) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, np.full(int(seconds * 16000), amplitude, dtype=np.float32), samplerate=16000, format="WAV")
+    return buffer.getvalue()
+
+
+class FakePipeline:
+    """
+    Transcribes a clip as its duration and fails every batch holding a
+    clip louder than 0.5.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((len(inputs), kwargs))
+        if any(np.max(clip["raw"]) > 0.5 for clip in inputs):
+            raise RuntimeError("unreadable clip")
+        return [{"text": f" {len(clip['raw']) / clip['sampling_rate']:.0f} seconds "} for clip in inputs]
+
+
+@pytest.fixture
+def transcriber():
+    transcriber = LocalWhisperTranscriber(batch_window_seconds=0.2, max_duration_seconds=60)
+    transcriber._pipeline = FakePipeline()
+    return transcriber
+
+
+def test_clips_longer_than_the_whisper_window_are_chunked(transcriber):
+    assert transcriber.transcribe_bytes(wav(45)) == "45 seconds"
+
+    _, kwargs = transcriber._pipeline.calls[0]
+    assert kwargs["chunk_length_s"] == 30
+    assert kwargs["stride_length_s"] == 5
+
+
+def test_a_failing_clip_does_not_fail_its_batch(transcriber):
+    futures = [transcriber.submit(wav(2)), transcriber.submit(wav(1, amplitude=0.9)), transcriber.submit(wav(3))]
+
+    assert futures[0].result(timeout=5) == "2 seconds"
+    with pytest.raises(RuntimeError):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == "3 seconds"
+
+    # One batch, then each clip on its own
+    assert [size for size, _ in transcriber._pipeline.calls] == [3, 1, 1, 1]
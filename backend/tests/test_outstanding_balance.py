@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from app.api.model.payment import Payment
+from app.api.model.session import Session
+from app.api.model.session_payments import SessionPayments
+from app.api.tools.customer_payment_failed import CustomerPaymentFailedTool
+from app.api.tools.invalid_license_plate import InvalidLicensePlateTool
+from app.api.tools.lost_ticket import LostTicketTool
+
+
+def make_session(amount_due_cents: int, amount_paid_cents: int) -> Session:
+    return Session(
+        1, None, datetime(2024, 1, 1, 8), 1, None, None,
+        "active", amount_due_cents, amount_paid_cents, None, "AB123", None
+    )
+
+
+def make_payment(payment_id: int, amount_cents: int, approved: bool) -> Payment:
+    return Payment(payment_id, 1, 1, "card", amount_cents, approved, None, datetime(2024, 1, 1, 9, payment_id))
+
+
+class FakeSessionRepository:
+    def __init__(self, session: Session, payments: list[Payment]):
+        self.session = session
+        self.payments = payments
+        self.closed = False
+
+    async def get_session_by_license_plate(self, license_plate):
+        return self.session
+
+    async def get_similar_by_license_plate(self, license_plate):
+        return self.session
+
+    async def get_session_with_payments_by_license_plate(self, license_plate):
+        approved = sum(payment.amount_cents for payment in self.payments if payment.approved)
+        declined = sum(payment.amount_cents for payment in self.payments if not payment.approved)
+        return SessionPayments(self.session, self.payments, approved, declined)
+
+    async def close_session(self, **kwargs):
+        self.closed = True
+        return self.session
+
+
+def test_outstanding_cents_never_goes_negative():
+    assert make_session(1000, 400).outstanding_cents == 600
+    assert make_session(1000, 1200).outstanding_cents == 0
+
+
+@pytest.mark.parametrize("tool", [LostTicketTool, InvalidLicensePlateTool])
+async def test_tools_agree_on_an_unapproved_payment(tool):
+    # The declined payment doesn't count towards the paid amount
+    repository = FakeSessionRepository(make_session(1000, 400), [
+        make_payment(1, 400, True),
+        make_payment(2, 600, False),
+    ])
+
+    result = await tool(repository).execute("AB123")
+
+    assert "outstanding balance of 6.00" in result
+    assert not repository.closed
+
+
+async def test_customer_payment_failed_agrees_on_an_unapproved_payment():
+    repository = FakeSessionRepository(make_session(1000, 400), [
+        make_payment(1, 600, False),
+        make_payment(2, 400, True),
+    ])
+
+    result = await CustomerPaymentFailedTool(repository).execute("AB123")
+
+    assert result.startswith("You still owe 6.00")
+    assert not repository.closed
+
+
+async def test_customer_payment_failed_closes_a_paid_session():
+    repository = FakeSessionRepository(make_session(1000, 1000), [
+        make_payment(1, 600, False),
+        make_payment(2, 1000, True),
+    ])
+
+    result = await CustomerPaymentFailedTool(repository).execute("AB123")
+
+    assert "was successful" in result
+    assert repository.closed
@@ -0,0 +1,85 @@
+import random
+import string
+from types import SimpleNamespace
+
+from app.api.service.session_service import SessionService
+from app.core.plate import PlateIndex, PlateMatcher, fold_plate
+from app.core.plate.index import deletion_variants
+
+
+def test_deletion_variants():
+    assert deletion_variants("ABC", 1) == {"ABC", "BC", "AC", "AB"}
+    assert deletion_variants("ABC", 0) == {"ABC"}
+    assert "" in deletion_variants("AB", 2)
+
+
+def test_fold_plate_maps_confusable_characters_together():
+    assert fold_plate("0O8B") == fold_plate("O0B8")
+    assert fold_plate("AB123") != fold_plate("XY123")
+
+
+def test_nearest_finds_misread_plates():
+    index = PlateIndex(PlateMatcher(min_confidence=0.7))
+    index.add(1, "AB-123", "first")
+    index.add(2, "XY-987", "second")
+
+    matches = index.nearest("A8 I23")
+
+    assert [match.candidate for match in matches] == ["first"]
+    assert matches[0].plate == "AB-123"
+
+
+def test_add_replaces_and_remove_drops_entries():
+    index = PlateIndex(PlateMatcher(min_confidence=0.7))
+    index.add(1, "AB123", "old")
+    index.add(1, "XY987", "new")
+
+    assert index.nearest("AB123") == []
+    assert [match.candidate for match in index.nearest("XY987")] == ["new"]
+
+    assert index.remove(1) == "new"
+    assert 1 not in index
+    assert index.nearest("XY987") == []
+    assert index.stats() == {"entries": 0, "variants": 0}
+
+
+def test_nearest_matches_a_full_scan():
+    alphabet = string.ascii_uppercase + string.digits
+    generator = random.Random(7)
+    plates = ["".join(generator.choices(alphabet, k=generator.randint(5, 7))) for _ in range(500)]
+    matcher = PlateMatcher(min_confidence=0.7)
+    index = PlateIndex(matcher, max_edits=2)
+    for key, plate in enumerate(plates):
+        index.add(key, plate, plate)
+
+    for plate in plates[:50]:
+        # Misread a character the way cameras do
+        query = plate.replace("B", "8").replace("O", "0")
+
+        expected = matcher.rank(query, plates, limit=3)
+        actual = index.nearest(query, limit=3)
+
+        assert [match.distance for match in actual] == [match.distance for match in expected]
+
+
+class FakeSessionRepository:
+    def __init__(self):
+        self.loads = 0
+
+    async def load_active_sessions(self):
+        self.loads += 1
+        return 0
+
+    async def get_active_session_by_id(self, session_id):
+        return f"session-{session_id}"
+
+
+async def test_a_miss_does_not_reload_the_active_sessions():
+    repository = FakeSessionRepository()
+    index = PlateIndex(PlateMatcher(min_confidence=0.7))
+    index.add(1, "AB123", SimpleNamespace(id=1))
+    service = SessionService(repository, PlateMatcher(), index)
+
+    assert await service.get_similar_by_license_plate("XY987") is None
+    assert await service.get_similar_by_license_plate("A8123") == "session-1"
+    assert repository.loads == 0
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from app.core.plate import PlateMatcher, normalize_plate, weighted_distance
+
+
+def test_normalize_plate_drops_separators_and_case():
+    assert normalize_plate(" ab-12.c_d/3\t") == "AB12CD3"
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("AB123", "AB123", 0.0),
+    # Common camera misreads cost less than other substitutions
+    ("AB123", "A8123", 0.2),
+    ("AB123", "AB128", 1.0),
+    ("AB123", "AB12", 1.0),
+    ("AB123", "XAB123", 1.0),
+    ("", "ABC", 3.0),
+])
+def test_weighted_distance(a, b, expected):
+    assert weighted_distance(a, b) == pytest.approx(expected)
+    assert weighted_distance(b, a) == pytest.approx(expected)
+
+
+def test_weighted_distance_uses_indel_cost():
+    assert weighted_distance("AB123", "AB12", indel_cost=0.5) == pytest.approx(0.5)
+
+
+def test_weighted_distance_stops_past_max_distance():
+    assert math.isinf(weighted_distance("AB123", "XY987", max_distance=2))
+    assert math.isinf(weighted_distance("AB", "ABCDEF", max_distance=3))
+    assert weighted_distance("AB123", "AB128", max_distance=1) == pytest.approx(1.0)
+
+
+def test_rank_orders_by_distance():
+    matcher = PlateMatcher(min_confidence=0.5)
+
+    matches = matcher.rank("AB-123", ["XY987", "AB128", "A8123", "AB123"])
+
+    assert [match.candidate for match in matches] == ["AB123", "A8123", "AB128"]
+    assert matches[0].confidence == pytest.approx(1.0)
+    assert matches[1].confidence == pytest.approx(1 - 0.2 / 5)
+
+
+def test_rank_drops_candidates_below_min_confidence():
+    matcher = PlateMatcher(min_confidence=0.9)
+
+    assert [match.candidate for match in matcher.rank("AB123", ["AB128", "A8123"])] == ["A8123"]
+
+
+def test_rank_keeps_the_earlier_candidate_on_ties():
+    matcher = PlateMatcher(min_confidence=0.5)
+
+    matches = matcher.rank("AB123", ["AB124", "AB125", "AB126"], limit=2)
+
+    assert [match.candidate for match in matches] == ["AB124", "AB125"]
+
+
+def test_rank_uses_key_and_skips_missing_plates():
+    matcher = PlateMatcher(min_confidence=0.5)
+    sessions = [{"id": 1, "plate": None}, {"id": 2, "plate": "ab 123"}]
+
+    matches = matcher.rank("AB123", sessions, key=lambda session: session["plate"])
+
+    assert [match.candidate["id"] for match in matches] == [2]
+    assert matches[0].plate == "ab 123"
+
+
+def test_best_returns_none_without_similar_plate():
+    matcher = PlateMatcher(min_confidence=0.5)
+
+    assert matcher.best("AB123", ["XY987"]) is None
+    assert matcher.best("AB123", ["XY987", "AB123"]).candidate == "AB123"
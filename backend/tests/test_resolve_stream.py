@@ -0,0 +1,107 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.tools.executor import ToolExecutor
+
+
+@pytest.fixture
+def resolve(monkeypatch, tmp_path):
+    # The tools build their repositories at import, they aren't used here
+    monkeypatch.setenv("SQLITE_DATABASE_NAME", str(tmp_path / "unused.db"))
+    return importlib.import_module("app.api.routers.resolve")
+
+
+def chunk(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+def tool_call_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class FakeClient:
+    """
+    Streams the given turns, an exception in a turn is raised at that point.
+    """
+
+    def __init__(self, *turns):
+        self.turns = list(turns)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.requests.append([dict(message) if isinstance(message, dict) else message for message in kwargs["messages"]])
+        turn = self.turns.pop(0)
+
+        async def stream():
+            for item in turn:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+        return stream()
+
+
+async def collect(resolve, client):
+    response = resolve.ResolveResponse(text="")
+    events = [event async for event in resolve.stream_chat_with_openai([], client, response)]
+    return events, response
+
+
+async def test_tool_status_is_sent_in_order_with_the_tokens(resolve, monkeypatch):
+    async def lookup(plate):
+        return f"found {plate}"
+
+    executor = ToolExecutor({"lookup": lookup})
+    monkeypatch.setattr(resolve, "tool_executor", executor)
+    client = FakeClient(
+        [
+            chunk("Let me "),
+            chunk("check"),
+            chunk(tool_calls=[tool_call_delta(0, "call_1", "lookup", '{"plate": ')]),
+            # Tokens after the tool call belong to the answer being replaced
+            chunk(" held back"),
+            chunk(tool_calls=[tool_call_delta(0, arguments='"AB123"}')]),
+        ],
+        [chunk("Done")],
+    )
+
+    events, response = await collect(resolve, client)
+    executor.shutdown()
+
+    assert events == [
+        ("token", {"text": "Let me "}),
+        ("token", {"text": "check"}),
+        ("tool", {"name": "lookup", "status": "started"}),
+        ("tool", {"name": "lookup", "status": "finished"}),
+        ("reset", {}),
+        ("token", {"text": "Done"}),
+    ]
+    assert (response.text, response.is_finished) == ("Done", True)
+
+    assistant, tool = client.requests[1][-2:]
+    assert assistant["content"] == "Let me check held back"
+    assert tool["content"] == "found AB123"
+
+
+async def test_error_after_tokens_resets_the_answer(resolve):
+    client = FakeClient([chunk("Half an "), chunk("answer"), RuntimeError("connection lost")])
+
+    events, response = await collect(resolve, client)
+
+    assert events == [
+        ("token", {"text": "Half an "}),
+        ("token", {"text": "answer"}),
+        ("reset", {}),
+    ]
+    assert response.text == "Encountered technical errors. Please contact the helpdesk."
+    assert response.is_finished
+
+
+async def test_error_before_tokens_sends_no_reset(resolve):
+    events, response = await collect(resolve, FakeClient([RuntimeError("unavailable")]))
+
+    assert events == []
+    assert response.is_finished
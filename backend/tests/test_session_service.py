@@ -0,0 +1,91 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from app.api.model.session import Session
+from app.api.repositories import ActiveSessionIndex, AsyncSessionRepository, SessionRepository
+from app.api.service import SessionService
+from app.core.database import SQLiteConnectionPool, SQLiteWriter, ensure_sqlite_schema
+from app.core.plate import PlateIndex, PlateMatcher
+
+PARKING_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "Parking.db")
+
+
+@pytest.fixture
+def service(tmp_path):
+    database = str(tmp_path / "Parking.db")
+    shutil.copyfile(PARKING_DB, database)
+    ensure_sqlite_schema(database)
+
+    pool = SQLiteConnectionPool(database, size=2)
+    writer = SQLiteWriter(pool, batch_window_ms=0)
+    executor = ThreadPoolExecutor(max_workers=2)
+    plate_index = PlateIndex(PlateMatcher(min_confidence=0.7))
+    repository = SessionRepository(pool, writer, ActiveSessionIndex(plate_index))
+
+    yield SessionService(AsyncSessionRepository(repository, executor), PlateMatcher(), plate_index)
+
+    executor.shutdown(wait=True)
+    writer.close()
+    pool.close()
+
+
+async def open_sessions(service: SessionService, *plates: str) -> list[Session]:
+    return [
+        await service.session_repository.open_session(datetime(2024, 1, 1, 8, minute), 1, plate)
+        for minute, plate in enumerate(plates)
+    ]
+
+
+async def test_similar_plate_is_found_across_the_lot(service):
+    first, _ = await open_sessions(service, "AB-123", "XY-987")
+
+    session = await service.get_similar_by_license_plate("A8 123")
+
+    assert isinstance(session, Session)
+    assert session.id == first.id
+    assert await service.get_similar_by_license_plate("QQ-555") is None
+
+
+async def test_sync_picks_up_sessions_of_other_writers(service):
+    with service.session_repository.repository.pool.connection() as connection:
+        connection.execute(
+            "INSERT INTO session (entry_time, entry_station, status, licence_plate_entry) VALUES (?, ?, ?, ?)",
+            ("2024-01-01 08:00:00", 1, "active", "CD-456")
+        )
+        connection.commit()
+    assert await service.get_similar_by_license_plate("CD 456") is None
+
+    assert await service.sync_active_sessions() == 1
+    assert (await service.get_similar_by_license_plate("CD 456")).licence_plate_entry == "CD-456"
+
+
+async def test_equally_close_plates_are_ambiguous(service):
+    await open_sessions(service, "AB-123", "AB-124")
+
+    assert isinstance(await service.get_similar_by_license_plate("AB-125"), Exception)
+
+
+async def test_closest_plate_in_the_entry_time_interval(service):
+    await open_sessions(service, "AB-123", "XY-987", "CD-456")
+
+    session = await service.get_similar_by_license_plate_entry_time_interval_and_entry_station(
+        "XY 988",
+        (datetime(2024, 1, 1, 7).isoformat(), datetime(2024, 1, 1, 9).isoformat()),
+        1
+    )
+
+    assert session.licence_plate_entry == "XY-987"
+
+
+async def test_closed_sessions_leave_the_lot(service):
+    await open_sessions(service, "AB-123")
+
+    closed = await service.close_session("ab123", "AB-123", datetime(2024, 1, 1, 10), 2)
+
+    assert closed.status == "exited"
+    assert await service.get_session_by_license_plate("AB-123") is None
+    assert await service.get_similar_by_license_plate("A8-123") is None
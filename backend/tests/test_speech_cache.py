@@ -0,0 +1,99 @@
+import os
+import threading
+
+from app.core.speech.cache import SpeechCache
+
+
+def test_key_normalizes_whitespace_and_includes_settings():
+    assert SpeechCache.key(" Hello\n  world ", voice="a") == SpeechCache.key("Hello world", voice="a")
+    assert SpeechCache.key("Hello", voice="a", speed=1) == SpeechCache.key("Hello", speed=1, voice="a")
+    assert SpeechCache.key("Hello", voice="a") != SpeechCache.key("Hello", voice="b")
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SpeechCache(max_memory_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.stats() == {
+        "entries": 2, "memory_bytes": 8, "disk_bytes": 0,
+        "memory_hits": 3, "disk_hits": 0, "misses": 1,
+    }
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = SpeechCache(max_memory_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aa")
+
+    assert cache.stats()["memory_bytes"] == 2
+
+
+def test_entries_larger_than_memory_are_not_kept_in_memory():
+    cache = SpeechCache(max_memory_bytes=4)
+    cache.put("a", b"aaa")
+    cache.put("big", b"0123456789")
+
+    assert cache.get("big") is None
+    assert cache.get("a") == b"aaa"
+
+
+def test_disk_tier_survives_restarts_and_promotes_to_memory(tmp_path):
+    SpeechCache(directory=str(tmp_path)).put("a", b"audio")
+
+    cache = SpeechCache(directory=str(tmp_path))
+
+    assert cache.stats()["disk_bytes"] == 5
+    assert cache.get("a") == b"audio"
+    assert cache.get("a") == b"audio"
+    assert (cache.stats()["disk_hits"], cache.stats()["memory_hits"]) == (1, 1)
+
+
+def test_disk_tier_prunes_oldest_files(tmp_path):
+    cache = SpeechCache(max_memory_bytes=0, directory=str(tmp_path), max_disk_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    # Reading refreshes the modification time
+    os.utime(tmp_path / "a.audio", (0, 0))
+    os.utime(tmp_path / "b.audio", (1, 1))
+    assert cache.get("a") == b"aaaa"
+
+    cache.put("c", b"cccc")
+
+    assert sorted(os.listdir(tmp_path)) == ["a.audio", "c.audio"]
+    assert cache.stats()["disk_bytes"] == 8
+
+
+def test_concurrent_puts_of_a_key_count_its_file_once(tmp_path):
+    cache = SpeechCache(max_memory_bytes=0, directory=str(tmp_path), max_disk_bytes=1024)
+    barrier = threading.Barrier(8)
+
+    def put():
+        barrier.wait()
+        cache.put("a", b"audio")
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert os.listdir(tmp_path) == ["a.audio"]
+    assert cache.stats()["disk_bytes"] == 5
+
+
+def test_pruning_skips_files_being_written(tmp_path):
+    (tmp_path / "b.audio.1.tmp").write_bytes(b"partial")
+    cache = SpeechCache(max_memory_bytes=0, directory=str(tmp_path), max_disk_bytes=4)
+
+    cache.put("a", b"aaaa")
+    cache.put("c", b"cccc")
+
+    assert sorted(os.listdir(tmp_path)) == ["b.audio.1.tmp", "c.audio"]
+    assert cache.stats()["disk_bytes"] == 4
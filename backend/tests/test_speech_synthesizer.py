@@ -0,0 +1,50 @@
+import textwrap
+
+import pytest
+
+from app.core.speech.synthesizer import SpeechSynthesizer, WarmUpState, _warm_up
+
+
+@pytest.fixture
+def fake_transformers(tmp_path, monkeypatch):
+    """
+    Stand-in for transformers in the spawned workers, whose model loads
+    slowly and fails for the "broken" model.
+    """
+    package = tmp_path / "transformers"
+    package.mkdir()
+    (package / "__init__.py").write_text(textwrap.dedent("""
+        import time
+
+
+        def pipeline(task, model, token):
+            if model == "broken":
+                raise RuntimeError("model not found")
+            time.sleep(0.5)
+            return lambda text: {"audio": [0.0], "sampling_rate": 16000}
+    """))
+    # Spawned workers start with the parent's import path
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+async def test_warm_up_loads_the_model_on_every_worker(fake_transformers):
+    synthesizer = SpeechSynthesizer(model="fake", max_workers=3)
+    try:
+        futures = [synthesizer._executor.submit(_warm_up, "fake", None) for _ in range(3)]
+
+        assert len({future.result(timeout=60) for future in futures}) == 3
+
+        await synthesizer.warm_up()
+        assert synthesizer.warm_up_state == WarmUpState.READY
+    finally:
+        synthesizer.shutdown()
+
+
+async def test_failed_load_fails_the_warm_up(fake_transformers):
+    synthesizer = SpeechSynthesizer(model="broken", max_workers=2)
+    try:
+        await synthesizer.warm_up()
+
+        assert synthesizer.warm_up_state == WarmUpState.FAILED
+    finally:
+        synthesizer.shutdown()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from app.api.repositories.payment_repository import PAYMENT_QUERIES
+from app.api.repositories.session_repository import SESSION_BY_LICENSE_PLATE_QUERY, SESSION_QUERIES
+from app.core.database.schema import SESSION_PLATE_COLUMN, ensure_sqlite_schema
+
+PARKING_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "Parking.db")
+
+
+@pytest.fixture
+def old_database(tmp_path):
+    """A copy of the shipped database, which predates the normalized plate column"""
+    database = str(tmp_path / "Parking.db")
+    shutil.copyfile(PARKING_DB, database)
+
+    connection = sqlite3.connect(database)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(session)")}
+    assert SESSION_PLATE_COLUMN not in columns
+
+    connection.executemany(
+        """
+        INSERT INTO session (entry_time, entry_station, status, licence_plate_entry)
+        VALUES (?, ?, ?, ?)
+        """,
+        [
+            ("2025-01-01 08:00:00", 1, "active", "ab-12 cd"),
+            ("2025-01-01 09:00:00", 1, "exited", "XY 987"),
+            ("2025-01-01 10:00:00", 1, "active", None),
+        ],
+    )
+    connection.commit()
+    connection.close()
+    return database
+
+
+def test_migration_backfills_existing_sessions(old_database):
+    missing = ensure_sqlite_schema(old_database)
+    assert SESSION_PLATE_COLUMN in missing
+
+    connection = sqlite3.connect(old_database)
+    try:
+        rows = connection.execute(
+            f"SELECT licence_plate_entry, {SESSION_PLATE_COLUMN} FROM session ORDER BY entry_time"
+        ).fetchall()
+        assert rows == [("ab-12 cd", "AB12CD"), ("XY 987", "XY987"), (None, None)]
+
+        # New and updated rows are kept in sync by the triggers
+        connection.execute(
+            "INSERT INTO session (entry_time, entry_station, licence_plate_entry) VALUES (?, ?, ?)",
+            ("2025-01-01 11:00:00", 1, "gh.45-ij"),
+        )
+        connection.execute("UPDATE session SET licence_plate_entry = 'kl 6' WHERE licence_plate_entry = 'XY 987'")
+        rows = connection.execute(
+            f"SELECT {SESSION_PLATE_COLUMN} FROM session WHERE {SESSION_PLATE_COLUMN} IN ('GH45IJ', 'KL6')"
+        ).fetchall()
+        assert sorted(rows) == [("GH45IJ",), ("KL6",)]
+    finally:
+        connection.close()
+
+
+def test_migration_is_idempotent(old_database):
+    assert ensure_sqlite_schema(old_database)
+    assert ensure_sqlite_schema(old_database) == []
+
+
+def test_plate_lookup_uses_the_index(old_database):
+    ensure_sqlite_schema(old_database)
+
+    connection = sqlite3.connect(old_database)
+    try:
+        plan = [
+            row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {SESSION_BY_LICENSE_PLATE_QUERY}", ("AB12CD",))
+        ]
+        assert any("USING INDEX idx_session_plate_status" in step for step in plan), plan
+        assert connection.execute(SESSION_BY_LICENSE_PLATE_QUERY, ("AB12CD",)).fetchone()[10] == "ab-12 cd"
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("name, query", [*SESSION_QUERIES.items(), *PAYMENT_QUERIES.items()])
+def test_repository_queries_do_not_scan_tables(old_database, name, query):
+    ensure_sqlite_schema(old_database)
+
+    connection = sqlite3.connect(old_database)
+    try:
+        plan = [
+            row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", (None,) * query.count("?"))
+        ]
+    finally:
+        connection.close()
+
+    full_scans = [step for step in plan if step.split()[:2] in (["SCAN", "session"], ["SCAN", "payment"])]
+    assert not full_scans, f"{name}: {plan}"
@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.core.database import DatabaseWriteTimeoutError
+from app.core.database.sqlite_manager import SQLiteConnectionPool
+from app.core.database.writer import SQLiteWriter
+
+
+@pytest.fixture
+def pool(tmp_path):
+    database = str(tmp_path / "writer.db")
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+    connection.commit()
+    connection.close()
+
+    pool = SQLiteConnectionPool(database, size=2)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def writer(pool):
+    writer = SQLiteWriter(pool, batch_window_ms=200, timeout_seconds=5)
+    yield writer
+    writer.close()
+
+
+def insert(*names):
+    def operation(connection):
+        for name in names:
+            connection.execute("INSERT INTO item (name) VALUES (?)", (name,))
+        return names
+    return operation
+
+
+def names(pool) -> list[str]:
+    with pool.connection() as connection:
+        return [row[0] for row in connection.execute("SELECT name FROM item ORDER BY id")]
+
+
+def test_operations_within_the_window_share_a_transaction(pool, writer):
+    futures = [writer.submit(insert(f"item-{i}")) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == [(f"item-{i}",) for i in range(10)]
+    assert names(pool) == [f"item-{i}" for i in range(10)]
+    assert writer.stats()["transactions"] == 1
+    assert writer.stats()["operations"] == 10
+
+
+def test_failing_operation_is_rolled_back_alone(pool, writer):
+    first = writer.submit(insert("first"))
+    # The second insert of the operation fails after the first one ran
+    failing = writer.submit(insert("partial", "first"))
+    last = writer.submit(insert("last"))
+
+    assert first.result(timeout=5) == ("first",)
+    with pytest.raises(sqlite3.IntegrityError):
+        failing.result(timeout=5)
+    assert last.result(timeout=5) == ("last",)
+
+    assert names(pool) == ["first", "last"]
+    assert writer.stats()["transactions"] == 1
+
+
+def test_execute_calls_on_commit_with_the_result(writer):
+    committed = []
+
+    assert writer.execute(insert("item"), on_commit=committed.append) == ("item",)
+    assert committed == [("item",)]
+
+
+def test_execute_skips_on_commit_for_failed_operations(writer):
+    committed = []
+    writer.execute(insert("item"))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.execute(insert("item"), on_commit=committed.append)
+    assert committed == []
+
+
+def test_execute_timeout_still_calls_on_commit(pool):
+    writer = SQLiteWriter(pool, batch_window_ms=0, timeout_seconds=0.05)
+    release = threading.Event()
+    committed = threading.Event()
+
+    def slow(connection):
+        release.wait(5)
+        return insert("late")(connection)
+
+    try:
+        with pytest.raises(DatabaseWriteTimeoutError):
+            writer.execute(slow, on_commit=lambda _: committed.set())
+
+        release.set()
+        assert committed.wait(5)
+        assert names(pool) == ["late"]
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_close_commits_queued_operations(pool):
+    writer = SQLiteWriter(pool, batch_window_ms=50)
+    futures = [writer.submit(insert(f"item-{i}")) for i in range(3)]
+
+    writer.close()
+
+    assert all(future.done() for future in futures)
+    assert names(pool) == ["item-0", "item-1", "item-2"]
+    with pytest.raises(RuntimeError):
+        writer.submit(insert("closed"))
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.tools.executor import ToolExecutor
+
+
+def tool_call(name: str, **arguments):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+
+@pytest.fixture
+def make_executor():
+    executors = []
+
+    def make(tool_functions, **kwargs) -> ToolExecutor:
+        executor = ToolExecutor(tool_functions, **kwargs)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+async def test_results_keep_the_tool_call_order(make_executor):
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    def blocking(value):
+        time.sleep(0.01)
+        return value
+
+    executor = make_executor({"slow": slow, "blocking": blocking})
+
+    results = await executor.execute([
+        tool_call("slow", value="first"),
+        tool_call("blocking", value="second"),
+        tool_call("slow", value=3),
+    ])
+
+    assert results == [("first", True), ("second", True), ("3", True)]
+
+
+async def test_tool_calls_run_concurrently(make_executor):
+    barrier = threading.Barrier(2, timeout=1)
+
+    def wait(value):
+        barrier.wait()
+        return value
+
+    executor = make_executor({"wait": wait}, max_workers=2)
+
+    assert await executor.execute([tool_call("wait", value=1), tool_call("wait", value=2)]) == [
+        ("1", True), ("2", True)
+    ]
+
+
+async def test_unknown_and_failing_tools_are_reported(make_executor):
+    def failing():
+        raise ValueError("broken")
+
+    executor = make_executor({"failing": failing, "echo": lambda value: value})
+
+    results = await executor.execute([
+        tool_call("missing"),
+        tool_call("failing"),
+        tool_call("echo", other=1),
+        tool_call("echo", value="ok"),
+    ])
+
+    assert results[0] == ("Error: Function missing not implemented.", False)
+    assert results[1][1] is False and "broken" in results[1][0]
+    assert results[2][1] is False
+    assert results[3] == ("ok", True)
+
+
+async def test_timeouts_fail_only_the_slow_tool(make_executor):
+    cancelled = asyncio.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    release = threading.Event()
+
+    def block():
+        release.wait(5)
+        return "late"
+
+    executor = make_executor({"hang": hang, "block": block, "echo": lambda value: value}, timeout_seconds=0.05)
+
+    try:
+        results = await executor.execute([tool_call("hang"), tool_call("block"), tool_call("echo", value="ok")])
+    finally:
+        release.set()
+
+    assert [executed for _, executed in results] == [False, False, True]
+    assert "timed out" in results[0][0] and "timed out" in results[1][0]
+    assert cancelled.is_set()
+
+
+async def test_write_tools_are_not_timed_out(make_executor):
+    written = []
+
+    async def close_session(plate):
+        await asyncio.sleep(0.1)
+        written.append(plate)
+        return f"closed {plate}"
+
+    def blocking_write(plate):
+        time.sleep(0.1)
+        written.append(plate)
+        return f"closed {plate}"
+
+    executor = make_executor(
+        {"close_session": close_session, "blocking_write": blocking_write},
+        timeout_seconds=0.05,
+        write_tools=["close_session", "blocking_write"]
+    )
+
+    results = await executor.execute([
+        tool_call("close_session", plate="AB123"),
+        tool_call("blocking_write", plate="XY987"),
+    ])
+
+    # The model is only told a tool failed when its write didn't happen
+    assert results == [("closed AB123", True), ("closed XY987", True)]
+    assert sorted(written) == ["AB123", "XY987"]
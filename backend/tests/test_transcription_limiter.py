@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.core.audio.limiter import TranscriberBusyError, TranscriptionLimiter
+from app.core.audio.transcriber import AudioTranscriber
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+        self.cancelled = 0
+
+    async def transcribe_bytes_async(self, audio: bytes, filename: str = "audio.wav") -> str:
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return audio.decode()
+
+
+class FakeTranscriptions:
+    def __init__(self):
+        self.cancelled = False
+
+    async def create(self, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "text"
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.audio = type("Audio", (), {})()
+        self.audio.transcriptions = FakeTranscriptions()
+
+
+async def wait_for_started(transcriber: FakeTranscriber, started: int):
+    while transcriber.started < started:
+        await asyncio.sleep(0)
+
+
+async def test_concurrency_is_capped_and_waiters_run_in_turn():
+    transcriber = FakeTranscriber()
+    limiter = TranscriptionLimiter(transcriber, max_concurrency=2, max_queue=2)
+
+    tasks = [asyncio.create_task(limiter.transcribe_bytes(f"audio-{i}".encode())) for i in range(4)]
+    await wait_for_started(transcriber, 2)
+    assert transcriber.started == 2
+    assert limiter.stats()["queue_depth"] == 2
+
+    transcriber.release.set()
+
+    assert await asyncio.gather(*tasks) == [f"audio-{i}" for i in range(4)]
+    assert limiter.stats()["active"] == 0
+
+
+async def test_requests_over_the_queue_fail_fast():
+    transcriber = FakeTranscriber()
+    limiter = TranscriptionLimiter(transcriber, max_concurrency=1, max_queue=1)
+
+    tasks = [asyncio.create_task(limiter.transcribe_bytes(b"audio")) for _ in range(2)]
+    await wait_for_started(transcriber, 1)
+
+    with pytest.raises(TranscriberBusyError):
+        await limiter.transcribe_bytes(b"audio")
+    assert limiter.stats()["rejected"] == 1
+
+    transcriber.release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_deadline_cancels_the_transcription_and_frees_the_slot():
+    transcriber = FakeTranscriber()
+    limiter = TranscriptionLimiter(transcriber, max_concurrency=1, max_queue=1, timeout_seconds=0.05)
+
+    with pytest.raises(TranscriberBusyError):
+        await limiter.transcribe_bytes(b"audio")
+    assert limiter.stats()["timed_out"] == 1
+    assert transcriber.cancelled == 1
+    assert limiter.stats()["active"] == 0
+
+
+async def test_deadline_cancels_the_remote_request():
+    client = FakeAsyncClient()
+    limiter = TranscriptionLimiter(AudioTranscriber(None, client), max_concurrency=1, timeout_seconds=0.05)
+
+    with pytest.raises(TranscriberBusyError):
+        await limiter.transcribe_bytes(b"audio")
+    assert client.audio.transcriptions.cancelled
+    assert limiter.stats()["active"] == 0
+
+
+async def test_waiting_for_a_slot_times_out():
+    transcriber = FakeTranscriber()
+    limiter = TranscriptionLimiter(transcriber, max_concurrency=1, max_queue=1, timeout_seconds=0.05)
+    running = asyncio.create_task(limiter.transcribe_bytes(b"audio"))
+    await wait_for_started(transcriber, 1)
+
+    with pytest.raises(TranscriberBusyError):
+        await limiter.transcribe_bytes(b"audio")
+    assert limiter.stats()["queue_depth"] == 0
+
+    transcriber.release.set()
+    with pytest.raises(TranscriberBusyError):
+        await running
+    assert limiter.stats()["timed_out"] == 2
@@ -23,6 +23,12 @@ enum RequestType {
   VOICE_REQUEST = "VOICE_REQUEST"
 }
 
+// One conversation per lane tab, so the backend keeps their histories apart
+const newConversationId = (): string =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
 interface Message {
   id: string;
   type: RequestType;
@@ -42,6 +48,7 @@ const ChatInterface: React.FC = () => {
   const [isChatFinished, setIsChatFinished] = useState(false);
   const mediaRecorderRef = useRef(null);
   const chunksRef = useRef([]);
+  const conversationIdRef = useRef<string>(newConversationId());
 
   const bgColor = ['gray.50', 'gray.800'];
   const messageBg = ['white', 'gray.600'];
@@ -94,11 +101,14 @@ const ChatInterface: React.FC = () => {
     setInputValue('');
     setError(null);
     setIsChatFinished(false);
+    conversationIdRef.current = newConversationId();
   }
 
   const closeConversation = async () => {
     try {
-      await api.post('/api/resolve/close');
+      const formData = new FormData();
+      formData.append('conversation_id', conversationIdRef.current);
+      await api.post('/api/resolve/close', formData);
     } catch (err) {
       console.error('Error closing conversation:', err);
     }
@@ -124,6 +134,7 @@ const ChatInterface: React.FC = () => {
 
     try {
       const formData = new FormData();
+      formData.append('conversation_id', conversationIdRef.current);
       formData.append('request_type', request_type);
 
       if (request_type == RequestType.TEXT_REQUEST) {